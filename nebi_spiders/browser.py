@@ -0,0 +1,443 @@
+"""
+Browser-Hilfsfunktionen für Selenium-Spider.
+
+Selenium (insbesondere selenium.webdriver.support.*) wird erst beim ersten
+Zugriff importiert. So laden `scrapy list` und reine HTTP-Spider wie
+noris24 oder container-nrw kein Selenium, obwohl Scrapy beim Start alle
+Spider-Module aus SPIDER_MODULES importiert.
+
+Verwendung in Spidern (Drop-in für die bisherigen Selenium-Imports):
+    from nebi_spiders.browser import By, EC, WebDriverWait, create_driver
+
+create_driver() liefert einen ManagedDriver: Chrome mit Watchdog, der den
+Browser nach MAX_PAGES Seiten, ab MAX_RSS_MB Speicher, ohne Heartbeat oder
+nach einem Absturz transparent ersetzt. Consent-Profile
+(nebi_spiders.consent) setzen Cookie-Banner-Zustimmungen vor dem Laden.
+
+driver.selector() ersetzt Selector(text=driver.page_source): ein
+MutationObserver im Browser zählt DOM-Änderungen, page_source wird nur neu
+übertragen und geparst, wenn sich seit dem letzten Aufruf etwas geändert
+hat. Für einzelne Werte in Polling-Schleifen liefert driver.xpath_texts()
+nur die Treffer-Texte, ausgewertet im Browser.
+"""
+
+import importlib
+import logging
+import os
+import pathlib
+from time import sleep
+from urllib.parse import urlsplit
+
+from nebi_spiders.consent import ConsentSession, shared_store
+
+logger = logging.getLogger(__name__)
+
+
+class LazyImport:
+    """Platzhalter für ein Modul/Attribut, das beim ersten Zugriff importiert wird."""
+
+    def __init__(self, module, attr=None):
+        self._module = module
+        self._attr = attr
+        self._target = None
+
+    def _resolve(self):
+        if self._target is None:
+            target = importlib.import_module(self._module)
+            if self._attr:
+                target = getattr(target, self._attr)
+            self._target = target
+        return self._target
+
+    def __getattr__(self, name):
+        return getattr(self._resolve(), name)
+
+    def __call__(self, *args, **kwargs):
+        return self._resolve()(*args, **kwargs)
+
+    def __repr__(self):
+        name = f"{self._module}.{self._attr}" if self._attr else self._module
+        return f"<LazyImport {name}>"
+
+
+webdriver = LazyImport("selenium.webdriver")
+By = LazyImport("selenium.webdriver.common.by", "By")
+EC = LazyImport("selenium.webdriver.support.expected_conditions")
+WebDriverWait = LazyImport("selenium.webdriver.support.ui", "WebDriverWait")
+Select = LazyImport("selenium.webdriver.support.ui", "Select")
+
+
+# custom_settings für Selenium-Spider: Scrapy-Requests lösen dort nur
+# Browser-Arbeit aus. Limit ist der eine Driver pro Spider, nicht der
+# Download-Slot - daher seriell und ohne AutoThrottle.
+BROWSER_SPIDER_SETTINGS = {
+    'CONCURRENT_REQUESTS': 1,
+    'DOWNLOAD_DELAY': 0.5,
+    'AUTOTHROTTLE_ENABLED': False,
+}
+
+
+# Watchdog: Chrome wird nach so vielen Seitenaufrufen oder ab diesem
+# Speicherverbrauch (RSS von chromedriver + allen Chrome-Prozessen) neu gestartet
+MAX_PAGES = 150
+MAX_RSS_MB = 1500
+# Alle N Seitenaufrufe Speicher und Heartbeat prüfen
+HEALTH_CHECK_EVERY = 10
+# Hängende Seiten brechen nach so vielen Sekunden ab statt den Lauf zu blockieren
+PAGE_LOAD_TIMEOUT = 60
+
+# Fehlermeldungen, an denen ein abgestürzter/unerreichbarer Browser erkannt wird
+_DEAD_BROWSER_MESSAGES = (
+    "invalid session id",
+    "session deleted",
+    "chrome not reachable",
+    "disconnected",
+    "tab crashed",
+    "no such window",
+    "target window already closed",
+    "connection refused",
+    "max retries exceeded",
+)
+
+
+# Installiert (falls nötig) einen MutationObserver und liefert das
+# Änderungs-Token [URL, Observer-ID, Zähler]. Neues Dokument → neuer
+# Observer mit neuer ID, auch bei gleicher URL (Reload, back()).
+_DOM_TOKEN_SCRIPT = """
+var state = window.__nebiDom;
+if (!state || !document.documentElement) {
+    state = window.__nebiDom = {id: Math.random().toString(36).slice(2), version: 0};
+    if (document.documentElement) {
+        new MutationObserver(function () { state.version++; }).observe(
+            document, {subtree: true, childList: true, attributes: true, characterData: true});
+    } else {
+        window.__nebiDom = null;
+    }
+}
+return [location.href, state.id, state.version];
+"""
+
+# Texte aller Treffer eines XPath-Ausdrucks, ausgewertet im Browser
+_XPATH_TEXTS_SCRIPT = """
+var result = document.evaluate(arguments[0], document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+var texts = [];
+for (var i = 0; i < result.snapshotLength; i++) {
+    var node = result.snapshotItem(i);
+    texts.push(node.nodeType === 1 ? node.textContent : node.nodeValue);
+}
+return texts;
+"""
+
+
+class DomSnapshot:
+    """
+    Geparster page_source mit Änderungs-Token: selector() überträgt und
+    parst das DOM nur neu, wenn der MutationObserver seit dem letzten
+    Aufruf Änderungen gezählt hat oder ein neues Dokument geladen ist.
+    Ohne Token (Script-Fehler) wird wie bisher jedes Mal neu geparst.
+    """
+
+    def __init__(self):
+        self._token = None
+        self._selector = None
+        self.hits = 0
+        self.parses = 0
+
+    def token(self, driver):
+        try:
+            token = driver.execute_script(_DOM_TOKEN_SCRIPT)
+        except Exception as e:
+            logger.debug(f"DOM-Token nicht verfügbar: {e}")
+            return None
+        return tuple(token) if token else None
+
+    def selector(self, driver):
+        from scrapy import Selector
+
+        before = self.token(driver)
+        if before is not None and before == self._token:
+            self.hits += 1
+            return self._selector
+
+        self._selector = Selector(text=driver.page_source)
+        # Änderte sich das DOM während der Übertragung, gilt der Snapshot
+        # nur für diesen Aufruf
+        after = self.token(driver) if before is not None else None
+        self._token = before if after == before else None
+        self.parses += 1
+        return self._selector
+
+    def reset(self):
+        self._token = None
+        self._selector = None
+
+
+def _new_chrome():
+    """Startet einen Headless-Chrome mit den Standard-Optionen aller Spider."""
+    options = webdriver.ChromeOptions()
+    options.add_argument('--headless')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    options.add_argument('--disable-gpu')
+    options.add_argument('--window-size=1920,1080')
+    driver = webdriver.Chrome(options=options)
+    driver.set_page_load_timeout(PAGE_LOAD_TIMEOUT)
+    return driver
+
+
+def _process_tree_rss(pid):
+    """RSS (Bytes) eines Prozesses und aller Nachfahren über /proc; None außerhalb von Linux."""
+    proc = pathlib.Path("/proc")
+    if not proc.is_dir():
+        return None
+
+    children = {}
+    rss_pages = {}
+    for stat in proc.glob("[0-9]*/stat"):
+        try:
+            # Feld 2 (comm) kann Leerzeichen enthalten → hinter ")" weiterlesen
+            fields = stat.read_text().rsplit(")", 1)[1].split()
+        except (OSError, IndexError):
+            continue
+        child = int(stat.parent.name)
+        children.setdefault(int(fields[1]), []).append(child)
+        rss_pages[child] = int(fields[21])
+
+    total, stack = 0, [pid]
+    while stack:
+        current = stack.pop()
+        total += rss_pages.get(current, 0)
+        stack.extend(children.get(current, ()))
+    return total * os.sysconf("SC_PAGE_SIZE")
+
+
+def is_dead_browser_error(error):
+    """True, wenn die Exception auf einen abgestürzten oder hängenden Browser hindeutet."""
+    message = str(error).lower()
+    return any(text in message for text in _DEAD_BROWSER_MESSAGES)
+
+
+class ManagedDriver:
+    """
+    Chrome-Driver mit Watchdog. Verhält sich wie webdriver.Chrome
+    (alle Attribute werden durchgereicht), zusätzlich:
+
+    - zählt Seitenaufrufe und startet Chrome nach MAX_PAGES neu
+    - prüft alle HEALTH_CHECK_EVERY Seiten RSS und Heartbeat
+      (execute_script) und ersetzt den Browser bei Überschreitung/Hänger
+    - ersetzt einen abgestürzten Browser und wiederholt get() einmal
+    - stellt nach dem Neustart Cookies wieder her und ruft setup() auf,
+      z.B. redooo._setup_session (PLZ eingeben)
+    - setzt gespeicherte Consent-Profile vor dem ersten Aufruf eines Shops;
+      needs_consent() sagt dem Spider, ob er den Banner selbst wegklicken muss,
+      consent_given() meldet einen erfolgreichen Klick zur Profil-Erfassung
+    - selector() cached den geparsten page_source bis zur nächsten DOM-Änderung
+
+    Neustarts passieren nur in get() bzw. maybe_recycle(), also an
+    Navigationsgrenzen, nie mitten in einem Klick-Ablauf.
+    """
+
+    def __init__(self, setup=None, max_pages=MAX_PAGES, max_rss_mb=MAX_RSS_MB, consent=True):
+        self._setup = setup
+        self._max_pages = max_pages
+        self._max_rss = max_rss_mb * 1024 * 1024
+        self._in_setup = False
+        self._driver = _new_chrome()
+        self._consent_store = shared_store() if consent else None
+        self._consent = ConsentSession(self._consent_store) if consent else None
+        self._snapshot = DomSnapshot()
+        self.pages = 0
+        self.total_pages = 0
+        self.recycles = 0
+
+    def __getattr__(self, name):
+        return getattr(self._driver, name)
+
+    @property
+    def driver(self):
+        return self._driver
+
+    def set_setup(self, setup):
+        """Setup-Funktion nachträglich setzen (z.B. Methode des Spiders)."""
+        self._setup = setup
+
+    def get(self, url):
+        if not self._in_setup:
+            self.maybe_recycle()
+        if self._consent is not None:
+            self._consent.before_navigation(self._driver, url)
+
+        try:
+            self._driver.get(url)
+        except Exception as e:
+            if self._in_setup or (not is_dead_browser_error(e) and self.heartbeat()):
+                raise
+            logger.warning(f"⚠️ Browser reagiert nicht ({e.__class__.__name__}), starte neu")
+            self.recycle(reason="crash")
+            if self._consent is not None:
+                self._consent.before_navigation(self._driver, url)
+            self._driver.get(url)
+
+        self.pages += 1
+        self.total_pages += 1
+
+    def needs_consent(self):
+        """
+        True, wenn der Spider den Cookie-Banner der geladenen Seite selbst
+        schließen soll: kein Consent-Profil gesetzt und in diesem Browser
+        noch nicht geklickt. Nach einem erfolgreichen Klick consent_given()
+        aufrufen.
+        """
+        if self._consent is None:
+            return True
+        return self._consent.needs_consent(self._driver.current_url)
+
+    def consent_given(self):
+        """Banner der geladenen Seite wurde akzeptiert: Profil beim nächsten get() speichern."""
+        if self._consent is not None:
+            self._consent.consent_given(self._driver.current_url)
+
+    def selector(self):
+        """Selector über den aktuellen page_source, neu geparst nur nach DOM-Änderungen."""
+        return self._snapshot.selector(self._driver)
+
+    def xpath_texts(self, xpath):
+        """Texte aller Treffer von xpath, ausgewertet im Browser (ohne page_source)."""
+        return self._driver.execute_script(_XPATH_TEXTS_SCRIPT, xpath) or []
+
+    def heartbeat(self):
+        """True, wenn der Browser auf ein einfaches Script antwortet."""
+        try:
+            self._driver.execute_script("return document.readyState")
+            return True
+        except Exception:
+            return False
+
+    def rss(self):
+        """Speicherverbrauch von chromedriver + Chrome in Bytes (None, falls unbekannt)."""
+        try:
+            pid = self._driver.service.process.pid
+        except AttributeError:
+            return None
+        return _process_tree_rss(pid)
+
+    def maybe_recycle(self, check=False):
+        """
+        Neustart, falls Seitenlimit, Speicherlimit oder Heartbeat das verlangen.
+
+        check=True prüft RSS und Heartbeat sofort - für Spider, die sich per
+        Klick/back() statt get() bewegen (Aufruf zwischen zwei Abfallarten).
+        """
+        if self.pages >= self._max_pages:
+            self.recycle(reason=f"{self.pages} Seiten")
+        elif check or (self.pages and self.pages % HEALTH_CHECK_EVERY == 0):
+            rss = self.rss()
+            if rss is not None and rss > self._max_rss:
+                self.recycle(reason=f"RSS {rss // (1024 * 1024)} MB")
+            elif not self.heartbeat():
+                self.recycle(reason="kein Heartbeat")
+
+    def recycle(self, reason=""):
+        """Ersetzt den Browser durch einen neuen und stellt die Session wieder her."""
+        cookies, url = [], None
+        if self._consent is not None:
+            self._consent.capture(self._driver)
+        try:
+            cookies = self._driver.get_cookies()
+            url = self._driver.current_url
+        except Exception:
+            pass
+
+        try:
+            self._driver.quit()
+        except Exception:
+            pass
+
+        self._driver = _new_chrome()
+        if self._consent is not None:
+            self._consent = ConsentSession(self._consent_store)
+        self._snapshot.reset()
+        self.pages = 0
+        self.recycles += 1
+        logger.info(f"♻️ Browser neu gestartet ({reason}), Neustart Nr. {self.recycles}")
+
+        self._in_setup = True
+        try:
+            self._restore_cookies(url, cookies)
+            if self._setup is not None:
+                self._setup()
+        finally:
+            self._in_setup = False
+
+    def _restore_cookies(self, url, cookies):
+        if not url or not url.startswith("http") or not cookies:
+            return
+        parts = urlsplit(url)
+        try:
+            # Cookies lassen sich nur für die aktuell geladene Domain setzen
+            self._driver.get(f"{parts.scheme}://{parts.netloc}/")
+            for cookie in cookies:
+                if parts.hostname and parts.hostname.endswith(cookie.get("domain", "").lstrip(".")):
+                    cookie.pop("sameSite", None)
+                    self._driver.add_cookie(cookie)
+        except Exception as e:
+            logger.debug(f"Cookies nicht wiederhergestellt: {e}")
+
+    def quit(self):
+        if self.recycles:
+            logger.info(f"Browser: {self.total_pages} Seiten, {self.recycles} Neustarts")
+        if self._snapshot.hits:
+            logger.info(
+                f"DOM-Snapshots: {self._snapshot.parses} geparst, "
+                f"{self._snapshot.hits} aus dem Cache"
+            )
+        if self._consent is not None:
+            self._consent.capture(self._driver)
+        self._driver.quit()
+
+
+def create_driver(setup=None, max_pages=MAX_PAGES, max_rss_mb=MAX_RSS_MB, consent=True):
+    """
+    Startet einen Headless-Chrome mit den Standard-Optionen aller Spider,
+    überwacht von ManagedDriver. setup() stellt nach einem Neustart den
+    Session-Zustand wieder her. consent=False schaltet Consent-Profile ab.
+    """
+    return ManagedDriver(setup=setup, max_pages=max_pages, max_rss_mb=max_rss_mb, consent=consent)
+
+
+def render(spider, url, wait=0, prepare=None, key=None):
+    """
+    Lädt url in spider.driver und gibt den gerenderten page_source zurück.
+
+    Ist der SQLite-HTTP-Cache aktiv (nebi_spiders.httpcache), wird der
+    Snapshot gespeichert und bei Replay-Läufen ohne Browser-Aufruf
+    zurückgegeben. prepare() läuft nach dem Laden, z.B. Cookie-Banner
+    schließen. key unterscheidet Zustände derselben URL.
+    """
+    cache = getattr(spider, "snapshot_cache", False)
+    if cache is False:
+        from scrapy import signals
+        from nebi_spiders.httpcache import SnapshotCache
+
+        cache = spider.snapshot_cache = SnapshotCache.from_spider(spider)
+        if cache is not None:
+            spider.crawler.signals.connect(cache.close, signal=signals.spider_closed)
+
+    key = key or url
+    if cache is not None:
+        html = cache.get(key)
+        if html is not None:
+            spider.crawler.stats.inc_value("httpcache/browser_hit")
+            return html
+
+    spider.driver.get(url)
+    if wait:
+        sleep(wait)
+    if prepare is not None:
+        prepare()
+    html = spider.driver.page_source
+
+    if cache is not None:
+        spider.crawler.stats.inc_value("httpcache/browser_store")
+        cache.set(key, url, html)
+    return html
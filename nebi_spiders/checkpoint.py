@@ -0,0 +1,137 @@
+"""
+Checkpoints für lange Selenium-Crawls (wie JOBDIR, aber für Browser-Spider).
+
+Browser-Spider arbeiten ihren Konfigurator Zelle für Zelle ab
+(Abfallart × Größe). Jede fertige Zelle wird mit ihren Items an eine
+Checkpoint-Datei angehängt. Bricht ein Lauf ab, überspringt der nächste
+Start alle fertigen Zellen, liefert deren Items aus der Datei und rendert
+nur die fehlenden Zellen neu.
+
+Verwendung im Spider (in parse, wenn self.crawler gesetzt ist):
+
+    checkpoint = Checkpoint.from_spider(self)
+    for url, waste_type in ...:
+        cell = (waste_type, url)
+        if checkpoint.done(cell):
+            yield from checkpoint.items(cell)
+            continue
+        try:
+            items = [...]                  # Browser-Arbeit
+        except Exception:
+            checkpoint.mark_failed(cell)
+            continue
+        checkpoint.mark_done(cell, items)
+        yield from items
+
+Nach einem vollständigen Lauf (finish_reason "finished", keine
+fehlgeschlagenen Zellen, keine Spider-Exceptions) wird die Datei gelöscht. Sonst bleibt sie liegen
+und der nächste Start wiederholt nur die fehlenden Zellen.
+Checkpoints älter als CHECKPOINT_MAX_AGE werden ignoriert.
+"""
+
+import json
+import logging
+import os
+import pathlib
+import time
+
+from scrapy import signals
+from scrapy.utils.project import data_path
+
+logger = logging.getLogger(__name__)
+
+
+def _cell_key(cell):
+    return json.dumps(list(cell) if isinstance(cell, (list, tuple)) else [cell], ensure_ascii=False)
+
+
+class Checkpoint:
+    """Append-only Log fertiger Zellen: eine JSON-Zeile pro Zelle."""
+
+    def __init__(self, path, max_age=0, enabled=True):
+        self.path = pathlib.Path(path)
+        self.enabled = enabled
+        self.cells = {}
+        self.failed = 0
+        self._file = None
+        if enabled:
+            self._load(max_age)
+
+    @classmethod
+    def from_spider(cls, spider):
+        settings = spider.crawler.settings
+        jobdir = settings.get("JOBDIR")
+        directory = pathlib.Path(jobdir) if jobdir else pathlib.Path(
+            data_path(settings.get("CHECKPOINT_DIR", "checkpoints"), createdir=True)
+        )
+        checkpoint = cls(
+            directory / f"{spider.name}.cells.jsonl",
+            max_age=settings.getint("CHECKPOINT_MAX_AGE"),
+            enabled=settings.getbool("CHECKPOINT_ENABLED", True),
+        )
+        # Signale halten nur schwache Referenzen → Checkpoint am Spider festhalten
+        spider.checkpoint = checkpoint
+        spider.crawler.signals.connect(checkpoint.spider_closed, signal=signals.spider_closed)
+        if checkpoint.cells:
+            logger.info(
+                f"♻️ Checkpoint: {len(checkpoint.cells)} Zellen aus letztem Lauf werden übersprungen",
+                extra={"spider": spider},
+            )
+            spider.crawler.stats.set_value("checkpoint/resumed_cells", len(checkpoint.cells))
+        return checkpoint
+
+    def _load(self, max_age):
+        try:
+            age = time.time() - self.path.stat().st_mtime
+        except FileNotFoundError:
+            return
+        if 0 < max_age < age:
+            logger.info(f"Checkpoint {self.path.name} ist veraltet, starte neu")
+            self.path.unlink(missing_ok=True)
+            return
+
+        with self.path.open(encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # Letzte Zeile eines abgebrochenen Schreibvorgangs
+                    continue
+                self.cells[entry["cell"]] = entry["items"]
+
+    def done(self, cell):
+        return _cell_key(cell) in self.cells
+
+    def items(self, cell):
+        return [dict(item) for item in self.cells.get(_cell_key(cell), [])]
+
+    def mark_done(self, cell, items):
+        """Speichert eine fertige Zelle sofort (flush + fsync)."""
+        if not self.enabled:
+            return
+        items = [dict(item) for item in items]
+        key = _cell_key(cell)
+        self.cells[key] = items
+
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = self.path.open("a", encoding="utf-8")
+        self._file.write(json.dumps({"cell": key, "items": items}, ensure_ascii=False) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def mark_failed(self, cell):
+        """Zelle fehlgeschlagen: Checkpoint bleibt nach dem Lauf erhalten."""
+        self.failed += 1
+        logger.debug(f"Checkpoint: Zelle {_cell_key(cell)} fehlgeschlagen")
+
+    def spider_closed(self, spider, reason):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        stats = spider.crawler.stats
+        stats.set_value("checkpoint/failed_cells", self.failed)
+        # Vollständiger Lauf: nächster Start beginnt von vorn. Eine Exception
+        # im Callback beendet den Spider ebenfalls mit "finished".
+        if reason == "finished" and not self.failed and not stats.get_value("spider_exceptions/count"):
+            self.path.unlink(missing_ok=True)
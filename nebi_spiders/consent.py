@@ -0,0 +1,200 @@
+"""
+Consent-Profile: Cookie-Banner einmal wegklicken, danach vorab setzen.
+
+Nach dem ersten erfolgreichen Klick auf "Akzeptieren" speichert der
+Browser-Layer die Consent-Cookies und Consent-Einträge aus localStorage
+des Shops in .scrapy/consent/profiles.json. Vor der nächsten Navigation
+zu diesem Shop (neuer Lauf, neuer Browser nach Watchdog-Neustart) werden
+sie per Chrome DevTools gesetzt, bevor die Seite lädt - der Banner
+erscheint gar nicht erst.
+
+Die Klick-Routinen der Spider bleiben als Fallback, laufen aber nur noch,
+wenn driver.needs_consent() True ist - also so lange, bis für den Host ein
+Profil gesetzt oder ein Klick gemeldet wurde. Schlägt der Klick fehl, wird
+er auf der nächsten Seite erneut versucht. Erfasst wird nur, wenn der
+Spider einen erfolgreichen Klick meldet - ein Banner, der nur aus dem DOM
+entfernt oder gar nicht gefunden wurde, ergibt kein Profil:
+
+    if self.driver.needs_consent() and self._dismiss_cookie_banner():
+        self.driver.consent_given()
+"""
+
+import json
+import logging
+import pathlib
+import re
+import threading
+import time
+from urllib.parse import urlsplit
+
+from scrapy.utils.project import data_path
+
+logger = logging.getLogger(__name__)
+
+# Profile älter als das werden neu erfasst (Shops wechseln ihr Consent-Tool)
+MAX_AGE = 30 * 24 * 60 * 60
+
+# Namen der Consent-Cookies/localStorage-Keys bekannter Consent-Tools - nur
+# diese werden gespeichert, keine Session-, Warenkorb- oder Tracking-Cookies
+CONSENT_NAME_RE = re.compile(
+    r"^(?:"
+    r"borlabs-cookie"                                    # Borlabs Cookie
+    r"|cmplz_"                                           # Complianz
+    r"|ccm_consents?$"                                   # CCM19
+    r"|CookieConsent$"                                   # Cookiebot
+    r"|OptanonConsent$|OptanonAlertBoxClosed$"           # OneTrust
+    r"|uc_settings$|uc_user_interaction$|ucData$"        # Usercentrics
+    r"|real_cookie_banner"                               # Real Cookie Banner
+    r"|didomi_token$"                                    # Didomi
+    r"|_iub_cs-"                                         # iubenda
+    r"|moove_gdpr_popup$"                                # GDPR Cookie Compliance
+    r"|klaro$"                                           # Klaro
+    r"|cookieyes-consent$"                               # CookieYes
+    r"|cookielawinfo-checkbox-"                          # CookieLawInfo
+    r"|cookie_notice_accepted$"                          # Cookie Notice
+    r"|euconsent-v2$|eupubconsent-v2$"                   # IAB TCF
+    r")"
+)
+
+_LOCAL_STORAGE_JS = "return Object.assign({}, window.localStorage);"
+
+
+def host_of(url):
+    host = (urlsplit(url).hostname or "").lower()
+    return host.removeprefix("www.")
+
+
+def _to_cdp_cookie(cookie):
+    """Selenium-Cookie → Format für Network.setCookies."""
+    cdp = {
+        "name": cookie["name"],
+        "value": cookie["value"],
+        "domain": cookie.get("domain", ""),
+        "path": cookie.get("path", "/"),
+        "secure": cookie.get("secure", False),
+        "httpOnly": cookie.get("httpOnly", False),
+    }
+    if "expiry" in cookie:
+        cdp["expires"] = cookie["expiry"]
+    if cookie.get("sameSite") in ("Strict", "Lax", "None"):
+        cdp["sameSite"] = cookie["sameSite"]
+    return cdp
+
+
+class ConsentStore:
+    """Consent-Profile pro Shop-Host, als JSON-Datei gespeichert."""
+
+    def __init__(self, path=None, max_age=MAX_AGE):
+        self.path = pathlib.Path(path or pathlib.Path(data_path("consent", createdir=True)) / "profiles.json")
+        self.max_age = max_age
+        # PLZ-Raster: mehrere Browser in Threads teilen sich den Store
+        self._lock = threading.Lock()
+        try:
+            self.profiles = json.loads(self.path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            self.profiles = {}
+
+    def get(self, host):
+        profile = self.profiles.get(host)
+        if profile and 0 < self.max_age < time.time() - profile["captured_at"]:
+            return None
+        return profile
+
+    def save(self, host, cookies, local_storage):
+        with self._lock:
+            self.profiles[host] = {
+                "cookies": cookies,
+                "local_storage": local_storage,
+                "captured_at": time.time(),
+            }
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(self.path.name + ".tmp")
+            tmp_path.write_text(json.dumps(self.profiles, ensure_ascii=False, indent=1), encoding="utf-8")
+            tmp_path.replace(self.path)
+
+
+_shared_store = None
+
+
+def shared_store():
+    """Ein Store pro Prozess - mehrere Spider in einem Lauf teilen die Datei."""
+    global _shared_store
+    if _shared_store is None:
+        _shared_store = ConsentStore()
+    return _shared_store
+
+
+class ConsentSession:
+    """Consent-Zustand eines Browser-Prozesses (nach Neustart neu anlegen)."""
+
+    def __init__(self, store):
+        self.store = store
+        # Hosts, für die in diesem Browser Consent vorliegt (gesetzt oder geklickt)
+        self.hosts = set()
+        # Hosts, deren Banner per Klick-Fallback akzeptiert wurde → Profil erfassen
+        self._pending = set()
+
+    def needs_consent(self, url):
+        """True, solange für den Host weder ein Profil gesetzt noch ein Klick gemeldet wurde."""
+        return host_of(url) not in self.hosts
+
+    def consent_given(self, url):
+        """Der Spider hat den Banner erfolgreich akzeptiert → Profil erfassen."""
+        host = host_of(url)
+        self.hosts.add(host)
+        self._pending.add(host)
+
+    def before_navigation(self, driver, url):
+        """Consent der aktuellen Seite erfassen, Profil für das Ziel setzen."""
+        self.capture(driver)
+
+        host = host_of(url)
+        if not host or host in self.hosts:
+            return
+        profile = self.store.get(host)
+        if profile is None:
+            return
+        try:
+            self._inject(driver, host, profile)
+        except Exception as e:
+            # z.B. kein Chrome/CDP - dann greift der Klick-Fallback im Spider
+            logger.debug(f"Consent-Profil für {host} nicht gesetzt: {e}")
+            return
+        self.hosts.add(host)
+
+    def capture(self, driver):
+        """Speichert das Profil der geladenen Seite, falls dort gerade akzeptiert wurde."""
+        try:
+            host = host_of(driver.current_url)
+            if host not in self._pending:
+                return
+            self._pending.discard(host)
+
+            cookies = [cookie for cookie in driver.get_cookies() if CONSENT_NAME_RE.search(cookie["name"])]
+            local_storage = {
+                key: value for key, value in (driver.execute_script(_LOCAL_STORAGE_JS) or {}).items()
+                if CONSENT_NAME_RE.search(key)
+            }
+        except Exception as e:
+            logger.debug(f"Consent nicht erfasst: {e}")
+            return
+
+        if cookies or local_storage:
+            self.store.save(host, cookies, local_storage)
+            logger.info(f"🍪 Consent-Profil gespeichert: {host} ({len(cookies)} Cookies, {len(local_storage)} localStorage)")
+
+    def _inject(self, driver, host, profile):
+        if profile["cookies"]:
+            driver.execute_cdp_cmd(
+                "Network.setCookies",
+                {"cookies": [_to_cdp_cookie(cookie) for cookie in profile["cookies"]]},
+            )
+        if profile["local_storage"]:
+            # Läuft in jedem neuen Dokument vor den Seiten-Scripts
+            source = (
+                f"if (location.hostname.replace(/^www\\./, '') === {json.dumps(host)}) {{"
+                f" const items = {json.dumps(profile['local_storage'])};"
+                " for (const [k, v] of Object.entries(items)) {"
+                "  if (localStorage.getItem(k) === null) localStorage.setItem(k, v); } }"
+            )
+            driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": source})
@@ -0,0 +1,238 @@
+"""
+Produkt-URL-Erkennung über sitemap.xml und Kategorieseiten.
+
+Statt fest codierter Produkt-URL-Listen (dare-shop, abc-container) liest
+der Spider zuerst die Sitemap bzw. Übersichtsseiten des Shops über normale
+Scrapy-Requests, filtert die Produkt-URLs per Muster und übergibt nur diese
+an die (teure) Extraktion. Die bisherige Liste bleibt als Fallback, falls
+keine Quelle erreichbar ist oder nichts passt.
+
+Verwendung im Spider:
+
+    discovery = {
+        "sitemaps": ["https://www.dare-shop.de/sitemap.xml"],
+        "categories": [],                    # Seiten, deren Links geprüft werden
+        "follow": r"/container-bestellen/\\d+/",   # Muster für Produkt-URLs
+        "callback": "parse",                 # Extraktion
+        "fallback": [...],                   # bisherige feste Liste
+        "merge_fallback": False,             # feste Liste immer ergänzen
+    }
+
+    async def start(self):
+        for request in Discovery.from_spider(self).start_requests():
+            yield request
+
+merge_fallback: Kategorieseiten verlinken oft nicht alle Produkte
+(Teaser, Paginierung, Menüs per JS). Dann wird die feste Liste nach der
+Erkennung um die nicht gefundenen URLs ergänzt statt nur als Ersatz
+genutzt; im URL-Index landen weiterhin nur erkannte URLs.
+
+Der URL-Index (.scrapy/discovery/<spider>.json) hält pro URL first_seen,
+last_seen, last_changed und lastmod aus der Sitemap. Neue und
+verschwundene URLs gegenüber dem letzten Lauf werden geloggt
+(Stats discovery/new, discovery/removed, discovery/changed).
+"""
+
+import json
+import logging
+import os
+import pathlib
+import re
+import time
+
+from scrapy import Request, signals
+from scrapy.utils.gz import gunzip, gzip_magic_number
+from scrapy.utils.project import data_path
+from scrapy.utils.sitemap import Sitemap
+
+logger = logging.getLogger(__name__)
+
+# Verschachtelte Sitemap-Indizes nur bis zu dieser Tiefe verfolgen
+MAX_SITEMAP_DEPTH = 2
+
+
+def _normalize(url):
+    """URL ohne Fragment, damit Sitemap- und Seiten-Links zusammenfallen."""
+    return url.split("#", 1)[0]
+
+
+class UrlIndex:
+    """URL → first_seen / last_seen / last_changed / lastmod, als JSON-Datei."""
+
+    def __init__(self, path):
+        self.path = pathlib.Path(path)
+        try:
+            self.urls = json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            self.urls = {}
+        except ValueError as e:
+            logger.warning(f"⚠️ URL-Index {self.path} unlesbar, beginne neu: {e}")
+            self.urls = {}
+        self.previous = set(self.urls)
+
+    def touch(self, url, lastmod=None, now=None):
+        """Vermerkt url als gesehen; liefert "new", "changed" oder None."""
+        now = int(now or time.time())
+        entry = self.urls.get(url)
+        if entry is None:
+            self.urls[url] = {"first_seen": now, "last_seen": now, "last_changed": now, "lastmod": lastmod}
+            return "new"
+        entry["last_seen"] = now
+        if lastmod and lastmod != entry.get("lastmod"):
+            changed = entry.get("lastmod") is not None
+            entry["lastmod"] = lastmod
+            if changed:
+                entry["last_changed"] = now
+                return "changed"
+        return None
+
+    def prune(self, seen):
+        """Entfernt URLs, die in diesem Lauf nicht mehr gefunden wurden."""
+        removed = sorted(url for url in self.urls if url not in seen)
+        for url in removed:
+            del self.urls[url]
+        return removed
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        tmp_path.write_text(json.dumps(self.urls, ensure_ascii=False, indent=1, sort_keys=True), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+
+
+class Discovery:
+    """Erkennungsstufe eines Spiders: Quellen lesen, Produkt-URLs weiterreichen."""
+
+    def __init__(self, spider, index, sitemaps=(), categories=(), follow=None,
+                 callback="parse", fallback=(), merge_fallback=False, enabled=True):
+        self.spider = spider
+        self.index = index
+        self.sitemaps = list(sitemaps)
+        self.categories = list(categories)
+        self.follow = re.compile(follow) if follow else None
+        self.callback = getattr(spider, callback)
+        self.fallback = list(fallback)
+        self.merge_fallback = merge_fallback
+        self.enabled = enabled
+        self.stats = spider.crawler.stats
+        self.seen = set()
+        self.failed = 0
+        self._pending = 0
+
+    @classmethod
+    def from_spider(cls, spider):
+        settings = spider.crawler.settings
+        directory = pathlib.Path(data_path(settings.get("DISCOVERY_DIR", "discovery"), createdir=True))
+        discovery = cls(
+            spider,
+            UrlIndex(directory / f"{spider.name}.json"),
+            enabled=settings.getbool("DISCOVERY_ENABLED", True),
+            **spider.discovery,
+        )
+        # Signale halten nur schwache Referenzen → am Spider festhalten
+        spider.url_discovery = discovery
+        spider.crawler.signals.connect(discovery.spider_closed, signal=signals.spider_closed)
+        return discovery
+
+    def start_requests(self):
+        if not self.enabled or not (self.sitemaps or self.categories):
+            yield from self._use_fallback("Erkennung deaktiviert")
+            return
+
+        for url in self.sitemaps:
+            yield self._source_request(url, self._parse_sitemap, depth=0)
+        for url in self.categories:
+            yield self._source_request(url, self._parse_category)
+
+    def _source_request(self, url, callback, **cb_kwargs):
+        self._pending += 1
+        # Quellen vor den Produktseiten abarbeiten
+        return Request(url, callback=callback, errback=self._source_failed,
+                       cb_kwargs=cb_kwargs, dont_filter=True, priority=10)
+
+    def _parse_sitemap(self, response, depth):
+        body = response.body
+        if gzip_magic_number(response):
+            body = gunzip(body)
+        try:
+            sitemap = Sitemap(body)
+            entries = list(sitemap)
+        except Exception as e:
+            self.failed += 1
+            self.stats.inc_value("discovery/sources_failed")
+            logger.warning(f"⚠️ Sitemap {response.url} nicht lesbar: {e}")
+            yield from self._source_done()
+            return
+        self.stats.inc_value("discovery/sitemaps")
+
+        if sitemap.type == "sitemapindex":
+            for entry in entries:
+                if depth < MAX_SITEMAP_DEPTH:
+                    yield self._source_request(entry["loc"], self._parse_sitemap, depth=depth + 1)
+        else:
+            for entry in entries:
+                yield from self._found(entry["loc"], entry.get("lastmod"))
+        yield from self._source_done()
+
+    def _parse_category(self, response):
+        for href in response.xpath("//a/@href").getall():
+            yield from self._found(response.urljoin(href.strip()))
+        yield from self._source_done()
+
+    def _source_failed(self, failure):
+        self.failed += 1
+        self.stats.inc_value("discovery/sources_failed")
+        logger.warning(f"⚠️ Erkennungsquelle nicht erreichbar: {failure.request.url} ({failure.value})")
+        yield from self._source_done()
+
+    def _found(self, url, lastmod=None):
+        url = _normalize(url)
+        if self.follow is not None and not self.follow.search(url):
+            return
+        if url in self.seen:
+            return
+        self.seen.add(url)
+        self.stats.inc_value("discovery/urls")
+
+        status = self.index.touch(url, lastmod)
+        if status is not None:
+            self.stats.inc_value(f"discovery/{status}")
+            if status == "new" and self.index.previous:
+                logger.info(f"🆕 Neue Produkt-URL: {url}")
+        yield Request(url, callback=self.callback)
+
+    def _source_done(self):
+        self._pending -= 1
+        if self._pending == 0:
+            if self.seen:
+                logger.info(f"🧭 {len(self.seen)} Produkt-URLs erkannt")
+                if self.merge_fallback:
+                    yield from self._merge_fallback()
+            else:
+                yield from self._use_fallback("keine Produkt-URLs in Sitemap/Kategorien")
+
+    def _merge_fallback(self):
+        missing = [url for url in dict.fromkeys(self.fallback) if _normalize(url) not in self.seen]
+        if missing:
+            self.stats.set_value("discovery/fallback_merged", len(missing))
+            logger.info(f"🧭 {len(missing)} URLs aus der festen Liste ergänzt")
+        for url in missing:
+            yield Request(url, callback=self.callback)
+
+    def _use_fallback(self, reason):
+        self.stats.set_value("discovery/fallback", 1)
+        logger.warning(f"⚠️ {reason} - verwende feste Liste ({len(self.fallback)} URLs)")
+        for url in self.fallback:
+            yield Request(url, callback=self.callback)
+
+    def spider_closed(self, spider, reason):
+        # Nur ein echter Erkennungslauf darf den Index ändern; verschwundene
+        # URLs nur dann entfernen, wenn alle Quellen gelesen wurden
+        if not self.seen:
+            return
+        removed = [] if self.failed else self.index.prune(self.seen)
+        for url in removed:
+            logger.info(f"🗑️ Produkt-URL nicht mehr gelistet: {url}")
+        if removed:
+            self.stats.set_value("discovery/removed", len(removed))
+        self.index.save()
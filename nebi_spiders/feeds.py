@@ -0,0 +1,152 @@
+"""
+Feed-Ausgabe für data/<spider>-products.jsonl
+
+AtomicFileFeedStorage schreibt zuerst in <ziel>.tmp und ersetzt die
+Zieldatei erst beim Schließen des Spiders (flush, fsync, os.replace).
+Ein abgebrochener Lauf (Ctrl-C, Timeout, Absturz) oder ein Lauf ohne
+Items (Seite umgebaut, Login-Wand) überschreibt also nie die Daten des
+letzten erfolgreichen Laufs; die Teil-Datei bleibt als <ziel>.partial
+liegen.
+
+ZstdPlugin komprimiert den Feed optional mit zstd (Paket `zstandard`):
+    FEEDS = {"data/x-products.jsonl.zst": {
+        "format": "jsonlines",
+        "postprocessing": ["nebi_spiders.feeds.ZstdPlugin"],
+    }}
+
+Lesen (auch komprimiert, Zeile für Zeile): read_products(pfad)
+Aktuellste Datei pro Spider in data/: latest_feeds(data_dir)
+"""
+
+import io
+import json
+import logging
+import os
+import pathlib
+
+from w3lib.url import file_uri_to_path
+
+logger = logging.getLogger(__name__)
+
+# Nur bei diesen Gründen wird die Zieldatei ersetzt
+PUBLISH_REASONS = ("finished",)
+
+
+class AtomicFileFeedStorage:
+    """FEED_STORAGES-Backend für lokale Pfade mit atomarem Ersetzen."""
+
+    def __init__(self, uri, *, feed_options=None, crawler=None):
+        self.path = pathlib.Path(file_uri_to_path(uri) if uri.startswith("file:") else uri)
+        self.tmp_path = self.path.with_name(self.path.name + ".tmp")
+        self.partial_path = self.path.with_name(self.path.name + ".partial")
+        self.crawler = crawler
+
+    @classmethod
+    def from_crawler(cls, crawler, uri, *, feed_options=None):
+        return cls(uri, feed_options=feed_options, crawler=crawler)
+
+    def open(self, spider):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        return self.tmp_path.open("wb")
+
+    def store(self, file):
+        file.flush()
+        os.fsync(file.fileno())
+        file.close()
+
+        # CoreStats setzt finish_reason vor dem Feed-Export (spider_closed)
+        if self.crawler is not None:
+            reason = self.crawler.stats.get_value("finish_reason")
+            items = self.crawler.stats.get_value("item_scraped_count", 0)
+        else:
+            reason, items = "finished", None
+        if reason not in PUBLISH_REASONS or items == 0:
+            os.replace(self.tmp_path, self.partial_path)
+            cause = f"Lauf nicht abgeschlossen ({reason})" if reason not in PUBLISH_REASONS else "keine Items"
+            logger.warning(
+                f"⚠️ {cause} - {self.path.name} bleibt unverändert, "
+                f"Teil-Daten in {self.partial_path.name}"
+            )
+            return
+
+        os.replace(self.tmp_path, self.path)
+        self.partial_path.unlink(missing_ok=True)
+        _fsync_dir(self.path.parent)
+
+
+def _fsync_dir(path):
+    """Macht das Umbenennen selbst dauerhaft (Verzeichniseintrag auf Platte)."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class ZstdPlugin:
+    """
+    Feed-Postprocessing mit zstd.
+
+    feed_options: zstd_level (Standard 10)
+    """
+
+    def __init__(self, file, feed_options):
+        import zstandard
+
+        self.file = file
+        self.feed_options = feed_options
+        level = self.feed_options.get("zstd_level", 10)
+        self.writer = zstandard.ZstdCompressor(level=level).stream_writer(file, closefd=False)
+
+    def write(self, data):
+        return self.writer.write(data)
+
+    def close(self):
+        self.writer.close()
+
+
+def read_products(path):
+    """Liest eine (ggf. .zst-komprimierte) JSON-Lines-Datei Produkt für Produkt."""
+    path = pathlib.Path(path)
+    with path.open("rb") as raw:
+        if path.suffix == ".zst":
+            import zstandard
+
+            stream = io.TextIOWrapper(zstandard.ZstdDecompressor().stream_reader(raw), encoding="utf-8")
+        else:
+            stream = io.TextIOWrapper(raw, encoding="utf-8")
+        for line in stream:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+# Reihenfolge = Vorrang, falls für einen Spider mehrere Formate vorliegen
+FEED_SUFFIXES = ("-products.jsonl", "-products.jsonl.zst", "-products.json")
+
+
+def latest_feeds(data_dir):
+    """
+    {spider: pfad} aller Feeds in data_dir. JSON Lines hat Vorrang vor
+    alten -products.json-Dateien (JSON-Array aus der Zeit vor dem Umstieg,
+    nur noch in data/archive/).
+    """
+    feeds = {}
+    for suffix in FEED_SUFFIXES:
+        for path in sorted(pathlib.Path(data_dir).glob(f"*{suffix}")):
+            feeds.setdefault(path.name[: -len(suffix)], path)
+    return feeds
+
+
+def read_feed(path):
+    """Wie read_products, versteht zusätzlich alte JSON-Array-Dateien."""
+    path = pathlib.Path(path)
+    if path.suffix == ".json":
+        content = path.read_text(encoding="utf-8").strip()
+        return json.loads(content) if content else []
+    return list(read_products(path))
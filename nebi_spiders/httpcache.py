@@ -0,0 +1,231 @@
+"""
+HTTP-Cache für Entwicklung und Replay-Läufe.
+
+Eine SQLite-Datei statt Scrapys FilesystemCacheStorage (ein Verzeichnis
+mit mehreren Dateien pro Request). Bodies werden mit zstd komprimiert,
+falls `zstandard` installiert ist, sonst mit zlib.
+
+Jeder Spider hat einen eigenen Namespace in derselben Datei. Neben
+Scrapy-Responses (HTML, PDF-Preislisten) speichert der Cache auch
+Browser-Snapshots (page_source nach dem Rendern in Selenium), siehe
+nebi_spiders.browser.render.
+
+Aktivieren in settings.py:
+    HTTPCACHE_ENABLED = True
+    HTTPCACHE_STORAGE = "nebi_spiders.httpcache.SqliteCacheStorage"
+
+Ablauf pro Art (Sekunden, 0 = nie):
+    HTTPCACHE_EXPIRATION_SECS           HTML/JSON über Scrapy
+    HTTPCACHE_PDF_EXPIRATION_SECS       PDF-Preislisten
+    HTTPCACHE_BROWSER_EXPIRATION_SECS   Browser-Snapshots
+"""
+
+import logging
+import pathlib
+import sqlite3
+import time
+import zlib
+
+from scrapy.http import Headers
+from scrapy.responsetypes import responsetypes
+from scrapy.utils.misc import load_object
+from scrapy.utils.project import data_path
+from w3lib.http import headers_dict_to_raw, headers_raw_to_dict
+
+try:
+    import zstandard
+except ImportError:  # optional, zlib als Fallback
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+DB_FILENAME = "httpcache.sqlite3"
+
+KIND_HTTP = "http"
+KIND_PDF = "pdf"
+KIND_BROWSER = "browser"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    namespace   TEXT NOT NULL,
+    key         TEXT NOT NULL,
+    kind        TEXT NOT NULL,
+    stored_at   REAL NOT NULL,
+    url         TEXT NOT NULL,
+    status      INTEGER NOT NULL,
+    headers     BLOB NOT NULL,
+    codec       TEXT NOT NULL,
+    body        BLOB NOT NULL,
+    PRIMARY KEY (namespace, key)
+) WITHOUT ROWID
+"""
+
+
+def _compress(data):
+    """Gibt (codec, komprimierte Bytes) zurück."""
+    if zstandard is not None:
+        return "zstd", zstandard.ZstdCompressor(level=10).compress(data)
+    return "zlib", zlib.compress(data, 6)
+
+
+def _decompress(codec, data):
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("Cache-Eintrag ist zstd-komprimiert, aber zstandard fehlt")
+        return zstandard.ZstdDecompressor().decompress(data)
+    if codec == "zlib":
+        return zlib.decompress(data)
+    return data
+
+
+def response_kind(response):
+    """Ordnet eine Response einer Ablauf-Klasse zu (PDF oder normales HTTP)."""
+    content_type = response.headers.get(b"Content-Type", b"").lower()
+    if b"pdf" in content_type or response.url.lower().endswith(".pdf"):
+        return KIND_PDF
+    return KIND_HTTP
+
+
+def open_db(settings):
+    """Öffnet (und legt bei Bedarf an) die Cache-Datei unter HTTPCACHE_DIR."""
+    cachedir = pathlib.Path(data_path(settings["HTTPCACHE_DIR"], createdir=True))
+    db = sqlite3.connect(cachedir / DB_FILENAME)
+    # WAL: Spider im selben Prozess lesen, während ein anderer schreibt
+    db.execute("PRAGMA journal_mode=WAL")
+    db.execute("PRAGMA synchronous=NORMAL")
+    db.execute(_SCHEMA)
+    return db
+
+
+def expiration_settings(settings):
+    return {
+        KIND_HTTP: settings.getint("HTTPCACHE_EXPIRATION_SECS"),
+        KIND_PDF: settings.getint("HTTPCACHE_PDF_EXPIRATION_SECS"),
+        KIND_BROWSER: settings.getint("HTTPCACHE_BROWSER_EXPIRATION_SECS"),
+    }
+
+
+class _Store:
+    """Lesen/Schreiben von Einträgen eines Namespaces mit Ablauf-Prüfung."""
+
+    def __init__(self, db, namespace, expiration):
+        self.db = db
+        self.namespace = namespace
+        self.expiration = expiration
+
+    def get(self, key):
+        row = self.db.execute(
+            "SELECT kind, stored_at, url, status, headers, codec, body "
+            "FROM entries WHERE namespace = ? AND key = ?",
+            (self.namespace, key),
+        ).fetchone()
+        if row is None:
+            return None
+
+        kind, stored_at, url, status, headers, codec, body = row
+        max_age = self.expiration.get(kind, 0)
+        if 0 < max_age < time.time() - stored_at:
+            return None  # abgelaufen
+
+        return {
+            "kind": kind,
+            "stored_at": stored_at,
+            "url": url,
+            "status": status,
+            "headers": headers,
+            "body": _decompress(codec, body),
+        }
+
+    def put(self, key, kind, url, status, headers, body):
+        codec, data = _compress(body)
+        self.db.execute(
+            "INSERT OR REPLACE INTO entries "
+            "(namespace, key, kind, stored_at, url, status, headers, codec, body) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (self.namespace, key, kind, time.time(), url, status, headers, codec, data),
+        )
+        self.db.commit()
+
+
+class SqliteCacheStorage:
+    """HTTPCACHE_STORAGE-Backend: eine SQLite-Datei, Namespace pro Spider."""
+
+    def __init__(self, settings):
+        self.settings = settings
+        self.expiration = expiration_settings(settings)
+        self.db = None
+        self.store = None
+
+    def open_spider(self, spider):
+        self.db = open_db(self.settings)
+        self.store = _Store(self.db, spider.name, self.expiration)
+        self._fingerprinter = spider.crawler.request_fingerprinter
+
+        logger.debug(
+            "Using SQLite cache storage in %(cachepath)s",
+            {"cachepath": data_path(self.settings["HTTPCACHE_DIR"])},
+            extra={"spider": spider},
+        )
+
+    def close_spider(self, spider):
+        if self.db is not None:
+            self.db.close()
+            self.db = None
+
+    def retrieve_response(self, spider, request):
+        entry = self.store.get(self._key(request))
+        if entry is None or entry["kind"] == KIND_BROWSER:
+            return None
+
+        request.meta["cache_timestamp"] = entry["stored_at"]
+        headers = Headers(headers_raw_to_dict(entry["headers"]))
+        respcls = responsetypes.from_args(headers=headers, url=entry["url"], body=entry["body"])
+        return respcls(url=entry["url"], headers=headers, status=entry["status"], body=entry["body"])
+
+    def store_response(self, spider, request, response):
+        self.store.put(
+            self._key(request),
+            response_kind(response),
+            response.url,
+            response.status,
+            headers_dict_to_raw(response.headers),
+            response.body,
+        )
+
+    def _key(self, request):
+        return self._fingerprinter.fingerprint(request).hex()
+
+
+class SnapshotCache:
+    """
+    Browser-Snapshots (gerenderter page_source) im selben Cache.
+
+    Schlüssel ist ein frei gewählter String, z.B. die URL oder
+    "url|abfallart|größe" nach Klicks im Formular.
+    """
+
+    def __init__(self, settings, spider_name):
+        self.db = open_db(settings)
+        self.store = _Store(self.db, spider_name, expiration_settings(settings))
+
+    @classmethod
+    def from_spider(cls, spider):
+        """Nur aktiv, wenn der SQLite-Cache für den Spider eingeschaltet ist."""
+        settings = spider.crawler.settings
+        if not settings.getbool("HTTPCACHE_ENABLED"):
+            return None
+        if load_object(settings["HTTPCACHE_STORAGE"]) is not SqliteCacheStorage:
+            return None
+        return cls(settings, spider.name)
+
+    def get(self, key):
+        entry = self.store.get(f"{KIND_BROWSER}:{key}")
+        if entry is None or entry["kind"] != KIND_BROWSER:
+            return None
+        return entry["body"].decode("utf-8")
+
+    def set(self, key, url, html):
+        self.store.put(f"{KIND_BROWSER}:{key}", KIND_BROWSER, url, 200, b"", html.encode("utf-8"))
+
+    def close(self):
+        self.db.close()
@@ -0,0 +1,100 @@
+"""
+Import-Benchmark
+Misst in frischen Python-Prozessen, wie lange `scrapy list` bzw. der Start
+eines reinen HTTP-Spiders braucht, und prüft, dass dabei weder Selenium
+noch pdfplumber geladen werden.
+
+Aufruf (aus dem Projekt-Root):
+    python -m nebi_spiders.importbench
+
+Exit-Code 1, wenn ein Budget überschritten oder ein schweres Modul geladen wurde.
+"""
+
+import json
+import statistics
+import subprocess
+import sys
+
+# Budgets in Sekunden (Median über alle Wiederholungen)
+SPIDER_SCAN_BUDGET = 0.25   # SPIDER_MODULES-Scan nach `import scrapy`
+STARTUP_BUDGET = 1.5        # Interpreter + Scrapy + Scan + HTTP-Spider laden
+
+REPEATS = 5
+
+# Spider ohne Browser/PDF - deren Start darf keine schweren Module laden
+HTTP_SPIDERS = ["noris24", "container-nrw"]
+
+# Module, die nur bei Browser- bzw. PDF-Nutzung importiert werden dürfen
+HEAVY_MODULES = [
+    "selenium.webdriver.common.by",
+    "selenium.webdriver.support.ui",
+    "selenium.webdriver.chrome.webdriver",
+    "pdfplumber",
+    "pdfminer",
+]
+
+_PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+import scrapy
+from scrapy.spiderloader import get_spider_loader
+from scrapy.utils.project import get_project_settings
+t1 = time.perf_counter()
+loader = get_spider_loader(get_project_settings())
+loader.list()
+for name in sys.argv[1:]:
+    loader.load(name)
+t2 = time.perf_counter()
+print(json.dumps({
+    "scrapy_import": t1 - t0,
+    "spider_scan": t2 - t1,
+    "modules": sorted(sys.modules),
+}))
+"""
+
+
+def probe(spiders):
+    """Startet einen frischen Interpreter und misst Import- und Scan-Zeit."""
+    result = subprocess.run(
+        [sys.executable, "-c", _PROBE, *spiders],
+        capture_output=True, text=True, check=True,
+    )
+    data = json.loads(result.stdout)
+    data["total"] = data["scrapy_import"] + data["spider_scan"]
+    return data
+
+
+def main():
+    runs = [probe(HTTP_SPIDERS) for _ in range(REPEATS)]
+
+    spider_scan = statistics.median(run["spider_scan"] for run in runs)
+    total = statistics.median(run["total"] for run in runs)
+    loaded = sorted({
+        heavy for run in runs for heavy in HEAVY_MODULES
+        if heavy in run["modules"]
+    })
+
+    ok = True
+    print(f"{'='*80}")
+    print(f"Import-Benchmark ({REPEATS} Läufe, Median)")
+    print(f"{'='*80}")
+
+    status = "✓" if spider_scan <= SPIDER_SCAN_BUDGET else "❌"
+    ok &= spider_scan <= SPIDER_SCAN_BUDGET
+    print(f"  {status} Spider-Scan: {spider_scan:.3f}s (Budget {SPIDER_SCAN_BUDGET:.2f}s)")
+
+    status = "✓" if total <= STARTUP_BUDGET else "❌"
+    ok &= total <= STARTUP_BUDGET
+    print(f"  {status} Start gesamt: {total:.3f}s (Budget {STARTUP_BUDGET:.2f}s)")
+
+    if loaded:
+        ok = False
+        print(f"  ❌ Schwere Module geladen: {', '.join(loaded)}")
+    else:
+        print(f"  ✓ Keine schweren Module geladen")
+
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
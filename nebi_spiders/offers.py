@@ -0,0 +1,128 @@
+"""
+Normalisierung von Angeboten (Produkt-Dicts der Spider).
+
+Die Spider liefern Preise und Größen als Strings im Shop-Format
+("1.209,00", "580,00", "199", "7 m³", "5.5"). Hier werden sie einheitlich
+in Zahlen umgerechnet, z.B. für Duplikat-Erkennung und Auswertungen.
+"""
+
+import hashlib
+import re
+
+_SPACE_RE = re.compile(r"\s+")
+_NUMBER_RE = re.compile(r"\d+(?:[.,]\d+)*")
+
+
+def normalize_text(value):
+    """Kleinschreibung, Leerzeichen zusammengefasst; None → ""."""
+    if value is None:
+        return ""
+    return _SPACE_RE.sub(" ", str(value)).strip().casefold()
+
+
+def parse_size(value):
+    """'7', '5.5', '5,5', '10 m³', '7m³' → float (m³) oder None."""
+    match = _NUMBER_RE.search(str(value or ""))
+    if not match:
+        return None
+    return float(match.group().replace(",", "."))
+
+
+def parse_price(value):
+    """
+    Preis-String → Cent (int) oder None.
+
+    '1.209,00' → 120900, '580,00' → 58000, '199' → 19900, '199€' → 19900,
+    englisch/JSON: '1,209.00' → 120900, '373.07' → 37307, '1209.5' → 120950
+
+    Das letzte Trennzeichen ist das Dezimalzeichen, wenn ihm ein oder zwei
+    Ziffern folgen; mit drei Ziffern ist es ein Tausendertrennzeichen.
+    """
+    match = _NUMBER_RE.search(str(value or ""))
+    if not match:
+        return None
+    number = match.group()
+    last = max(number.rfind(","), number.rfind("."))
+    if last != -1 and len(number) - last - 1 <= 2:
+        euros, cents = number[:last], number[last + 1:]
+    else:
+        euros, cents = number, "0"
+    euros = euros.replace(".", "").replace(",", "")
+    return int(euros or 0) * 100 + int(cents.ljust(2, "0"))
+
+
+def format_price(value):
+    """Euro-Betrag (Zahl oder '373.07') → Shop-Format: 449 → '449,00', 1209.5 → '1209,50'."""
+    return f"{float(value):.2f}".replace(".", ",")
+
+
+def fingerprint(*parts):
+    """64-Bit-Fingerprint (int) aus normalisierten Teilen."""
+    data = "\x1f".join(str(part) for part in parts).encode("utf-8")
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "big")
+
+
+def offer_identity(item):
+    """Was ein Angebot ausmacht: Anbieter, Stadt, Abfallart, Größe (+ PLZ, falls gesetzt)."""
+    size = parse_size(item.get("size"))
+    identity = (
+        normalize_text(item.get("source")),
+        normalize_text(item.get("city")),
+        normalize_text(item.get("type")),
+        f"{size:g}" if size is not None else normalize_text(item.get("size")),
+    )
+    # PLZ-Raster (nebi_spiders.plzgrid): abweichende Preise einer weiteren PLZ
+    return identity + (item["plz"],) if item.get("plz") else identity
+
+
+def offer_fingerprints(item):
+    """
+    (identität, angebot): Fingerprint ohne bzw. mit Preis.
+
+    Gleiche Identität im selben Lauf = Duplikat; gleicher Angebots-
+    Fingerprint wie im letzten Lauf = unverändertes Angebot.
+    """
+    identity = offer_identity(item)
+    price = parse_price(item.get("price"))
+    return fingerprint(*identity), fingerprint(*identity, price if price is not None else normalize_text(item.get("price")))
+
+
+# Zusatzkosten-Felder (arrival_price, lid_price, cancellation_fee, ...)
+_INCLUDED_RE = re.compile(r"inklusive|inkl\.|im preis enthalten|kostenlos|gratis")
+_UNAVAILABLE_RE = re.compile(r"nicht verfügbar|nicht möglich")
+_EURO_AMOUNT_RE = re.compile(r"(\d+(?:[.,]\d+)*)\s*€")
+
+UNKNOWN = "unknown"
+UNAVAILABLE = "unavailable"
+
+
+def parse_amount_range(value):
+    """
+    Zusatzkosten-String → (min, max) in Cent, UNKNOWN oder UNAVAILABLE.
+
+    'inklusive' → (0, 0), '5,95€' → (595, 595),
+    'Abhängig v. d. Zone 4€,6€,10€,12€' → (400, 1200),
+    '' / None / 'Preis anfragen' / 'Plane oder Netz möglich' → UNKNOWN,
+    'nicht verfügbar' → UNAVAILABLE
+    """
+    text = normalize_text(value)
+    if not text:
+        return UNKNOWN
+    if _UNAVAILABLE_RE.search(text):
+        return UNAVAILABLE
+    if _INCLUDED_RE.search(text):
+        return 0, 0
+
+    # Bei Texten mit € nur Beträge mit €, sonst stören z.B. "Zone 1:"
+    amounts = _EURO_AMOUNT_RE.findall(text) if "€" in text else _NUMBER_RE.findall(text)
+    cents = [parse_price(amount) for amount in amounts]
+    cents = [amount for amount in cents if amount is not None]
+    if not cents:
+        return UNKNOWN
+    return min(cents), max(cents)
+
+
+def parse_days(value):
+    """'14' → 14.0, sonst None."""
+    match = _NUMBER_RE.search(str(value or ""))
+    return float(match.group().replace(",", ".")) if match else None
@@ -0,0 +1,86 @@
+"""
+PDF-Hilfsfunktionen für Spider mit PDF-Preislisten
+(todra-container, silo-zentrale, abc-container-hamburg).
+
+Das PDF kommt als Scrapy-Response über die Engine und wird direkt
+im Speicher geöffnet - keine temporären Dateien, kein zweiter Download.
+
+Die Layout-Analyse von pdfminer (extract_tables/extract_text) ist
+CPU-lastig und läuft deshalb in einem ProcessPoolExecutor. Spider
+warten in async-Callbacks darauf, der Reactor bleibt frei.
+"""
+
+import asyncio
+import io
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+# Anzahl Worker-Prozesse für die PDF-Analyse
+PDF_WORKERS = max(1, min(4, (os.cpu_count() or 2) - 1))
+
+_executor = None
+
+
+def open_pdf(body, pages=None):
+    """
+    Öffnet PDF-Bytes mit pdfplumber.
+
+    pages: Liste der benötigten Seitennummern (1-basiert), z.B. [1, 2].
+    Nur diese Seiten werden geladen; pdf.pages enthält dann genau diese
+    Seiten in Dokument-Reihenfolge.
+    """
+    # pdfplumber/pdfminer wird nur im Worker-Prozess gebraucht
+    import pdfplumber
+
+    # BytesIO teilt sich den Puffer mit dem bytes-Objekt,
+    # solange nicht hineingeschrieben wird (keine Kopie des PDFs)
+    return pdfplumber.open(io.BytesIO(body), pages=pages)
+
+
+def _wanted(selection, page_number):
+    """True/False gilt für alle Seiten, eine Liste nur für diese Seitennummern."""
+    if isinstance(selection, bool):
+        return selection
+    return page_number in selection
+
+
+def _extract_pages(body, pages, tables, text):
+    """Läuft im Worker-Prozess und gibt nur einfache Listen/Strings zurück."""
+    result = []
+    with open_pdf(body, pages=pages) as pdf:
+        for page in pdf.pages:
+            number = page.page_number
+            result.append({
+                "page_number": number,
+                "tables": page.extract_tables() if _wanted(tables, number) else [],
+                "text": page.extract_text() if _wanted(text, number) else None,
+            })
+    return result
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        # spawn statt fork: der Hauptprozess hat Reactor- und Selenium-Threads
+        _executor = ProcessPoolExecutor(
+            max_workers=PDF_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _executor
+
+
+async def extract_pages(response, pages=None, tables=True, text=False):
+    """
+    Extrahiert Tabellen und/oder Text aus einer PDF-Response.
+
+    tables/text: True/False für alle geladenen Seiten oder eine Liste
+    von Seitennummern, z.B. text=[2] für nur die AGB-Seite.
+
+    Gibt pro geladener Seite ein Dict zurück:
+    {"page_number": 1, "tables": [[[zelle, ...], ...], ...], "text": "..."|None}
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _get_executor(), _extract_pages, response.body, pages, tables, text
+    )
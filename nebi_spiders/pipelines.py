@@ -3,11 +3,109 @@
 # Don't forget to add your pipeline to the ITEM_PIPELINES setting
 # See: https://docs.scrapy.org/en/latest/topics/item-pipeline.html
 
+import os
+import pathlib
+from array import array
 
 # useful for handling different item types with a single interface
 from itemadapter import ItemAdapter
+from scrapy import signals
+from scrapy.exceptions import DropItem
+from scrapy.utils.project import data_path
+
+from nebi_spiders.offers import offer_fingerprints
 
 
 class NebiSpidersPipeline:
     def process_item(self, item, spider):
         return item
+
+
+# Identitäts-Fingerprints aller Spider dieses Prozesses → erster Spider.
+# Mit python -m nebi_spiders.run laufen alle Spider in einem Prozess,
+# so fallen auch Überschneidungen zwischen Spidern auf.
+_seen_this_run = {}
+
+
+class FingerprintIndex:
+    """Angebots-Fingerprints eines Spiders, zwischen Läufen als uint64-Array gespeichert."""
+
+    def __init__(self, path):
+        self.path = pathlib.Path(path)
+        self.previous = self._load()
+        self.current = set()
+
+    def _load(self):
+        fingerprints = array("Q")
+        try:
+            fingerprints.frombytes(self.path.read_bytes())
+        except (FileNotFoundError, ValueError):
+            pass
+        return set(fingerprints)
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        tmp_path.write_bytes(array("Q", sorted(self.current)).tobytes())
+        os.replace(tmp_path, self.path)
+
+
+class DedupePipeline:
+    """
+    Entfernt doppelte Angebote (gleicher Anbieter, Stadt, Abfallart, Größe)
+    innerhalb eines Laufs - auch zwischen Spidern - und vergleicht mit dem
+    letzten erfolgreichen Lauf.
+
+    DEDUPE_MODE = "drop" verwirft Duplikate, "flag" markiert sie mit
+    item["duplicate_of"] = <Spider mit dem ersten Treffer>.
+
+    Stats: dedupe/duplicate, dedupe/duplicate/cross_spider,
+    dedupe/unchanged, dedupe/new_or_changed, dedupe/vanished
+    """
+
+    def __init__(self, crawler):
+        self.crawler = crawler
+        self.stats = crawler.stats
+        self.mode = crawler.settings.get("DEDUPE_MODE", "drop")
+        self.index_dir = data_path(crawler.settings.get("DEDUPE_DIR", "dedupe"), createdir=True)
+        self.index = None
+        self.own = set()
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        pipeline = cls(crawler)
+        crawler.signals.connect(pipeline.spider_closed, signal=signals.spider_closed)
+        return pipeline
+
+    def open_spider(self, spider):
+        self.index = FingerprintIndex(pathlib.Path(self.index_dir) / f"{spider.name}.fp")
+
+    def process_item(self, item, spider):
+        adapter = ItemAdapter(item)
+        identity, offer = offer_fingerprints(adapter)
+
+        first = _seen_this_run.setdefault(identity, spider.name)
+        if identity in self.own or first != spider.name:
+            self.stats.inc_value("dedupe/duplicate")
+            if first != spider.name:
+                self.stats.inc_value("dedupe/duplicate/cross_spider")
+            if self.mode == "flag":
+                adapter["duplicate_of"] = first
+                return item
+            raise DropItem(f"Duplikat: {adapter.get('title')} ({first})")
+        self.own.add(identity)
+
+        self.index.current.add(offer)
+        if offer in self.index.previous:
+            self.stats.inc_value("dedupe/unchanged")
+        else:
+            self.stats.inc_value("dedupe/new_or_changed")
+        return item
+
+    def spider_closed(self, spider, reason):
+        # Nur vollständige Läufe werden Vergleichsbasis für den nächsten Lauf
+        if self.index is None or reason != "finished":
+            return
+        if self.index.previous:
+            self.stats.set_value("dedupe/vanished", len(self.index.previous - self.index.current))
+        self.index.save()
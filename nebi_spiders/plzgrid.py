@@ -0,0 +1,134 @@
+"""
+PLZ-Raster für Shops mit postleitzahlabhängigen Preisen
+(redooo, redooo-hannover, buhck-umweltservices).
+
+Ein Spider-Lauf lieferte bisher Preise für genau eine PLZ. PlzGrid
+wiederholt den Browser-Ablauf für weitere Postleitzahlen, in bis zu
+PLZ_GRID_SESSIONS parallelen Browsern, und behält nur Preise, die sich
+von der Haupt-PLZ unterscheiden.
+
+Damit die Abdeckung nicht linear mit der Zahl der PLZ teurer wird, prüft
+jede weitere PLZ zuerst nur PLZ_GRID_PROBE_CELLS Zellen (z.B. die erste
+Abfallart). Stimmen dort alle Preise mit der Haupt-PLZ überein, gilt die
+PLZ als preisgleich und wird nicht weiter gerendert.
+
+Der Spider stellt bereit:
+
+    plz                    Haupt-PLZ (Items ohne "plz"-Feld)
+    plz_grid               weitere PLZ im Stadtgebiet (Setting PLZ_GRID überschreibt:
+                           -s PLZ_GRID='{"redooo": ["50667", "50823"]}')
+    enter_plz()            PLZ-abhängiger Schritt mit self.driver/self.plz,
+                           True bei Erfolg (optional)
+    plz_cells()            Zellen, z.B. Abfallarten
+    scrape_cell(cell)      Produkte einer Zelle (Liste von Dicts)
+
+Jede weitere PLZ läuft auf einer flachen Kopie des Spiders mit eigenem
+Driver und eigener plz - die Spider-Methoden bleiben unverändert.
+Abweichende Items bekommen item["plz"].
+"""
+
+import copy
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from nebi_spiders.browser import create_driver
+from nebi_spiders.offers import normalize_text, parse_price
+
+logger = logging.getLogger(__name__)
+
+
+def _price_key(item):
+    return (normalize_text(item.get("type")), normalize_text(item.get("size")))
+
+
+def _prices(items):
+    return {_price_key(item): parse_price(item.get("price")) for item in items}
+
+
+class PlzGrid:
+
+    def __init__(self, spider, postcodes, sessions=2, probe_cells=1):
+        self.spider = spider
+        self.postcodes = [plz for plz in dict.fromkeys(postcodes) if plz != spider.plz]
+        self.sessions = max(1, sessions)
+        self.probe_cells = probe_cells
+        self.baseline = {}
+
+    @classmethod
+    def from_spider(cls, spider):
+        settings = spider.crawler.settings
+        postcodes = settings.getdict("PLZ_GRID").get(spider.name, getattr(spider, "plz_grid", ()))
+        if not settings.getbool("PLZ_GRID_ENABLED", True):
+            postcodes = ()
+        return cls(
+            spider,
+            postcodes,
+            sessions=settings.getint("PLZ_GRID_SESSIONS", 2),
+            probe_cells=settings.getint("PLZ_GRID_PROBE_CELLS", 1),
+        )
+
+    def run(self):
+        """Alle Items: erst Haupt-PLZ (im Spider selbst), dann abweichende Preise weiterer PLZ."""
+        spider = self.spider
+        stats = spider.crawler.stats
+
+        if getattr(spider, "enter_plz", None) and not spider.enter_plz():
+            logger.warning(f"❌ PLZ {spider.plz}: Session setup fehlgeschlagen", extra={"spider": spider})
+            return
+        for cell in spider.plz_cells():
+            items = spider.scrape_cell(cell)
+            self.baseline.update(_prices(items))
+            yield from items
+
+        if not self.postcodes:
+            return
+        stats.set_value("plzgrid/postcodes", len(self.postcodes) + 1)
+
+        with ThreadPoolExecutor(max_workers=min(self.sessions, len(self.postcodes))) as executor:
+            futures = {executor.submit(self._scrape_postcode, plz): plz for plz in self.postcodes}
+            for future in as_completed(futures):
+                plz = futures[future]
+                try:
+                    items, invariant, cells = future.result()
+                except Exception as e:
+                    logger.warning(f"⚠️ PLZ {plz} fehlgeschlagen: {e}", extra={"spider": spider})
+                    stats.inc_value("plzgrid/failed")
+                    continue
+
+                stats.inc_value("plzgrid/cells", cells)
+                if invariant:
+                    stats.inc_value("plzgrid/invariant")
+                    logger.info(f"📮 PLZ {plz}: Preise wie {spider.plz}", extra={"spider": spider})
+                    continue
+
+                stats.inc_value("plzgrid/varying")
+                stats.inc_value("plzgrid/items", len(items))
+                logger.info(f"📮 PLZ {plz}: {len(items)} abweichende Preise", extra={"spider": spider})
+                yield from items
+
+    def _scrape_postcode(self, plz):
+        """Läuft im Worker-Thread: (abweichende Items, preisgleich?, gerenderte Zellen)."""
+        session = copy.copy(self.spider)
+        session.plz = plz
+        enter_plz = getattr(session, "enter_plz", None)
+        session.driver = create_driver(setup=enter_plz)
+        try:
+            if enter_plz is not None and not enter_plz():
+                raise RuntimeError("Session setup fehlgeschlagen")
+
+            varying, compared = [], 0
+            cells = list(session.plz_cells())
+            for number, cell in enumerate(cells, start=1):
+                for item in session.scrape_cell(cell):
+                    compared += 1
+                    if self.baseline.get(_price_key(item)) != parse_price(item.get("price")):
+                        varying.append({**item, "plz": plz})
+                if self.probe_cells and number >= self.probe_cells and compared and not varying:
+                    # Stichprobe ohne Abweichung → PLZ gilt als preisgleich
+                    return [], True, number
+            return varying, False, len(cells)
+        finally:
+            try:
+                session.driver.quit()
+            except Exception:
+                pass
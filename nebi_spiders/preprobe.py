@@ -0,0 +1,174 @@
+"""
+Vorab-Probe für den Multi-Spider-Runner: unveränderte Quellen überspringen.
+
+Vor dem eigentlichen Lauf lädt ein einziger HTTP-Spider (ChangeProbeSpider)
+pro Quelle eine oder wenige leichte Seiten und bildet daraus einen
+Fingerprint:
+
+- HTML: preisrelevante Texte (wie nebi_spiders.tariff.page_fingerprint),
+  JSON-LD/Microdata-Angebote und eingebettete Preis-JSON-Schnipsel
+- PDF: ETag/Last-Modified/Content-Length per HEAD-Request
+
+Stimmt der Fingerprint mit dem Stand nach dem letzten erfolgreichen Lauf
+überein und liegt der Feed data/<spider>-products.jsonl noch vor, startet
+der Runner den Spider (und damit Chrome) nicht, der letzte Feed bleibt
+stehen. Nach PREPROBE_MAX_AGE läuft jeder Spider trotzdem einmal voll.
+
+Überspringen ist opt-in - nur Quellen, deren Probe-URL die Preise selbst
+trägt, werden geprüft:
+    change_probe = [...]             # explizit: Preisliste, PDF, Preis-JSON
+    tariff (probe.url)               # TariffSpider
+Startseiten, Sitemaps und Kategorieseiten ändern sich nicht mit den
+Preisen (Preise hinter PLZ-Eingabe, Konfigurator oder PDF) und sind daher
+keine Probe; Spider ohne change_probe laufen immer.
+
+Fingerprints liegen unter .scrapy/preprobe/fingerprints.json und werden
+nur nach einem Lauf mit finish_reason "finished" und Items aktualisiert.
+Ist eine Probe-URL nicht erreichbar, läuft der Spider normal.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import pathlib
+import re
+import time
+from urllib.parse import urlsplit
+
+from scrapy import Request, Spider
+from scrapy.utils.project import data_path
+
+from nebi_spiders.structured import offer_candidates
+from nebi_spiders.tariff import load_tariff, page_fingerprint
+
+logger = logging.getLogger(__name__)
+
+# "price": 123.45 / "preis":"123,45" in eingebetteten Scripts (Shop-JSON)
+_EMBEDDED_PRICE_RE = re.compile(r'"(?:[\w-]*price|[\w-]*preis)[\w-]*"\s*:\s*"?\d[\d.,]*', re.IGNORECASE)
+# Bei Binärdateien reichen die Header, der Body wird nicht geladen
+_HEAD_SUFFIXES = (".pdf",)
+_HEAD_HEADERS = (b"ETag", b"Last-Modified", b"Content-Length")
+
+
+def probe_urls(spidercls):
+    """Probe-URLs eines Spiders (leer = nicht überspringbar)."""
+    explicit = getattr(spidercls, "change_probe", None)
+    if explicit:
+        return list(explicit)
+
+    tariff = getattr(spidercls, "tariff", None)
+    if tariff:
+        url = (load_tariff(tariff).get("probe") or {}).get("url")
+        return [url] if url else []
+
+    return []
+
+
+def response_fingerprint(response):
+    """Fingerprint einer Probe-Antwort (None = nicht vergleichbar)."""
+    if response.request.method == "HEAD":
+        headers = [response.headers.get(name) for name in _HEAD_HEADERS]
+        if not any(headers[:2]):
+            return None
+        data = b"\n".join(value or b"" for value in headers)
+        return hashlib.blake2b(data, digest_size=8).hexdigest()
+
+    if b"html" not in response.headers.get("Content-Type", b"").lower():
+        return page_fingerprint(response)
+
+    offers = sorted(
+        f"{offer['name']}|{offer['size']}|{offer['price']}|{offer['available']}"
+        for offer in offer_candidates(response)
+    )
+    embedded = sorted(
+        match.group(0)
+        for script in response.xpath("//script/text()").getall()
+        for match in _EMBEDDED_PRICE_RE.finditer(script)
+    )
+    data = "\n".join([page_fingerprint(response), *offers, *embedded]).encode("utf-8")
+    return hashlib.blake2b(data, digest_size=8).hexdigest()
+
+
+class FingerprintStore:
+    """{spider: {"fingerprint", "updated"}} als JSON-Datei."""
+
+    def __init__(self, path):
+        self.path = pathlib.Path(path)
+        try:
+            self.entries = json.loads(self.path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            self.entries = {}
+
+    @classmethod
+    def from_settings(cls, settings):
+        directory = pathlib.Path(data_path(settings.get("PREPROBE_DIR", "preprobe"), createdir=True))
+        return cls(directory / "fingerprints.json")
+
+    def unchanged(self, name, fingerprint, max_age):
+        entry = self.entries.get(name)
+        if fingerprint is None or entry is None or entry.get("fingerprint") != fingerprint:
+            return False
+        return not max_age or time.time() - entry.get("updated", 0) < max_age
+
+    def update(self, name, fingerprint):
+        self.entries[name] = {"fingerprint": fingerprint, "updated": int(time.time())}
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        tmp_path.write_text(json.dumps(self.entries, indent=1, sort_keys=True), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+
+
+class ChangeProbeSpider(Spider):
+    """
+    Lädt die Probe-URLs aller Quellen (targets = {spider: [urls]}) und
+    legt die Fingerprints in self.fingerprints ab ({spider: str | None}).
+    """
+
+    name = "change-probe"
+
+    custom_settings = {
+        'ITEM_PIPELINES': {},
+        'RETRY_TIMES': 1,
+        'DOWNLOAD_TIMEOUT': 30,
+        'CONCURRENT_REQUESTS_PER_DOMAIN': 2,
+    }
+
+    def __init__(self, targets=None, **kwargs):
+        super().__init__(**kwargs)
+        self.targets = targets or {}
+        self.parts = {name: {} for name in self.targets}
+        self.fingerprints = {}
+
+    async def start(self):
+        for name, urls in self.targets.items():
+            for url in urls:
+                method = "HEAD" if urlsplit(url).path.lower().endswith(_HEAD_SUFFIXES) else "GET"
+                yield Request(
+                    url,
+                    method=method,
+                    callback=self.parse_probe,
+                    errback=self.probe_failed,
+                    cb_kwargs={"source": name, "url": url},
+                    dont_filter=True,
+                )
+
+    def parse_probe(self, response, source, url):
+        self.parts[source][url] = response_fingerprint(response)
+
+    def probe_failed(self, failure):
+        source, url = failure.request.cb_kwargs["source"], failure.request.cb_kwargs["url"]
+        self.parts[source][url] = None
+        self.logger.info(f"⚠️ Probe für {source} fehlgeschlagen: {failure.value}")
+
+    def closed(self, reason):
+        for name, urls in self.targets.items():
+            parts = self.parts[name]
+            if reason != "finished" or len(parts) < len(urls) or None in parts.values():
+                self.fingerprints[name] = None
+                continue
+            data = "\n".join(f"{url} {parts[url]}" for url in sorted(parts)).encode("utf-8")
+            self.fingerprints[name] = hashlib.blake2b(data, digest_size=8).hexdigest()
+
@@ -0,0 +1,153 @@
+"""
+Preiskurven pro Anbieter, Stadt und Abfallart.
+
+Die Shops bieten unterschiedliche Größen an (abc-container 3/5/7/8/10 m³,
+eggers 1-30 m³, silo-zentrale 3-30 m³ ...). Eine Preiskurve erlaubt ein
+Angebot für jede beliebige Größe:
+
+- innerhalb der angebotenen Größen: stückweise linear zwischen den Stützstellen
+- außerhalb: Steigung der Ausgleichsgeraden (Grundpreis + Preis pro m³),
+  angesetzt an der nächsten Stützstelle
+
+Pro Kurve werden nur zwei kleine float-Arrays (Größen, Preise in Cent) und
+zwei Zahlen (Grundpreis, Preis pro m³) gespeichert.
+
+Export (aus dem Projekt-Root):
+    python -m nebi_spiders.pricecurve --output data/price_curves.json
+"""
+
+import argparse
+import json
+import pathlib
+import sys
+from array import array
+from bisect import bisect_left
+from collections import defaultdict
+
+from nebi_spiders.offers import normalize_text, parse_price, parse_size
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parent.parent
+
+EXACT = "exact"
+INTERPOLATED = "interpolated"
+EXTRAPOLATED = "extrapolated"
+
+
+class PriceCurve:
+    """Stückweise lineare Preiskurve mit linearer Fortsetzung an den Rändern."""
+
+    __slots__ = ("source", "city", "type", "sizes", "prices", "base", "per_m3")
+
+    def __init__(self, source, city, waste_type, sizes, prices, base, per_m3):
+        self.source = source
+        self.city = city
+        self.type = waste_type
+        self.sizes = sizes
+        self.prices = prices
+        self.base = base
+        self.per_m3 = per_m3
+
+    def quote(self, size):
+        """Preis in Cent für eine Größe in m³ und wie er zustande kommt."""
+        sizes, prices = self.sizes, self.prices
+        i = bisect_left(sizes, size)
+
+        if i < len(sizes) and sizes[i] == size:
+            return prices[i], EXACT
+        if 0 < i < len(sizes):
+            left, right = i - 1, i
+            share = (size - sizes[left]) / (sizes[right] - sizes[left])
+            return prices[left] + share * (prices[right] - prices[left]), INTERPOLATED
+
+        anchor = 0 if i == 0 else len(sizes) - 1
+        price = prices[anchor] + self.per_m3 * (size - sizes[anchor])
+        return max(price, 0.0), EXTRAPOLATED
+
+    def to_dict(self):
+        return {
+            "source": self.source,
+            "city": self.city,
+            "type": self.type,
+            "sizes": list(self.sizes),
+            "prices": [price / 100 for price in self.prices],
+            "base": self.base / 100,
+            "per_m3": self.per_m3 / 100,
+        }
+
+
+def _fit(sizes, prices):
+    """Ausgleichsgerade price = base + per_m3 * size (kleinste Quadrate)."""
+    n = len(sizes)
+    if n == 1:
+        # Eine Größe: Preis pro m³ aus dieser einen Stützstelle
+        return 0.0, prices[0] / sizes[0] if sizes[0] else 0.0
+    mean_size = sum(sizes) / n
+    mean_price = sum(prices) / n
+    var = sum((size - mean_size) ** 2 for size in sizes)
+    cov = sum((size - mean_size) * (price - mean_price) for size, price in zip(sizes, prices))
+    per_m3 = cov / var if var else 0.0
+    return mean_price - per_m3 * mean_size, per_m3
+
+
+def build_curves(offers):
+    """
+    Baut in einem Durchlauf über die Angebote alle Kurven.
+
+    Gibt {(anbieter, stadt, art): PriceCurve} mit normalisierten Schlüsseln
+    zurück. Mehrere Angebote gleicher Größe (z.B. Absetz- und
+    Abrollcontainer) → günstigster Preis. Abweichende Preise weiterer
+    PLZ (nebi_spiders.plzgrid, Feld "plz") fließen nicht ein - die Kurve
+    beschreibt die Haupt-PLZ des Anbieters.
+    """
+    cheapest = defaultdict(dict)
+    labels = {}
+    for offer in offers:
+        if offer.get("plz"):
+            continue
+        size = parse_size(offer.get("size"))
+        price = parse_price(offer.get("price"))
+        if not size or price is None:
+            continue
+        key = (
+            normalize_text(offer.get("source")),
+            normalize_text(offer.get("city")),
+            normalize_text(offer.get("type")),
+        )
+        labels.setdefault(key, (offer.get("source"), offer.get("city"), offer.get("type")))
+        points = cheapest[key]
+        if size not in points or price < points[size]:
+            points[size] = price
+
+    curves = {}
+    for key, points in cheapest.items():
+        sizes = array("d", sorted(points))
+        prices = array("d", (points[size] for size in sizes))
+        base, per_m3 = _fit(sizes, prices)
+        curves[key] = PriceCurve(*labels[key], sizes, prices, base, per_m3)
+    return curves
+
+
+def main(argv=None):
+    from nebi_spiders.feeds import latest_feeds, read_feed
+
+    parser = argparse.ArgumentParser(description="Preiskurven aus den Feeds berechnen")
+    parser.add_argument("--data-dir", default=str(PROJECT_ROOT / "data"))
+    parser.add_argument("--output", help="JSON-Datei (Standard: stdout)")
+    args = parser.parse_args(argv)
+
+    offers = []
+    for path in latest_feeds(args.data_dir).values():
+        offers.extend(read_feed(path))
+
+    curves = build_curves(offers)
+    payload = json.dumps([curve.to_dict() for curve in curves.values()], ensure_ascii=False)
+    if args.output:
+        pathlib.Path(args.output).write_text(payload, encoding="utf-8")
+        print(f"✅ {len(curves)} Preiskurven → {args.output}")
+    else:
+        print(payload)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,168 @@
+"""
+Gesamtkosten einer Container-Miete, vergleichbar über alle Angebote.
+
+Die Shops liefern Preis und Zusatzkosten als gemischte Strings
+("inklusive", "5,95€", "Abhängig v. d. Zone 4€,6€,10€,12€", "", None).
+OfferTable wandelt sie einmal in Zahlen-Spalten (Cent, float-Arrays) um;
+total_cost() rechnet danach für ein Szenario alle Angebote in einem
+Durchlauf über die Spalten durch.
+
+Gesamtkosten = Preis + Anfahrt + Abholung
+             + Deckel/Plane (falls gewünscht)
+             + Tage über der Mietdauer × Gebühr pro Tag
+
+Storno-Szenario (cancelled): Kosten = Stornogebühr bzw. Gebühr für eine
+vergebliche Anfahrt.
+
+Zusatzkosten als Bereich (nach Zone oder Größe gestaffelt, z.B.
+"Abhängig v. d. Zone 4€,6€,10€,12€") gehen mit dem Minimum bzw. Maximum
+ein, je nach Scenario.zone - die Zuordnung eines Werts zur konkreten
+Zone/Größe geben die Shop-Texte nicht her.
+
+Unbekannte Werte zählen als 0, das Angebot wird aber als unvollständig
+markiert und beim Ranking hinter vollständige Angebote gestellt.
+"""
+
+from array import array
+
+from nebi_spiders.offers import UNAVAILABLE, UNKNOWN, parse_amount_range, parse_days, parse_price
+
+NAN = float("nan")
+
+
+def _is_nan(value):
+    return value != value
+
+
+class Scenario:
+    """
+    days: geplante Mietdauer in Tagen
+    lid:  Deckel/Plane gewünscht (Angebote ohne Deckel fallen raus)
+    zone: "min" oder "max" - welcher Wert bei Zonen-/Größen-Staffeln gilt
+    cancelled: Auftrag storniert bzw. Anfahrt vergeblich
+    """
+
+    __slots__ = ("days", "lid", "zone", "cancelled")
+
+    def __init__(self, days=14, lid=False, zone="max", cancelled=False):
+        if zone not in ("min", "max"):
+            raise ValueError(f"zone muss 'min' oder 'max' sein, nicht {zone!r}")
+        self.days = days
+        self.lid = lid
+        self.zone = zone
+        self.cancelled = cancelled
+
+    def key(self):
+        return (self.days, self.lid, self.zone, self.cancelled)
+
+
+class OfferTable:
+    """Zahlen-Spalten (Cent bzw. Tage) aller Angebote, Reihenfolge wie offers."""
+
+    # Spalten mit (min, max)-Bereich
+    RANGE_FIELDS = {
+        "arrival": "arrival_price",
+        "departure": "departure_price",
+        "lid": "lid_price",
+        "fee_after_max": "fee_after_max",
+        "cancellation": "cancellation_fee",
+    }
+
+    def __init__(self, offers):
+        self.offers = offers
+        self.price = array("d")
+        self.max_days = array("d")
+        # lid_available: 1 = ja/unbekannt, 0 = "nicht verfügbar"
+        self.lid_available = bytearray()
+        for column in self.RANGE_FIELDS:
+            setattr(self, f"{column}_min", array("d"))
+            setattr(self, f"{column}_max", array("d"))
+
+        for offer in offers:
+            price = parse_price(offer.get("price"))
+            self.price.append(NAN if price is None else price)
+
+            days = parse_days(offer.get("max_rental_period"))
+            self.max_days.append(NAN if days is None else days)
+
+            for column, field in self.RANGE_FIELDS.items():
+                value = parse_amount_range(offer.get(field))
+                if value in (UNKNOWN, UNAVAILABLE):
+                    low = high = NAN
+                else:
+                    low, high = value
+                getattr(self, f"{column}_min").append(low)
+                getattr(self, f"{column}_max").append(high)
+                if column == "lid":
+                    self.lid_available.append(value != UNAVAILABLE)
+
+    def __len__(self):
+        return len(self.offers)
+
+
+def total_cost(table, scenario):
+    """
+    Gesamtkosten aller Angebote (Cent) für ein Szenario.
+
+    Gibt (totals, complete) zurück: float-Array der Kosten (NaN, wenn das
+    Angebot das Szenario nicht erfüllt, z.B. kein Deckel verfügbar) und
+    bytearray, 1 = alle benötigten Werte bekannt.
+    """
+    def column(name):
+        return getattr(table, f"{name}_{scenario.zone}")
+
+    days = scenario.days
+
+    totals = array("d", bytes(8 * len(table)))
+    complete = bytearray(len(table))
+
+    if scenario.cancelled:
+        for i, (price, fee) in enumerate(zip(table.price, column("cancellation"))):
+            if _is_nan(price):
+                totals[i] = NAN
+            else:
+                totals[i] = 0.0 if _is_nan(fee) else fee
+                complete[i] = not _is_nan(fee)
+        return totals, complete
+
+    for i, (price, arr, dep, lid, lid_ok, max_days, fee) in enumerate(zip(
+        table.price, column("arrival"), column("departure"), column("lid"), table.lid_available,
+        table.max_days, column("fee_after_max"),
+    )):
+        if _is_nan(price) or (scenario.lid and not lid_ok):
+            totals[i] = NAN
+            continue
+
+        ok = True
+        total = price
+        for extra in (arr, dep):
+            if _is_nan(extra):
+                ok = False
+            else:
+                total += extra
+        if scenario.lid:
+            if _is_nan(lid):
+                ok = False
+            else:
+                total += lid
+
+        if _is_nan(max_days):
+            ok = False
+        elif days > max_days:
+            if _is_nan(fee):
+                ok = False
+            else:
+                total += (days - max_days) * fee
+
+        totals[i] = total
+        complete[i] = ok
+    return totals, complete
+
+
+def rank(totals, complete, rows=None):
+    """Zeilennummern nach Gesamtkosten, vollständige Angebote zuerst, ohne NaN."""
+    rows = range(len(totals)) if rows is None else rows
+    return sorted(
+        (row for row in rows if not _is_nan(totals[row])),
+        key=lambda row: (not complete[row], totals[row]),
+    )
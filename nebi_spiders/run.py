@@ -0,0 +1,351 @@
+"""
+Multi-Spider Runner
+Startet viele Spider in EINEM Prozess (ein CrawlerProcess, ein Reactor).
+
+Python-Start, Imports und der SPIDER_MODULES-Scan fallen nur einmal
+pro Lauf an statt einmal pro `scrapy crawl`.
+
+Aufruf (aus dem Projekt-Root):
+    python -m nebi_spiders.run                   # alle Spider
+    python -m nebi_spiders.run hamburg           # alle Spider einer Stadt
+    python -m nebi_spiders.run noris24,berlin    # gemischt, komma-getrennt
+
+Ausgabe: data/<spider>-products.jsonl (JSON Lines, mit --zstd als .jsonl.zst)
+und logs/<spider>.txt. Die Datei wird erst am Ende eines erfolgreichen
+Laufs ersetzt (nebi_spiders.feeds.AtomicFileFeedStorage).
+
+Vorher prüft eine Vorab-Probe (nebi_spiders.preprobe) jede Quelle mit
+einem leichten HTTP-Request. Unveränderte Quellen mit vorhandenem Feed
+werden übersprungen, ihr letzter Feed bleibt stehen (--no-probe: alle laufen).
+
+Mit --plan data/schedule/plan.json laufen nur die laut Laufplan
+(nebi_spiders.schedule) fälligen Spider. Jeder Lauf ergänzt die
+Historie data/schedule/history.jsonl, aus der der Plan entsteht.
+"""
+
+import argparse
+import logging
+import pathlib
+import sys
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+from scrapy import signals
+from scrapy.crawler import CrawlerProcess
+from scrapy.utils.project import get_project_settings
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parent.parent
+
+logger = logging.getLogger(__name__)
+
+
+class _SpiderLogFilter(logging.Filter):
+    """Lässt nur Log-Einträge eines bestimmten Spiders durch."""
+
+    def __init__(self, spider_name):
+        super().__init__()
+        self.spider_name = spider_name
+
+    def filter(self, record):
+        spider = getattr(record, "spider", None)
+        if spider is not None:
+            return getattr(spider, "name", None) == self.spider_name
+        return record.name == self.spider_name
+
+
+def spider_city(spidercls):
+    """Stadt-Ordner eines Spiders, z.B. nebi_spiders.spiders.hamburg.x → hamburg."""
+    parts = spidercls.__module__.split(".")
+    return parts[2] if len(parts) > 3 else ""
+
+
+def spider_domain(spidercls):
+    """Domain-Schlüssel für Spider, die sich denselben Shop teilen."""
+    domains = getattr(spidercls, "allowed_domains", None) or []
+    if not domains:
+        return spidercls.name
+    return domains[0].lower().removeprefix("www.")
+
+
+def resolve_spiders(spider_loader, targets):
+    """
+    Löst Eingaben wie im Workflow auf: "all", Stadt-Namen oder Spider-Namen,
+    beliebig komma-getrennt gemischt.
+    """
+    available = spider_loader.list()
+    by_city = OrderedDict()
+    for name in sorted(available):
+        by_city.setdefault(spider_city(spider_loader.load(name)), []).append(name)
+
+    items = [item.strip() for target in targets for item in target.split(",")]
+    items = [item for item in items if item]
+
+    if not items or any(item.lower() == "all" for item in items):
+        return sorted(available)
+
+    selected = []
+    for item in items:
+        if item.lower() in by_city:
+            names = by_city[item.lower()]
+        elif item in available:
+            names = [item]
+        else:
+            raise ValueError(f"Unbekannter Spider oder Stadt: {item}")
+        selected.extend(name for name in names if name not in selected)
+    return selected
+
+
+def build_lanes(spider_loader, names, parallel):
+    """
+    Verteilt Spider auf parallele Bahnen. Spider derselben Domain landen in
+    derselben Bahn und laufen nacheinander (gemeinsamer Download-Slot pro Shop).
+    """
+    groups = OrderedDict()
+    for name in names:
+        groups.setdefault(spider_domain(spider_loader.load(name)), []).append(name)
+
+    lanes = [[] for _ in range(max(1, min(parallel, len(groups))))]
+    for group in sorted(groups.values(), key=len, reverse=True):
+        min(lanes, key=len).extend(group)
+    return [lane for lane in lanes if lane]
+
+
+class MultiSpiderRunner:
+    """Plant Spider-Bahnen in einen gemeinsamen CrawlerProcess ein."""
+
+    def __init__(self, settings, data_dir, log_dir, parallel, budget, zstd=False, probe=False):
+        self.process = CrawlerProcess(settings)
+        self.data_dir = pathlib.Path(data_dir)
+        self.log_dir = pathlib.Path(log_dir)
+        self.parallel = parallel
+        self.budget = budget
+        self.zstd = zstd
+        self.probe = probe
+        self.results = OrderedDict()
+        self.skipped = []
+        self.fingerprints = {}
+        self.store = None
+        self.history = []
+
+    def feed_uri(self, name):
+        suffix = ".jsonl.zst" if self.zstd else ".jsonl"
+        return str(self.data_dir / f"{name}-products{suffix}")
+
+    def feed_options(self):
+        options = {"format": "jsonlines", "overwrite": True}
+        if self.zstd:
+            options["postprocessing"] = ["nebi_spiders.feeds.ZstdPlugin"]
+        return options
+
+    def create_crawler(self, name, concurrency):
+        crawler = self.process.create_crawler(name)
+
+        # Entspricht `scrapy crawl <spider> -O data/<spider>-products.jsonl`
+        crawler.settings.set(
+            "FEEDS",
+            {self.feed_uri(name): self.feed_options()},
+            priority="cmdline",
+        )
+
+        # Globales Budget: keine Bahn bekommt mehr als ihren Anteil
+        own = crawler.settings.getint("CONCURRENT_REQUESTS")
+        crawler.settings.set("CONCURRENT_REQUESTS", min(own, concurrency), priority="cmdline")
+
+        crawler.signals.connect(self._spider_closed, signal=signals.spider_closed)
+        return crawler
+
+    def _spider_closed(self, spider, reason):
+        items = spider.crawler.stats.get_value("item_scraped_count", 0)
+        self.results[spider.name] = (reason, items)
+        self._record(spider.name, reason, items, self._changed_share(spider.crawler.stats), self._elapsed(spider.crawler.stats))
+        # Nur ein vollständiger Lauf macht den Probe-Fingerprint zur Vergleichsbasis
+        fingerprint = self.fingerprints.get(spider.name)
+        if self.store is not None and fingerprint is not None and reason == "finished" and items:
+            self.store.update(spider.name, fingerprint)
+
+    @staticmethod
+    def _changed_share(stats):
+        """Anteil neuer/geänderter/verschwundener Angebote (None ohne Vergleichsbasis)."""
+        vanished = stats.get_value("dedupe/vanished")
+        if vanished is None:
+            return None
+        changed = stats.get_value("dedupe/new_or_changed", 0) + vanished
+        total = changed + stats.get_value("dedupe/unchanged", 0)
+        return round(changed / total, 4) if total else 0.0
+
+    @staticmethod
+    def _elapsed(stats):
+        start = stats.get_value("start_time")
+        if start is None:
+            return None
+        if start.tzinfo is None:
+            start = start.replace(tzinfo=timezone.utc)
+        return round((datetime.now(timezone.utc) - start).total_seconds(), 1)
+
+    def _record(self, name, reason, items, changed, elapsed=None):
+        """Eintrag für die Lauf-Historie des Schedulers."""
+        self.history.append({
+            "spider": name,
+            "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "reason": reason,
+            "items": items,
+            "changed": changed,
+            "elapsed": elapsed,
+        })
+
+    def _run_probe(self, names):
+        """Vorab-Probe aller Quellen; liefert (Deferred) die Spider, die laufen müssen."""
+        from twisted.internet import defer
+
+        from nebi_spiders.feeds import read_products
+        from nebi_spiders.preprobe import ChangeProbeSpider, FingerprintStore, probe_urls
+
+        settings = self.process.settings
+        self.store = FingerprintStore.from_settings(settings)
+        loader = self.process.spider_loader
+        targets = {name: urls for name in names if (urls := probe_urls(loader.load(name)))}
+
+        @defer.inlineCallbacks
+        def run():
+            if not targets:
+                return names
+            crawler = self.process.create_crawler(ChangeProbeSpider)
+            yield self.process.crawl(crawler, targets=targets)
+            self.fingerprints = crawler.spider.fingerprints
+
+            pending = []
+            for name in names:
+                feed = pathlib.Path(self.feed_uri(name))
+                fingerprint = self.fingerprints.get(name)
+                if feed.exists() and self.store.unchanged(name, fingerprint, settings.getint("PREPROBE_MAX_AGE")):
+                    items = sum(1 for _ in read_products(feed))
+                    self.results[name] = ("unverändert", items)
+                    # Die Probe sieht nur ihre eigene URL - keine Aussage über die Änderungsrate
+                    self._record(name, "unverändert", items, None)
+                    self.skipped.append(name)
+                    logger.info(f"⏭️ {name}: unverändert, letzter Feed bleibt ({items} Produkte)")
+                else:
+                    pending.append(name)
+            logger.info(f"🔎 Vorab-Probe: {len(self.skipped)} von {len(names)} Spidern unverändert")
+            return pending
+
+        return run()
+
+    def _attach_log(self, name):
+        settings = self.process.settings
+        handler = logging.FileHandler(self.log_dir / f"{name}.txt", mode="w", encoding="utf-8")
+        handler.setFormatter(logging.Formatter(
+            settings.get("LOG_FORMAT"), settings.get("LOG_DATEFORMAT")
+        ))
+        handler.setLevel(settings.get("LOG_LEVEL"))
+        handler.addFilter(_SpiderLogFilter(name))
+        logging.getLogger().addHandler(handler)
+        return handler
+
+    def _run_lane(self, lane, concurrency):
+        from twisted.internet import defer
+
+        @defer.inlineCallbacks
+        def run():
+            for name in lane:
+                handler = self._attach_log(name)
+                logger.info(f"🕷️ Starte: {name}")
+                try:
+                    yield self.process.crawl(self.create_crawler(name, concurrency))
+                except Exception as e:
+                    logger.error(f"❌ {name} fehlgeschlagen: {e}")
+                    self.results.setdefault(name, ("error", 0))
+                finally:
+                    logging.getLogger().removeHandler(handler)
+                    handler.close()
+                logger.info(f"✅ Fertig: {name}")
+
+        return run()
+
+    def run(self, names):
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+
+        from twisted.internet import defer
+
+        @defer.inlineCallbacks
+        def run_all():
+            pending = names
+            if self.probe:
+                pending = yield self._run_probe(names)
+            if pending:
+                lanes = build_lanes(self.process.spider_loader, pending, self.parallel)
+                concurrency = max(1, self.budget // len(lanes))
+                logger.info(f"📋 {len(pending)} Spider in {len(lanes)} Bahnen, je {concurrency} parallele Requests")
+                yield defer.DeferredList([self._run_lane(lane, concurrency) for lane in lanes])
+            if self.store is not None:
+                self.store.save()
+            if self.history:
+                from nebi_spiders.schedule import HISTORY_FILE, append_history
+
+                append_history(self.data_dir / HISTORY_FILE, self.history)
+
+        # Erster Crawl (Probe bzw. jeder Bahn) startet sofort und installiert dabei den Reactor
+        done = run_all()
+        done.addBoth(self._stop)
+
+        if not done.called:
+            self.process.start(stop_after_crawl=False)
+        return self.results
+
+    def _stop(self, _):
+        from twisted.internet import reactor
+
+        if reactor.running:
+            reactor.stop()
+
+
+def main(argv=None):
+    settings = get_project_settings()
+
+    parser = argparse.ArgumentParser(description="Mehrere Spider in einem Prozess ausführen")
+    parser.add_argument("targets", nargs="*", default=["all"],
+                        help='"all", Stadt- oder Spider-Namen (auch komma-getrennt)')
+    parser.add_argument("--parallel", type=int, default=settings.getint("RUNNER_MAX_PARALLEL"),
+                        help="Anzahl gleichzeitig laufender Spider")
+    parser.add_argument("--budget", type=int, default=settings.getint("RUNNER_CONCURRENCY_BUDGET"),
+                        help="Globales Limit paralleler Requests über alle Spider")
+    parser.add_argument("--zstd", action="store_true", default=settings.getbool("RUNNER_FEED_ZSTD"),
+                        help="Feeds zstd-komprimiert schreiben (.jsonl.zst)")
+    parser.add_argument("--no-probe", dest="probe", action="store_false", default=settings.getbool("PREPROBE_ENABLED"),
+                        help="Vorab-Probe abschalten, alle Spider laufen")
+    parser.add_argument("--plan", default=None,
+                        help="Laufplan (nebi_spiders.schedule): nur fällige Spider ausführen")
+    parser.add_argument("--data-dir", default=str(PROJECT_ROOT / "data"))
+    parser.add_argument("--log-dir", default=str(PROJECT_ROOT / "logs"))
+    args = parser.parse_args(argv)
+
+    runner = MultiSpiderRunner(settings, args.data_dir, args.log_dir, args.parallel, args.budget, args.zstd, args.probe)
+
+    try:
+        names = resolve_spiders(runner.process.spider_loader, args.targets)
+    except ValueError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 2
+
+    if args.plan:
+        from nebi_spiders.schedule import due_spiders
+
+        due = due_spiders(args.plan, names)
+        logger.info(f"📅 Laufplan: {len(due)} von {len(names)} Spidern fällig")
+        names = due
+
+    results = runner.run(names)
+
+    print("=" * 80)
+    for name in names:
+        reason, items = results.get(name, ("nicht gestartet", 0))
+        print(f"  {name:40} {items:5} Produkte  ({reason})")
+    if runner.skipped:
+        print(f"⏭️ Übersprungen (unverändert, letzter Feed): {', '.join(runner.skipped)}")
+    print("=" * 80)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,286 @@
+"""
+Laufplan nach Preis-Volatilität pro Quelle.
+
+Statt jeden Spider jede Woche laufen zu lassen, schätzt der Scheduler aus
+der Lauf-Historie, wie oft sich die Preise einer Quelle ändern, und
+verteilt ein Rechenbudget auf Crawl-Intervalle (1 Tag ... 4 Wochen):
+volatile Shops öfter, statische (aser-container, kroll-container) selten.
+
+Historie:
+- data/archive/<JJJJ-MM>/ und die aktuellen Feeds in data/: Vergleich
+  der Angebots-Fingerprints (nebi_spiders.offers) aufeinanderfolgender Stände
+- data/schedule/history.jsonl: eine Zeile pro Spider und Lauf, geschrieben
+  von python -m nebi_spiders.run (Anteil geänderter Angebote laut
+  DedupePipeline, Laufzeit; Vorab-Probe "unverändert" ohne Änderungsanteil)
+
+Budget: SCHEDULE_BUDGET = Faktor auf die Rechenzeit eines vollständigen
+Wochenlaufs (1.0 = so viel wie bisher, nur anders verteilt).
+
+Aufruf (aus dem Projekt-Root, z.B. täglich vor dem Runner):
+    python -m nebi_spiders.schedule                 # schreibt data/schedule/plan.json
+    python -m nebi_spiders.run --plan data/schedule/plan.json
+"""
+
+import argparse
+import json
+import pathlib
+import sys
+from datetime import date, datetime, timezone
+
+from nebi_spiders.feeds import latest_feeds, read_feed
+from nebi_spiders.offers import offer_fingerprints
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parent.parent
+
+HISTORY_FILE = "schedule/history.jsonl"
+PLAN_FILE = "schedule/plan.json"
+
+# Angenommene Laufzeit (Sekunden) ohne gemessene Historie
+DEFAULT_COST_BROWSER = 300
+DEFAULT_COST_HTTP = 30
+
+
+def _parse_date(value):
+    return datetime.fromisoformat(value.replace("Z", "+00:00")).date()
+
+
+def _snapshot_date(directory):
+    """Stand eines Feed-Verzeichnisses: last_updated aus all_products.json, sonst Monatsanfang."""
+    try:
+        with (directory / "all_products.json").open(encoding="utf-8") as f:
+            head = f.read(256)
+        return _parse_date(head.split('"last_updated": "', 1)[1].split('"', 1)[0])
+    except (OSError, IndexError, ValueError):
+        pass
+    try:
+        return datetime.strptime(directory.name, "%Y-%m").date()
+    except ValueError:
+        return None
+
+
+def _offers(path):
+    return {offer for _, offer in (offer_fingerprints(item) for item in read_feed(path))}
+
+
+def load_snapshots(data_dir):
+    """{spider: [(datum, {angebots-fingerprint}), ...]} aus Archiv und aktuellen Feeds, nach Datum."""
+    data_dir = pathlib.Path(data_dir)
+    directories = sorted((data_dir / "archive").glob("[0-9][0-9][0-9][0-9]-[0-9][0-9]")) + [data_dir]
+
+    snapshots = {}
+    for directory in directories:
+        when = _snapshot_date(directory)
+        if when is None:
+            continue
+        for spider, path in latest_feeds(directory).items():
+            snapshots.setdefault(spider, []).append((when, _offers(path)))
+    for entries in snapshots.values():
+        entries.sort(key=lambda entry: entry[0])
+    return snapshots
+
+
+def load_history(path):
+    """Lauf-Historie: {spider: [Eintrag, ...]} nach Datum."""
+    history = {}
+    try:
+        lines = pathlib.Path(path).read_text(encoding="utf-8").splitlines()
+    except FileNotFoundError:
+        return history
+    for line in lines:
+        if line.strip():
+            record = json.loads(line)
+            history.setdefault(record["spider"], []).append(record)
+    for records in history.values():
+        records.sort(key=lambda record: record["date"])
+    return history
+
+
+def append_history(path, records):
+    path = pathlib.Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("a", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def _completed(record):
+    """Lauf mit Ergebnis: vollständig mit Items oder laut Vorab-Probe unverändert."""
+    return record.get("reason") == "unverändert" or (record.get("reason") == "finished" and record.get("items"))
+
+
+def observations(snapshots, records):
+    """
+    [(tage, geändert), ...] einer Quelle. Archiv-Stände zählen nur für
+    die Zeit vor dem ersten Eintrag der Lauf-Historie.
+    """
+    first_run = _parse_date(records[0]["date"]) if records else None
+    result = []
+    for (start, before), (end, after) in zip(snapshots, snapshots[1:]):
+        if first_run is not None and end > first_run:
+            break
+        if end > start:
+            result.append(((end - start).days, before != after))
+
+    previous = None
+    for record in records:
+        # Der Feed-Vergleich (DedupePipeline) bezieht sich auf den letzten
+        # echten Lauf - von der Vorab-Probe übersprungene Läufe sind keine
+        # Beobachtung (auch ältere Einträge mit changed 0), sonst zählen
+        # ihre Tage beim nächsten echten Lauf doppelt
+        if record.get("reason") == "unverändert":
+            continue
+        when = _parse_date(record["date"])
+        if previous is not None and when > previous and record.get("changed") is not None:
+            result.append(((when - previous).days, record["changed"] > 0))
+        if _completed(record):
+            previous = when
+    return result
+
+
+# Erwartete Änderungen pro Woche ohne Historie; Spider können mit
+# schedule_prior abweichen (TariffSpider: Preisliste liegt im Repo)
+DEFAULT_PRIOR = 0.5
+
+
+def change_rate(observed, prior=DEFAULT_PRIOR):
+    """
+    Geschätzte Preisänderungen pro Tag. Geglättet mit prior Änderungen auf
+    eine Woche, damit Quellen ohne Historie weder nie noch täglich laufen.
+    """
+    changes = sum(1 for _, changed in observed if changed)
+    days = sum(days for days, _ in observed)
+    return (changes + prior) / (days + 7)
+
+
+def assign_intervals(sources, budget, intervals):
+    """
+    Crawl-Intervall pro Quelle, gierig nach Nutzen pro Rechenzeit.
+
+    Alle Quellen starten beim längsten Intervall. Danach wird immer die
+    Quelle eine Stufe verkürzt, bei der die erwartete Zahl veralteter
+    Preis-Tage am stärksten pro zusätzlicher Sekunde Laufzeit je Woche
+    sinkt - solange das Budget (Sekunden pro Woche) reicht.
+    """
+    intervals = sorted(intervals, reverse=True)
+    step = {name: 0 for name in sources}
+    used = sum(source["cost"] * 7 / intervals[0] for source in sources.values())
+
+    while True:
+        best, best_ratio, best_extra = None, 0, 0
+        for name, source in sources.items():
+            if step[name] + 1 >= len(intervals):
+                continue
+            current, shorter = intervals[step[name]], intervals[step[name] + 1]
+            extra = source["cost"] * 7 * (1 / shorter - 1 / current)
+            if used + extra > budget:
+                continue
+            gain = source["rate"] * (current - shorter) / 2
+            ratio = gain / max(extra, 1e-9)
+            if ratio > best_ratio:
+                best, best_ratio, best_extra = name, ratio, extra
+        if best is None:
+            break
+        step[best] += 1
+        used += best_extra
+
+    return {name: intervals[step[name]] for name in sources}, used
+
+
+def default_cost(spidercls):
+    from nebi_spiders.browser import BROWSER_SPIDER_SETTINGS
+
+    if getattr(spidercls, "custom_settings", None) == BROWSER_SPIDER_SETTINGS:
+        return DEFAULT_COST_BROWSER
+    return DEFAULT_COST_HTTP
+
+
+def build_plan(spider_loader, settings, data_dir, today=None):
+    """Laufplan {generated, budget, spiders: {name: {...}}} für alle Spider."""
+    today = today or datetime.now(timezone.utc).date()
+    data_dir = pathlib.Path(data_dir)
+    snapshots = load_snapshots(data_dir)
+    history = load_history(data_dir / HISTORY_FILE)
+
+    sources = {}
+    for name in sorted(spider_loader.list()):
+        records = history.get(name, [])
+        observed = observations(snapshots.get(name, []), records)
+        elapsed = [record["elapsed"] for record in records if record.get("reason") == "finished" and record.get("elapsed")]
+        runs = [_parse_date(record["date"]) for record in records if _completed(record)]
+        spidercls = spider_loader.load(name)
+        sources[name] = {
+            "rate": change_rate(observed, getattr(spidercls, "schedule_prior", DEFAULT_PRIOR)),
+            "cost": sum(elapsed) / len(elapsed) if elapsed else default_cost(spidercls),
+            "observations": len(observed),
+            "last_run": max(runs) if runs else None,
+        }
+
+    full_week = sum(source["cost"] for source in sources.values())
+    budget = settings.getfloat("SCHEDULE_BUDGET") * full_week
+    intervals = [int(interval) for interval in settings.getlist("SCHEDULE_INTERVALS")]
+    assigned, used = assign_intervals(sources, budget, intervals)
+
+    spiders = {}
+    for name, source in sources.items():
+        interval = assigned[name]
+        last_run = source["last_run"]
+        due = last_run is None or (today - last_run).days >= interval
+        spiders[name] = {
+            "interval_days": interval,
+            "changes_per_week": round(source["rate"] * 7, 3),
+            "observations": source["observations"],
+            "cost_seconds": round(source["cost"]),
+            "last_run": last_run.isoformat() if last_run else None,
+            "due": due,
+        }
+
+    return {
+        "generated": today.isoformat(),
+        "budget_seconds_per_week": round(budget),
+        "planned_seconds_per_week": round(used),
+        "spiders": spiders,
+    }
+
+
+def due_spiders(plan_path, names):
+    """Spider aus names, die laut Laufplan heute fällig sind (unbekannte Spider immer)."""
+    plan = json.loads(pathlib.Path(plan_path).read_text(encoding="utf-8"))["spiders"]
+    return [name for name in names if plan.get(name, {}).get("due", True)]
+
+
+def main(argv=None):
+    from scrapy.spiderloader import SpiderLoader
+    from scrapy.utils.project import get_project_settings
+
+    settings = get_project_settings()
+
+    parser = argparse.ArgumentParser(description="Laufplan nach Preis-Volatilität erstellen")
+    parser.add_argument("--data-dir", default=str(PROJECT_ROOT / "data"))
+    parser.add_argument("--output", default=None, help="Standard: <data-dir>/schedule/plan.json")
+    parser.add_argument("--budget", type=float, default=None,
+                        help="Faktor auf die Rechenzeit eines vollständigen Wochenlaufs")
+    parser.add_argument("--date", type=date.fromisoformat, default=None, help="Stichtag (JJJJ-MM-TT)")
+    args = parser.parse_args(argv)
+
+    if args.budget is not None:
+        settings.set("SCHEDULE_BUDGET", args.budget, priority="cmdline")
+
+    plan = build_plan(SpiderLoader.from_settings(settings), settings, args.data_dir, args.date)
+    output = pathlib.Path(args.output) if args.output else pathlib.Path(args.data_dir) / PLAN_FILE
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(plan, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    print("=" * 80)
+    for name, entry in plan["spiders"].items():
+        marker = "▶️" if entry["due"] else "  "
+        print(f"{marker} {name:40} alle {entry['interval_days']:2} Tage  "
+              f"({entry['changes_per_week']:.2f} Änderungen/Woche, {entry['cost_seconds']} s)")
+    due = sum(1 for entry in plan["spiders"].values() if entry["due"])
+    print(f"📅 {due} von {len(plan['spiders'])} Spidern fällig, "
+          f"{plan['planned_seconds_per_week']} von {plan['budget_seconds_per_week']} s/Woche verplant → {output}")
+    print("=" * 80)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
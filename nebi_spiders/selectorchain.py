@@ -0,0 +1,179 @@
+"""
+Selektor-Ketten: geordnete Alternativen mit Treffer-Statistik.
+
+Preis- und Banner-Routinen probieren lange Listen von Selektoren durch
+(dare-shop _extract_price, otto-doerner _get_current_price, ravos
+_extract_price, containerfritze _dismiss_cookie_banner). Eine Kette merkt
+sich pro Spider, welche Alternative trifft, und stellt den Gewinner nach
+vorne - beim nächsten Aufruf und im nächsten Lauf kostet der Normalfall
+nur noch einen Selektor.
+
+    chain = selector_chain(self, "price", [".a", ".b", ".c"], fallbacks=["[class*='price']"])
+    price = chain.first(lambda css: self._price_from(css))        # Browser
+    price = chain.select(sel, parse)                                # Scrapy-Selector
+
+fallbacks sind allgemeine Auffang-Selektoren (erster €-Text, alles mit
+"price"): sie laufen immer zuletzt und in fester Reihenfolge, weil sie
+auch dann treffen, wenn eine spezifischere Alternative das richtige
+Ergebnis gehabt hätte.
+
+select() wertet vorkompilierte lxml-XPath-Ausdrücke aus (CSS wird einmal
+übersetzt) und merkt sich das Ergebnis pro Selector-Objekt - zusammen
+mit driver.selector() (nebi_spiders.browser) kostet eine Polling-Schleife
+ohne DOM-Änderung keine Auswertung mehr.
+
+Reihenfolge und Treffer liegen unter .scrapy/selectors/<spider>.json,
+Stats selector/<kette>/hit/<nr>, selector/<kette>/miss, selector/<kette>/cached.
+"""
+
+import json
+import logging
+import os
+import pathlib
+import weakref
+
+from scrapy import signals
+from scrapy.utils.project import data_path
+
+logger = logging.getLogger(__name__)
+
+
+class SelectorChain:
+    """Alternativen einer Kette; Gewinner wandern nach vorne (move-to-front)."""
+
+    def __init__(self, name, alternatives, fallbacks=(), css=False, stats=None, saved=None):
+        self.name = name
+        self.alternatives = list(alternatives)
+        self.fallbacks = list(fallbacks)
+        self.css = css
+        self.stats = stats
+        saved = saved or {}
+        self.hits = {alternative: 0 for alternative in self.alternatives + self.fallbacks}
+        # Gespeicherte Reihenfolge zuerst, neue Alternativen in Code-Reihenfolge dahinter
+        known = [alternative for alternative in saved.get("order", []) if alternative in self.alternatives]
+        self.order = known + [alternative for alternative in self.alternatives if alternative not in known]
+        self._compiled = None
+        self._memo = weakref.WeakKeyDictionary()
+
+    def _candidates(self):
+        return self.order + self.fallbacks
+
+    def first(self, extract):
+        """Erstes Ergebnis von extract(alternative), das nicht None/leer ist."""
+        for alternative in self._candidates():
+            try:
+                result = extract(alternative)
+            except Exception:
+                continue
+            if result:
+                self._hit(alternative)
+                return result
+        self._inc("miss")
+        return None
+
+    def select(self, selector, parse):
+        """
+        Wie first() auf einem Scrapy-Selector: parse(werte) bekommt die
+        Treffer einer Alternative als Liste von Strings.
+        """
+        if selector in self._memo:
+            self._inc("cached")
+            return self._memo[selector]
+
+        compiled = self._compile()
+        root = selector.root
+
+        def extract(alternative):
+            values = compiled[alternative](root)
+            if isinstance(values, str):
+                values = [values]
+            return parse([str(value) for value in values if isinstance(value, str)])
+
+        result = self.first(extract)
+        self._memo[selector] = result
+        return result
+
+    def _compile(self):
+        if self._compiled is None:
+            from lxml import etree
+            from parsel.csstranslator import HTMLTranslator
+
+            translator = HTMLTranslator()
+            self._compiled = {
+                alternative: etree.XPath(translator.css_to_xpath(alternative) if self.css else alternative)
+                for alternative in self._candidates()
+            }
+        return self._compiled
+
+    def _hit(self, alternative):
+        self.hits[alternative] += 1
+        if alternative in self.order and self.order[0] != alternative:
+            self.order.remove(alternative)
+            self.order.insert(0, alternative)
+        position = (self.alternatives + self.fallbacks).index(alternative) + 1
+        self._inc(f"hit/{position}")
+
+    def _inc(self, key):
+        if self.stats is not None:
+            self.stats.inc_value(f"selector/{self.name}/{key}")
+
+    def state(self):
+        return {"order": self.order, "hits": self.hits}
+
+
+class SelectorChains:
+    """Alle Ketten eines Spiders, gespeichert am Ende eines vollständigen Laufs."""
+
+    def __init__(self, path, stats=None):
+        self.path = pathlib.Path(path)
+        self.stats = stats
+        self.chains = {}
+        try:
+            self.saved = json.loads(self.path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            self.saved = {}
+
+    @classmethod
+    def from_spider(cls, spider):
+        settings = spider.crawler.settings
+        directory = pathlib.Path(data_path(settings.get("SELECTOR_CHAIN_DIR", "selectors"), createdir=True))
+        chains = cls(directory / f"{spider.name}.json", stats=spider.crawler.stats)
+        # Signale halten nur schwache Referenzen → am Spider festhalten
+        spider.selector_chains = chains
+        spider.crawler.signals.connect(chains.spider_closed, signal=signals.spider_closed)
+        return chains
+
+    def get(self, name, alternatives, fallbacks=(), css=False):
+        chain = self.chains.get(name)
+        if chain is None:
+            chain = self.chains[name] = SelectorChain(
+                name, alternatives, fallbacks, css=css, stats=self.stats, saved=self.saved.get(name),
+            )
+        return chain
+
+    def spider_closed(self, spider, reason):
+        for chain in self.chains.values():
+            total = sum(chain.hits.values())
+            if total:
+                winner = max(chain.hits, key=chain.hits.get)
+                logger.info(
+                    f"🎯 Selektor-Kette {chain.name}: {winner!r} {chain.hits[winner]}/{total} Treffer",
+                    extra={"spider": spider},
+                )
+        if reason != "finished" or not self.chains:
+            return
+        self.saved.update({name: chain.state() for name, chain in self.chains.items()})
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        tmp_path.write_text(json.dumps(self.saved, ensure_ascii=False, indent=1), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+
+
+def selector_chain(spider, name, alternatives, fallbacks=(), css=False):
+    """Kette name des Spiders (beim ersten Aufruf angelegt, Reihenfolge aus dem letzten Lauf)."""
+    chains = getattr(spider, "selector_chains", None)
+    if chains is None:
+        crawler = getattr(spider, "crawler", None)
+        chains = SelectorChains.from_spider(spider) if crawler is not None else SelectorChains(os.devnull)
+        spider.selector_chains = chains
+    return chains.get(name, alternatives, fallbacks, css)
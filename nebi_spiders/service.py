@@ -0,0 +1,321 @@
+"""
+Preis-Abfrage-Service (lokal, nur lesend)
+Lädt die aktuellen Feeds aus data/ in Spalten-Arrays mit sortierten
+Indizes pro Stadt / Abfallart / Größe und beantwortet Abfragen als JSON.
+
+Aufruf (aus dem Projekt-Root):
+    python -m nebi_spiders.service               # http://127.0.0.1:8080
+    python -m nebi_spiders.service --port 9000 --data-dir data
+
+Endpunkte (Stadt/Abfallart ohne Beachtung von Groß-/Kleinschreibung):
+    /offers?city=Köln&type=Holz A4               alle Angebote, nach Preis
+    /offers?city=Hamburg&type=Bauschutt&size=7   nur diese Größe
+    /cheapest?city=Hamburg&type=Bauschutt&size=7 günstigstes Angebot
+    /price-range?city=Berlin&type=Bauschutt      min/max/Anzahl pro Größe
+    /quote?city=Hamburg&type=Bauschutt&size=6    alle Anbieter für eine beliebige
+                                                 Größe (Preiskurven), nach Preis
+    /total-cost?city=Berlin&type=Bauschutt&size=7&days=21&lid=1&zone=max
+                                                 Angebote nach Gesamtkosten der Miete
+                                                 (cancelled=1: nach Stornogebühr)
+    /types?city=Köln                             verfügbare Abfallarten
+    /health                                      Stand der Daten
+
+Neue Feeds werden automatisch geladen (Prüfung höchstens alle
+RELOAD_INTERVAL Sekunden, beim nächsten Request).
+"""
+
+import argparse
+import json
+import logging
+import pathlib
+import sys
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from nebi_spiders.feeds import latest_feeds, read_feed
+from nebi_spiders.offers import normalize_text, parse_price, parse_size
+from nebi_spiders.pricecurve import build_curves
+from nebi_spiders.rentalcost import OfferTable, Scenario, rank, total_cost
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parent.parent
+
+RELOAD_INTERVAL = 2.0
+DEFAULT_LIMIT = 50
+
+logger = logging.getLogger(__name__)
+
+
+class OfferIndex:
+    """
+    Unveränderlicher Schnappschuss aller Angebote.
+
+    Spalten: city/type (normalisiert), size (m³), price (Cent).
+    Indizes: Zeilennummern, sortiert nach Preis (bzw. Größe, Preis).
+    Abweichende Preise weiterer PLZ (Feld "plz") bleiben außen vor -
+    Abfragen gehen nur nach Stadt, nicht nach PLZ.
+    """
+
+    def __init__(self, offers, loaded_from=None):
+        self.offers = []
+        self.city = []
+        self.type = []
+        self.size = array("d")
+        self.price = array("q")
+
+        for offer in offers:
+            if offer.get("plz"):
+                continue
+            price = parse_price(offer.get("price"))
+            size = parse_size(offer.get("size"))
+            if price is None or size is None:
+                continue
+            self.offers.append(offer)
+            self.city.append(normalize_text(offer.get("city")))
+            self.type.append(normalize_text(offer.get("type")))
+            self.size.append(size)
+            self.price.append(price)
+
+        by_city_type = defaultdict(list)
+        types_by_city = defaultdict(set)
+        for row in range(len(self.offers)):
+            by_city_type[(self.city[row], self.type[row])].append(row)
+            types_by_city[self.city[row]].add(self.offers[row].get("type"))
+
+        # (stadt, art) → Zeilen nach (Größe, Preis) + parallele Größen-Spalte für bisect
+        self.by_city_type = {}
+        self.sizes_by_city_type = {}
+        for key, rows in by_city_type.items():
+            rows.sort(key=lambda row: (self.size[row], self.price[row]))
+            self.by_city_type[key] = array("l", rows)
+            self.sizes_by_city_type[key] = array("d", (self.size[row] for row in rows))
+
+        # (stadt, art) → Zeilen nach Preis (für Abfragen ohne Größe)
+        self.by_price = {
+            key: array("l", sorted(rows, key=lambda row: self.price[row]))
+            for key, rows in self.by_city_type.items()
+        }
+
+        self.types_by_city = {city: sorted(types) for city, types in types_by_city.items()}
+
+        # (stadt, art) → Preiskurven aller Anbieter
+        self.curves = defaultdict(list)
+        for (source, city, waste_type), curve in build_curves(self.offers).items():
+            self.curves[(city, waste_type)].append(curve)
+
+        # Zusatzkosten als Zahlen-Spalten, Gesamtkosten pro Szenario gecacht
+        self.costs = OfferTable(self.offers)
+        self._totals = {}
+
+        self.loaded_from = loaded_from or {}
+        self.loaded_at = time.time()
+
+    def rows(self, city, waste_type, size=None):
+        """Zeilennummern, nach Preis sortiert."""
+        key = (normalize_text(city), normalize_text(waste_type))
+        if size is None:
+            return self.by_price.get(key, array("l"))
+
+        rows = self.by_city_type.get(key)
+        if rows is None:
+            return array("l")
+        sizes = self.sizes_by_city_type[key]
+        # Zeilen sind nach (Größe, Preis) sortiert → Bereich gleicher Größe ist nach Preis sortiert
+        return rows[bisect_left(sizes, size):bisect_right(sizes, size)]
+
+    def offers_for(self, city, waste_type, size=None, limit=DEFAULT_LIMIT):
+        return [self.offers[row] for row in self.rows(city, waste_type, size)[:limit]]
+
+    def cheapest(self, city, waste_type, size=None):
+        rows = self.rows(city, waste_type, size)
+        return self.offers[rows[0]] if rows else None
+
+    def price_range(self, city, waste_type):
+        """Pro Größe: günstigster/teuerster Preis (Euro) und Anzahl Angebote."""
+        key = (normalize_text(city), normalize_text(waste_type))
+        ranges = {}
+        for row in self.by_city_type.get(key, ()):
+            size = self.size[row]
+            entry = ranges.get(size)
+            if entry is None:
+                # Zeilen sind je Größe nach Preis sortiert → erste Zeile = min
+                ranges[size] = entry = {"size": size, "min": self.price[row], "max": self.price[row], "count": 0}
+            entry["max"] = self.price[row]
+            entry["count"] += 1
+        return [
+            {**entry, "min": entry["min"] / 100, "max": entry["max"] / 100}
+            for entry in ranges.values()
+        ]
+
+    def quote(self, city, waste_type, size):
+        """Preis jedes Anbieters für eine beliebige Größe, günstigster zuerst."""
+        quotes = []
+        for curve in self.curves.get((normalize_text(city), normalize_text(waste_type)), ()):
+            price, method = curve.quote(size)
+            quotes.append({
+                "source": curve.source,
+                "size": size,
+                "price": round(price / 100, 2),
+                "method": method,
+                "offered_sizes": list(curve.sizes),
+            })
+        quotes.sort(key=lambda quote: quote["price"])
+        return quotes
+
+    def total_costs(self, city, waste_type, size, scenario, limit=DEFAULT_LIMIT):
+        """Angebote nach Gesamtkosten der Miete (Euro), vollständige zuerst."""
+        key = scenario.key()
+        # Worker-Threads teilen den Cache: Ergebnis lokal halten, ein clear()
+        # eines anderen Threads zwischen Prüfen und Lesen ist dann harmlos
+        result = self._totals.get(key)
+        if result is None:
+            result = total_cost(self.costs, scenario)
+            if len(self._totals) >= 64:
+                self._totals.clear()
+            self._totals[key] = result
+        totals, complete = result
+
+        ranked = rank(totals, complete, self.rows(city, waste_type, size))[:limit]
+        return [
+            {"total": round(totals[row] / 100, 2), "complete": bool(complete[row]), "offer": self.offers[row]}
+            for row in ranked
+        ]
+
+    def types(self, city):
+        return self.types_by_city.get(normalize_text(city), [])
+
+
+def load_index(data_dir):
+    feeds = latest_feeds(data_dir)
+    offers = []
+    for spider, path in feeds.items():
+        try:
+            offers.extend(read_feed(path))
+        except Exception as e:
+            logger.warning(f"⚠️ Feed {path.name} übersprungen: {e}")
+    return OfferIndex(offers, {spider: path.stat().st_mtime for spider, path in feeds.items()})
+
+
+class OfferStore:
+    """Hält den aktuellen OfferIndex und tauscht ihn aus, wenn sich Feeds ändern."""
+
+    def __init__(self, data_dir, reload_interval=RELOAD_INTERVAL):
+        self.data_dir = pathlib.Path(data_dir)
+        self.reload_interval = reload_interval
+        self.index = load_index(self.data_dir)
+        self._checked_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def current(self):
+        if time.monotonic() - self._checked_at >= self.reload_interval and self._lock.acquire(blocking=False):
+            try:
+                self._checked_at = time.monotonic()
+                if self._changed():
+                    self.index = load_index(self.data_dir)
+                    logger.info(f"🔄 Neu geladen: {len(self.index.offers)} Angebote")
+            finally:
+                self._lock.release()
+        return self.index
+
+    def _changed(self):
+        feeds = latest_feeds(self.data_dir)
+        mtimes = {spider: path.stat().st_mtime for spider, path in feeds.items()}
+        return mtimes != self.index.loaded_from
+
+
+def _size_param(params):
+    value = params.get("size")
+    return parse_size(value) if value else None
+
+
+class QueryHandler(BaseHTTPRequestHandler):
+    store = None  # wird in serve() gesetzt
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+        index = self.store.current()
+
+        started = time.perf_counter()
+        try:
+            if url.path == "/offers":
+                limit = int(params.get("limit", DEFAULT_LIMIT))
+                result = index.offers_for(params["city"], params["type"], _size_param(params), limit)
+            elif url.path == "/cheapest":
+                result = index.cheapest(params["city"], params["type"], _size_param(params))
+            elif url.path == "/price-range":
+                result = index.price_range(params["city"], params["type"])
+            elif url.path == "/quote":
+                size = _size_param(params)
+                if size is None:
+                    raise ValueError("Parameter size fehlt oder ist keine Zahl")
+                result = index.quote(params["city"], params["type"], size)
+            elif url.path == "/total-cost":
+                scenario = Scenario(
+                    days=int(params.get("days", 14)),
+                    lid=params.get("lid", "0") in ("1", "true", "ja"),
+                    zone=params.get("zone", "max"),
+                    cancelled=params.get("cancelled", "0") in ("1", "true", "ja"),
+                )
+                limit = int(params.get("limit", DEFAULT_LIMIT))
+                result = index.total_costs(params["city"], params["type"], _size_param(params), scenario, limit)
+            elif url.path == "/types":
+                result = index.types(params["city"])
+            elif url.path == "/health":
+                result = {
+                    "offers": len(index.offers),
+                    "feeds": len(index.loaded_from),
+                    "loaded_at": index.loaded_at,
+                }
+            else:
+                return self._send(404, {"error": f"Unbekannter Pfad: {url.path}"})
+        except KeyError as e:
+            return self._send(400, {"error": f"Parameter fehlt: {e.args[0]}"})
+        except ValueError as e:
+            return self._send(400, {"error": str(e)})
+
+        elapsed_us = (time.perf_counter() - started) * 1e6
+        self._send(200, {"result": result, "took_us": round(elapsed_us, 1)})
+
+    def _send(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug(format, *args)
+
+
+def serve(data_dir, host="127.0.0.1", port=8080):
+    QueryHandler.store = OfferStore(data_dir)
+    server = ThreadingHTTPServer((host, port), QueryHandler)
+    logger.info(f"📡 {len(QueryHandler.store.index.offers)} Angebote, http://{host}:{port}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Lokaler Preis-Abfrage-Service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--data-dir", default=str(PROJECT_ROOT / "data"))
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    serve(args.data_dir, args.host, args.port)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -28,16 +28,40 @@ USER_AGENT = 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Ge
 ROBOTSTXT_OBEY = False
 
 # Configure maximum concurrent requests performed by Scrapy (default: 16)
-# WICHTIG: Auf 1 gesetzt, weil Selenium nur einen Browser-Driver hat
-CONCURRENT_REQUESTS = 1
+# Gilt für HTTP-Spider. Selenium-Spider setzen über custom_settings
+# (nebi_spiders.browser.BROWSER_SPIDER_SETTINGS) wieder seriell auf 1,
+# weil sie nur einen Browser-Driver haben.
+CONCURRENT_REQUESTS = 16
+
+# Multi-Spider Runner (python -m nebi_spiders.run)
+# Anzahl gleichzeitig laufender Spider im selben Prozess
+RUNNER_MAX_PARALLEL = 4
+# Globales Limit paralleler Requests, wird auf die laufenden Spider aufgeteilt
+RUNNER_CONCURRENCY_BUDGET = 16
+# Feeds als data/<spider>-products.jsonl.zst (zstd) statt .jsonl schreiben
+RUNNER_FEED_ZSTD = False
+# Vorab-Probe (nebi_spiders.preprobe): unveränderte Quellen überspringen,
+# der letzte Feed bleibt stehen. Spätestens nach MAX_AGE (Sekunden) läuft
+# jeder Spider wieder voll. Fingerprints unter .scrapy/preprobe/
+PREPROBE_ENABLED = True
+PREPROBE_MAX_AGE = 28 * 24 * 60 * 60
+PREPROBE_DIR = "preprobe"
+# Laufplan (nebi_spiders.schedule): Rechenbudget als Faktor auf einen
+# vollständigen Wochenlauf, mögliche Crawl-Intervalle in Tagen
+SCHEDULE_BUDGET = 1.0
+SCHEDULE_INTERVALS = [1, 2, 3, 7, 14, 28]
 
 # Configure a delay for requests for the same website (default: 0)
 # See https://docs.scrapy.org/en/latest/topics/settings.html#download-delay
 # See also autothrottle settings and docs
-DOWNLOAD_DELAY = 0.5
+# Mit AutoThrottle ist das die Untergrenze der Verzögerung pro Host
+DOWNLOAD_DELAY = 0.25
 # The download delay setting will honor only one of:
-#CONCURRENT_REQUESTS_PER_DOMAIN = 16
+# Ein Download-Slot pro Host: so viele parallele Requests je Shop
+CONCURRENT_REQUESTS_PER_DOMAIN = 4
 #CONCURRENT_REQUESTS_PER_IP = 16
+# Einzelne Hosts pro Spider über custom_settings feiner steuern, z.B.
+# DOWNLOAD_SLOTS = {"www.noris24.de": {"concurrency": 6, "delay": 0.25}}
 
 # Disable cookies (enabled by default)
 #COOKIES_ENABLED = False
@@ -71,31 +95,80 @@ DOWNLOAD_DELAY = 0.5
 
 # Configure item pipelines
 # See https://docs.scrapy.org/en/latest/topics/item-pipeline.html
-#ITEM_PIPELINES = {
-#    "nebi_spiders.pipelines.NebiSpidersPipeline": 300,
-#}
+ITEM_PIPELINES = {
+    "nebi_spiders.pipelines.DedupePipeline": 300,
+}
+
+# Checkpoints für Browser-Spider (.scrapy/checkpoints/<spider>.cells.jsonl, mit JOBDIR dort)
+CHECKPOINT_ENABLED = True
+CHECKPOINT_DIR = "checkpoints"
+# Ältere Checkpoints (Sekunden) werden verworfen, damit keine alten Preise auftauchen
+CHECKPOINT_MAX_AGE = 12 * 60 * 60
+
+# Duplikate (Anbieter/Stadt/Abfallart/Größe) im selben Lauf: "drop" oder "flag"
+DEDUPE_MODE = "drop"
+# Fingerprints des letzten erfolgreichen Laufs pro Spider (.scrapy/dedupe/<spider>.fp)
+DEDUPE_DIR = "dedupe"
+
+# PLZ-Raster für PLZ-abhängige Shops (nebi_spiders.plzgrid): weitere PLZ
+# pro Spider überschreiben die plz_grid-Liste im Spider, z.B.
+#   -s PLZ_GRID='{"redooo": ["50667", "50823"]}'
+PLZ_GRID_ENABLED = True
+PLZ_GRID = {}
+# Parallele Browser für weitere PLZ
+PLZ_GRID_SESSIONS = 2
+# Zellen (Abfallarten) pro weiterer PLZ, bevor sie als preisgleich gilt (0 = immer alle)
+PLZ_GRID_PROBE_CELLS = 1
+
+# Tarif-Quellen (nebi_spiders.tariff): ein Request auf die Preisseite prüft,
+# ob die hinterlegte Preisliste noch aktuell ist
+TARIFF_PROBE_ENABLED = True
+
+# Produkt-URL-Erkennung (nebi_spiders.discovery): Sitemap/Kategorieseiten statt
+# fester Listen; URL-Index pro Spider unter .scrapy/discovery/<spider>.json
+DISCOVERY_ENABLED = True
+DISCOVERY_DIR = "discovery"
+
+# Selektor-Ketten (nebi_spiders.selectorchain): Reihenfolge und Treffer
+# pro Spider unter .scrapy/selectors/<spider>.json
+SELECTOR_CHAIN_DIR = "selectors"
 
 # Enable and configure the AutoThrottle extension (disabled by default)
 # See https://docs.scrapy.org/en/latest/topics/autothrottle.html
-#AUTOTHROTTLE_ENABLED = True
+# Verzögerung pro Host folgt der gemessenen Latenz (langsamer Shop → langsamer)
+AUTOTHROTTLE_ENABLED = True
 # The initial download delay
-#AUTOTHROTTLE_START_DELAY = 5
+AUTOTHROTTLE_START_DELAY = 1
 # The maximum download delay to be set in case of high latencies
-#AUTOTHROTTLE_MAX_DELAY = 60
+AUTOTHROTTLE_MAX_DELAY = 10
 # The average number of requests Scrapy should be sending in parallel to
 # each remote server
-#AUTOTHROTTLE_TARGET_CONCURRENCY = 1.0
+AUTOTHROTTLE_TARGET_CONCURRENCY = 2.0
 # Enable showing throttling stats for every response received:
 #AUTOTHROTTLE_DEBUG = False
 
 # Enable and configure HTTP caching (disabled by default)
 # See https://docs.scrapy.org/en/latest/topics/downloader-middleware.html#httpcache-middleware-settings
+# Für Parser-Entwicklung/Replay einschalten, z.B.:
+#   scrapy crawl noris24 -s HTTPCACHE_ENABLED=1
+# Im Produktionslauf (GitHub Actions) bleibt der Cache aus.
 #HTTPCACHE_ENABLED = True
-#HTTPCACHE_EXPIRATION_SECS = 0
-#HTTPCACHE_DIR = "httpcache"
+HTTPCACHE_DIR = "httpcache"
 #HTTPCACHE_IGNORE_HTTP_CODES = []
-#HTTPCACHE_STORAGE = "scrapy.extensions.httpcache.FilesystemCacheStorage"
+# Eine SQLite-Datei (.scrapy/httpcache/httpcache.sqlite3), zstd/zlib-komprimiert,
+# Namespace pro Spider - inkl. PDF-Preislisten und Browser-Snapshots
+HTTPCACHE_STORAGE = "nebi_spiders.httpcache.SqliteCacheStorage"
+# Ablauf in Sekunden (0 = nie): HTML, PDF-Preislisten, Browser-Snapshots
+HTTPCACHE_EXPIRATION_SECS = 6 * 60 * 60
+HTTPCACHE_PDF_EXPIRATION_SECS = 7 * 24 * 60 * 60
+HTTPCACHE_BROWSER_EXPIRATION_SECS = 6 * 60 * 60
 
 # Set settings whose default value is deprecated to a future-proof value
 TWISTED_REACTOR = "twisted.internet.asyncioreactor.AsyncioSelectorReactor"
 FEED_EXPORT_ENCODING = "utf-8"
+
+# Lokale Feeds erst in <datei>.tmp schreiben und am Ende atomar ersetzen
+FEED_STORAGES = {
+    "": "nebi_spiders.feeds.AtomicFileFeedStorage",
+    "file": "nebi_spiders.feeds.AtomicFileFeedStorage",
+}
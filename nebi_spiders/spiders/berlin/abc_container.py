@@ -6,30 +6,22 @@ Extrahiert Preise für Container-Entsorgung in Berlin
 import scrapy
 import re
 
+from nebi_spiders.discovery import Discovery
+
 
 class ABCContainerSpider(scrapy.Spider):
     name = "abc-container"
     allowed_domains = ["abc-containerdienst.de"]
-    start_urls = ["https://abc-containerdienst.de/abfall-entsorgen-berlin/"]
-
-    # Container sizes available
-    CONTAINER_SIZES = [3, 5, 7, 8, 10]
-
-    # VAT rate
-    VAT_RATE = 1.19  # 19% MwSt.
-
-    custom_settings = {
-        'USER_AGENT': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
-        'ROBOTSTXT_OBEY': True,
-        'CONCURRENT_REQUESTS': 1,
-        'DOWNLOAD_DELAY': 2,
-    }
 
-    def parse(self, response):
-        """Parse overview page and extract waste type links"""
-
-        # Hardcoded list of all 10 waste type pages (to ensure we get all of them)
-        detail_pages = [
+    # Abfallart-Seiten aus den Links der Übersichtsseite (nebi_spiders.discovery),
+    # die bisher fest codierten 10 Seiten werden immer ergänzt, falls die
+    # Übersicht nicht jede Abfallart verlinkt
+    discovery = {
+        "categories": ["https://abc-containerdienst.de/abfall-entsorgen-berlin/"],
+        "follow": r"abc-containerdienst\.de/(?!abfall-entsorgen-berlin/)(?:[a-z0-9-]+-entsorgen(?:-berlin)?|teerhaltige-abfaelle)/$",
+        "callback": "parse_waste_type",
+        "merge_fallback": True,
+        "fallback": [
             "https://abc-containerdienst.de/baumisch-entsorgen/",
             "https://abc-containerdienst.de/bauschutt-entsorgen-berlin/",
             "https://abc-containerdienst.de/beton-entsorgen/",
@@ -40,13 +32,26 @@ class ABCContainerSpider(scrapy.Spider):
             "https://abc-containerdienst.de/holz-entsorgen/",
             "https://abc-containerdienst.de/sperrmuell-entsorgen/",
             "https://abc-containerdienst.de/teerhaltige-abfaelle/",
-        ]
+        ],
+    }
+
+    # Container sizes available
+    CONTAINER_SIZES = [3, 5, 7, 8, 10]
+
+    # VAT rate
+    VAT_RATE = 1.19  # 19% MwSt.
 
-        self.logger.info(f"Visiting {len(detail_pages)} waste type pages")
+    custom_settings = {
+        'USER_AGENT': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
+        'ROBOTSTXT_OBEY': True,
+        # Detailseiten pro Host parallel, AutoThrottle regelt ab 1s Abstand
+        'CONCURRENT_REQUESTS_PER_DOMAIN': 2,
+        'DOWNLOAD_DELAY': 1,
+    }
 
-        # Visit each detail page
-        for url in detail_pages:
-            yield response.follow(url, callback=self.parse_waste_type)
+    async def start(self):
+        for request in Discovery.from_spider(self).start_requests():
+            yield request
 
     def parse_waste_type(self, response):
         """Parse waste type detail page and extract prices"""
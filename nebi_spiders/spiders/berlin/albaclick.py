@@ -1,13 +1,8 @@
 import re
 import logging
-import requests
 from time import sleep
 from scrapy import Spider
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from scrapy.selector import Selector
+from nebi_spiders.browser import BROWSER_SPIDER_SETTINGS, By, EC, WebDriverWait, create_driver
 from scrapy.shell import inspect_response
 from scrapy.http import Request, FormRequest
 from scrapy.utils.response import open_in_browser
@@ -18,17 +13,13 @@ class AlbaclickSpider(Spider):
     allowed_domains = ['shop.albaclick.de']
     start_urls = ('https://shop.albaclick.de/',)
 
+    custom_settings = BROWSER_SPIDER_SETTINGS
+
     def __init__(self):
         logging.getLogger('selenium').setLevel(logging.WARNING)
         logging.getLogger('urllib3').setLevel(logging.WARNING)
 
-        options = webdriver.ChromeOptions()
-        options.add_argument('--headless')
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument('--disable-gpu')
-        options.add_argument('--window-size=1920,1080')
-        self.driver = webdriver.Chrome(options=options)
+        self.driver = create_driver()
         self.cookie_dismissed = False
 
         # Mapping für Abfallart-Umbenennungen
@@ -43,7 +34,7 @@ class AlbaclickSpider(Spider):
     def _dismiss_cookie_banner(self):
         """Schließt OneTrust Cookie-Banner."""
         if self.cookie_dismissed:
-            return
+            return False
 
         cookie_selectors = [
             "//button[text()='Alle akzeptieren']",
@@ -63,9 +54,10 @@ class AlbaclickSpider(Spider):
                 self.log("✓ Cookie-Banner geschlossen")
                 self.cookie_dismissed = True
                 sleep(1)
-                return
+                return True
             except:
                 pass
+        return False
 
     def _js_click(self, xpath):
         """JavaScript-Klick für robustere Interaktion."""
@@ -113,7 +105,8 @@ class AlbaclickSpider(Spider):
                 self.log(f'Processing: {self.driver.current_url}')
 
                 # Cookie-Banner schließen (OneTrust)
-                self._dismiss_cookie_banner()
+                if self.driver.needs_consent() and self._dismiss_cookie_banner():
+                    self.driver.consent_given()
 
                 max_rental_period = '7'
 
@@ -121,7 +114,7 @@ class AlbaclickSpider(Spider):
                 self._js_click('//button[contains(@aria-label, "Welche Größe?")]')
                 sleep(3)
 
-                sel = Selector(text=self.driver.page_source)
+                sel = self.driver.selector()
 
                 options = sel.xpath('//div[@class="variant-configuration-variants"]/button')
 
@@ -2,10 +2,7 @@ import re
 import logging
 from time import sleep
 from scrapy import Spider
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait, Select
-from selenium.webdriver.support import expected_conditions as EC
+from nebi_spiders.browser import BROWSER_SPIDER_SETTINGS, By, EC, Select, WebDriverWait, create_driver
 from scrapy.selector import Selector
 
 
@@ -36,17 +33,13 @@ class BerlinRecyclingSpider(Spider):
         "https://shop.berlin-recycling.de/products/verpackungsstyropor-entsorgung-container",
     ]
 
+    custom_settings = BROWSER_SPIDER_SETTINGS
+
     def __init__(self):
         logging.getLogger('selenium').setLevel(logging.WARNING)
         logging.getLogger('urllib3').setLevel(logging.WARNING)
 
-        options = webdriver.ChromeOptions()
-        options.add_argument('--headless')
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument('--disable-gpu')
-        options.add_argument('--window-size=1920,1080')
-        self.driver = webdriver.Chrome(options=options)
+        self.driver = create_driver()
         self.cookie_dismissed = False
         # Set zur Vermeidung von Duplikaten (type + size Kombination)
         self.seen_products = set()
@@ -54,7 +47,7 @@ class BerlinRecyclingSpider(Spider):
     def _dismiss_cookie_banner(self):
         """Schließt Cookie-Banner."""
         if self.cookie_dismissed:
-            return
+            return False
 
         cookie_selectors = [
             "//button[@title='Akzeptieren Sie alle cookies']",
@@ -71,9 +64,10 @@ class BerlinRecyclingSpider(Spider):
                 self.log("Cookie-Banner geschlossen")
                 self.cookie_dismissed = True
                 sleep(1)
-                return
+                return True
             except:
                 pass
+        return False
 
     def _js_click(self, element):
         """JavaScript-Klick für robustere Interaktion."""
@@ -155,7 +149,8 @@ class BerlinRecyclingSpider(Spider):
                 sleep(4)
 
                 # Cookie-Banner schließen
-                self._dismiss_cookie_banner()
+                if self.driver.needs_consent() and self._dismiss_cookie_banner():
+                    self.driver.consent_given()
 
                 # Titel extrahieren (= Abfallart)
                 try:
@@ -1,5 +1,4 @@
 import re
-import requests
 from scrapy import Spider
 from scrapy.selector import Selector
 from scrapy.shell import inspect_response
@@ -23,18 +22,46 @@ class CdzBerlinSpider(Spider):
     allowed_domains = ['cdz-berlin.de']
     start_urls = ['https://cdz-berlin.de/shop.php']
 
-    def __init__(self):
-        page = requests.get('https://cdz-berlin.de/allgemeine_geschaeftsbedingungen')
+    agb_url = 'https://cdz-berlin.de/allgemeine_geschaeftsbedingungen'
 
-        self.max_rental_period = re.findall(r'(?<=bis zu )(\d+)(?= Tagen)', page.text)[0]
-        self.fee_after_max = re.findall(r'(?<=von )([\d,]+)(?= €)', page.text)[0] + '€'
-        self.cancellation_fee = get_cancellation_fee(page.text)
+    def __init__(self):
+        # AGB-Werte werden in parse_agb über die Scrapy-Engine geladen
+        self.max_rental_period = ''
+        self.fee_after_max = ''
+        self.cancellation_fee = ''
 
     def parse(self, response):
         # open_in_browser(response)
         # inspect_response(response, self)
 
         categories = response.xpath('//div[contains(@class, "product-category product")]/a/@href').getall()
+
+        # Erst AGB laden (Mietdauer, Gebühren), dann Kategorien crawlen
+        yield Request(self.agb_url,
+                      callback=self.parse_agb,
+                      errback=self.agb_failed,
+                      cb_kwargs={'categories': categories})
+
+    def parse_agb(self, response, categories):
+        # Geänderte AGB dürfen den Lauf nicht abbrechen: fehlende Werte bleiben leer
+        match = re.search(r'(?<=bis zu )(\d+)(?= Tagen)', response.text)
+        self.max_rental_period = match.group(1) if match else ''
+
+        match = re.search(r'(?<=von )([\d,]+)(?= €)', response.text)
+        self.fee_after_max = match.group(1) + '€' if match else ''
+
+        self.cancellation_fee = get_cancellation_fee(response.text)
+
+        if not (self.max_rental_period and self.fee_after_max):
+            self.logger.warning("AGB-Werte nicht vollständig gefunden, fahre mit leeren Werten fort")
+
+        yield from self._category_requests(categories)
+
+    def agb_failed(self, failure):
+        self.logger.warning(f"AGB-Seite nicht geladen, fahre ohne AGB-Werte fort: {failure.value}")
+        yield from self._category_requests(failure.request.cb_kwargs['categories'])
+
+    def _category_requests(self, categories):
         for category_url in categories:
             yield Request(category_url,
                           callback=self.parse_category)
@@ -1,14 +1,11 @@
 import re
 import logging
-import requests
 from time import sleep
 from scrapy import Spider
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+from nebi_spiders.browser import BROWSER_SPIDER_SETTINGS, By, EC, WebDriverWait, create_driver
+from nebi_spiders.checkpoint import Checkpoint
+from nebi_spiders.selectorchain import selector_chain
 from selenium.common.exceptions import TimeoutException, ElementClickInterceptedException
-from scrapy.selector import Selector
 from scrapy.shell import inspect_response
 from scrapy.http import Request, FormRequest
 from scrapy.utils.response import open_in_browser
@@ -18,14 +15,10 @@ class ContainerfritzeSpider(Spider):
     name = 'containerfritze'
     start_urls = ['https://containerfritze.de/']
 
+    custom_settings = BROWSER_SPIDER_SETTINGS
+
     def __init__(self):
-        options = webdriver.ChromeOptions()
-        options.add_argument('--headless')
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument('--disable-gpu')
-        options.add_argument('--window-size=1920,1080')
-        self.driver = webdriver.Chrome(options=options)
+        self.driver = create_driver()
 
         # page = requests.get('https://containerfritze.de/agb/')
 
@@ -82,25 +75,27 @@ class ContainerfritzeSpider(Spider):
 
     def _dismiss_cookie_banner(self):
         """Versucht Cookie-Banner zu schließen."""
-        cookie_selectors = [
+        # Der zuletzt erfolgreiche Selektor wird zuerst probiert
+        chain = selector_chain(self, "cookie_banner", [
             "//button[contains(text(), 'Akzeptieren')]",
             "//button[contains(text(), 'Alle akzeptieren')]",
             "//button[contains(text(), 'Accept')]",
             "//a[contains(text(), 'Akzeptieren')]",
             "//button[contains(@class, 'cookie')]",
             "//div[contains(@class, 'cookie')]//button",
-        ]
-        for selector in cookie_selectors:
-            try:
-                elements = self.driver.find_elements(By.XPATH, selector)
-                for elem in elements:
-                    if elem.is_displayed():
-                        self._js_click(elem)
-                        self.log("✓ Cookie-Banner geschlossen")
-                        sleep(1)
-                        return True
-            except:
-                pass
+        ])
+        if chain.first(self._click_displayed):
+            self.log("✓ Cookie-Banner geschlossen")
+            sleep(1)
+            return True
+        return False
+
+    def _click_displayed(self, selector):
+        """Klickt das erste sichtbare Element zu selector; True bei Erfolg."""
+        for elem in self.driver.find_elements(By.XPATH, selector):
+            if elem.is_displayed():
+                self._js_click(elem)
+                return True
         return False
 
     def _js_click(self, element):
@@ -166,9 +161,10 @@ class ContainerfritzeSpider(Spider):
             sleep(5)
 
             # Cookie-Banner beim ersten Laden schließen
-            self._dismiss_cookie_banner()
+            if self.driver.needs_consent() and self._dismiss_cookie_banner():
+                self.driver.consent_given()
 
-            containers = Selector(text=self.driver.page_source).xpath('//h2/a/@href').getall()
+            containers = self.driver.selector().xpath('//h2/a/@href').getall()
             all_containers.extend(containers)
 
         # Füge zusätzliche Container-URLs hinzu
@@ -177,14 +173,27 @@ class ContainerfritzeSpider(Spider):
         # Entferne Duplikate
         all_containers = list(set(all_containers))
 
+        # Fertige Zellen (Container-Seite × Größe) aus einem abgebrochenen Lauf überspringen
+        checkpoint = Checkpoint.from_spider(self)
+
         for container in all_containers:
+            if checkpoint.done((container,)):
+                for item in checkpoint.items((container,)):
+                    self.seen_products.add(f"{item['type']}|{item['size']}")
+                    yield item
+                continue
+
+            page_items = []
+            page_complete = True
+
             self.driver.get(container)
             sleep(5)
 
-            # Cookie-Banner erneut prüfen
-            self._dismiss_cookie_banner()
+            # Cookie-Banner schließen, falls noch nicht geschehen
+            if self.driver.needs_consent() and self._dismiss_cookie_banner():
+                self.driver.consent_given()
 
-            order_now_button_url = Selector(text=self.driver.page_source).xpath(
+            order_now_button_url = self.driver.selector().xpath(
                 '//a[@class="elementor-button elementor-button-link elementor-size-lg"]/@href').get()
 
             if order_now_button_url:
@@ -192,7 +201,8 @@ class ContainerfritzeSpider(Spider):
                 sleep(6)
 
                 # Cookie-Banner auf Produktseite schließen
-                self._dismiss_cookie_banner()
+                if self.driver.needs_consent() and self._dismiss_cookie_banner():
+                    self.driver.consent_given()
 
                 # JavaScript-Klicks statt normaler Klicks
                 self._safe_click('//span[text()="Brutto"]')
@@ -204,15 +214,26 @@ class ContainerfritzeSpider(Spider):
                 self._safe_click('//span[text()="Brutto"]')
                 sleep(3)
 
-                containers = self.driver.find_elements(By.XPATH, '//ul[@data-attribute="attribute_pa_groesse"]/li/a')
-                for container_num, container in enumerate(containers):
+                size_links = self.driver.find_elements(By.XPATH, '//ul[@data-attribute="attribute_pa_groesse"]/li/a')
+                for container_num in range(len(size_links)):
                     # JavaScript-Klick für Größen-Auswahl
                     size_elements = self.driver.find_elements(By.XPATH, '//ul[@data-attribute="attribute_pa_groesse"]/li/a')
-                    if container_num < len(size_elements):
-                        self._js_click(size_elements[container_num])
+                    if container_num >= len(size_elements):
+                        page_complete = False
+                        continue
+
+                    cell = (container, size_elements[container_num].text.strip() or container_num)
+                    if checkpoint.done(cell):
+                        for item in checkpoint.items(cell):
+                            self.seen_products.add(f"{item['type']}|{item['size']}")
+                            page_items.append(item)
+                            yield item
+                        continue
+
+                    self._js_click(size_elements[container_num])
                     sleep(4)
 
-                    sel = Selector(text=self.driver.page_source)
+                    sel = self.driver.selector()
 
                     source = 'containerfritze'
 
@@ -281,6 +302,20 @@ class ContainerfritzeSpider(Spider):
                         product_key = f"{type}|{size}"
                         if product_key not in self.seen_products:
                             self.seen_products.add(product_key)
+                            checkpoint.mark_done(cell, [item])
+                            page_items.append(item)
                             yield item
                         else:
                             self.log(f"⚠️ Duplikat übersprungen: {type} {size}")
+                            checkpoint.mark_done(cell, [])
+                    else:
+                        # Größe ohne Preis (Preis auf Anfrage): fertig, ohne Item
+                        self.log(f"⚠️ Kein Preis gefunden: {cell[1]} auf {container}")
+                        checkpoint.mark_done(cell, [])
+            else:
+                # Seite ohne Bestell-Button hat keine Größen: fertig, ohne Items
+                self.log(f"⚠️ Kein Bestell-Button auf {container}")
+
+            # Alle Größen dieser Seite fertig: beim Neustart Seite gar nicht mehr laden
+            if page_complete:
+                checkpoint.mark_done((container,), page_items)
@@ -9,10 +9,9 @@ from time import sleep
 from scrapy import Spider
 from scrapy.selector import Selector
 
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait, Select
-from selenium.webdriver.support import expected_conditions as EC
+from nebi_spiders.browser import BROWSER_SPIDER_SETTINGS, By, EC, Select, WebDriverWait, create_driver
+from nebi_spiders.discovery import Discovery
+from nebi_spiders.selectorchain import selector_chain
 from selenium.common.exceptions import TimeoutException, StaleElementReferenceException
 
 
@@ -20,8 +19,9 @@ class DareShopProductsSpider(Spider):
     name = "dare-shop-products"
     allowed_domains = ["www.dare-shop.de", "dare-shop.de"]
 
-    # Nur funktionierende Produkt-URLs (Status 200)
-    start_urls = [
+    # Produkt-URLs aus der Sitemap (nebi_spiders.discovery); die bisherige
+    # Liste funktionierender Produkt-URLs bleibt als Fallback
+    fallback_urls = [
         # Baumischabfall
         "https://www.dare-shop.de/container-bestellen/25/absetzcontainer-fuer-baumischabfall-in-berlin?c=7",
         "https://www.dare-shop.de/container-bestellen/30/abrollcontainer-fuer-baumischabfall-in-berlin?c=7",
@@ -60,17 +60,19 @@ class DareShopProductsSpider(Spider):
         "https://www.dare-shop.de/container-bestellen/50/abrollcontainer-fuer-sperrmuell-in-berlin?c=7",
     ]
 
+    discovery = {
+        "sitemaps": ["https://www.dare-shop.de/sitemap.xml"],
+        "follow": r"dare-shop\.de/container-bestellen/\d+/[^/?#]+-in-berlin",
+        "fallback": fallback_urls,
+    }
+
+    custom_settings = BROWSER_SPIDER_SETTINGS
+
     def __init__(self):
         logging.getLogger("selenium").setLevel(logging.WARNING)
         logging.getLogger("urllib3").setLevel(logging.WARNING)
 
-        options = webdriver.ChromeOptions()
-        options.add_argument('--headless')
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument('--disable-gpu')
-        options.add_argument('--window-size=1920,1080')
-        self.driver = webdriver.Chrome(options=options)
+        self.driver = create_driver()
 
         # Dynamische Werte aus AGB holen
         self.agb_values = self._fetch_agb_values()
@@ -81,6 +83,10 @@ class DareShopProductsSpider(Spider):
         except Exception:
             pass
 
+    async def start(self):
+        for request in Discovery.from_spider(self).start_requests():
+            yield request
+
     # ---------------------------------------------------------
     # AGB-Werte dynamisch von der Website holen
     # ---------------------------------------------------------
@@ -97,7 +103,7 @@ class DareShopProductsSpider(Spider):
             self.driver.get("https://www.dare-shop.de/agb")
             sleep(2)
 
-            sel = Selector(text=self.driver.page_source)
+            sel = self.driver.selector()
 
             # Suche nach "Mietzeit von X Tagen" in §4
             agb_text = sel.xpath('//text()').getall()
@@ -157,7 +163,7 @@ class DareShopProductsSpider(Spider):
             self.log("Cookie-Banner nicht gefunden oder bereits akzeptiert.")
 
         # aktuelles HTML holen
-        sel = Selector(text=self.driver.page_source)
+        sel = self.driver.selector()
 
         # Titel
         title = (sel.xpath("//h1/text()").get() or "").strip()
@@ -192,7 +198,7 @@ class DareShopProductsSpider(Spider):
         except Exception:
             self.log("⚠️ Kein Größen-Dropdown gefunden – ein Eintrag ohne Größen.")
             # Preis direkt aus der Seite lesen
-            sel = Selector(text=self.driver.page_source)
+            sel = self.driver.selector()
             price = self._extract_price(sel)
             size = ""
             current_url = self.driver.current_url
@@ -228,7 +234,7 @@ class DareShopProductsSpider(Spider):
             self.log(f"Verarbeite Option {idx+1}/{options_count}: {size_text}")
 
             # Aktuellen Preis vor dem Klicken holen
-            sel_before = Selector(text=self.driver.page_source)
+            sel_before = self.driver.selector()
             price_before = self._extract_price(sel_before)
             self.log(f"Preis vor Auswahl: {price_before}")
 
@@ -236,11 +242,12 @@ class DareShopProductsSpider(Spider):
             select.select_by_index(idx)
             sleep(0.5)
 
-            # Warten, bis sich der Preis ändert (max 10 Sekunden)
+            # Warten, bis sich der Preis ändert (max 10 Sekunden);
+            # ohne DOM-Änderung liefert selector() den bereits geparsten Stand
             price_changed = False
             for attempt in range(20):  # 20 x 0.5s = 10 Sekunden
                 sleep(0.5)
-                sel = Selector(text=self.driver.page_source)
+                sel = self.driver.selector()
                 price = self._extract_price(sel)
 
                 if price and price != price_before:
@@ -263,7 +270,7 @@ class DareShopProductsSpider(Spider):
 
             sleep(0.5)  # kleine Extra-Pause
 
-            sel = Selector(text=self.driver.page_source)
+            sel = self.driver.selector()
             current_url = self.driver.current_url
             price = self._extract_price(sel)
 
@@ -282,34 +289,23 @@ class DareShopProductsSpider(Spider):
         """
         Versucht verschiedene Selektoren, um den aktuellen Preis zu finden.
         """
-        price = ""
-
         # Methode 1: Preis aus dem sichtbaren Preis-Bereich
         # Typische Klassen: product--price, price--content, etc.
-        price_candidates = sel.xpath(
-            '//span[contains(@class, "price--content")]//text() | '
-            '//div[contains(@class, "product--price")]//text() | '
-            '//span[@itemprop="price"]//text()'
-        ).getall()
-
-        for candidate in price_candidates:
-            candidate = candidate.strip()
-            # Muster für 726,00 oder 1.910,50 etc.
-            m = re.search(r'(\d{1,3}(?:\.\d{3})*,\d{2})', candidate)
-            if m:
-                price = m.group(1)
-                break
-
-        # Methode 2: Falls nicht gefunden, erste € Erwähnung
-        if not price:
-            price_text = sel.xpath(
-                'normalize-space((//text()[contains(., "€")])[1])'
-            ).get()
-
-            if price_text:
-                m = re.search(r'(\d{1,3}(?:\.\d{3})*,\d{2})', price_text)
-                if m:
-                    price = m.group(1)
+        # (eine Alternative: die Vereinigung liefert die Treffer in
+        # Dokument-Reihenfolge, der erste Preis auf der Seite gewinnt)
+        # Methode 2: Falls nicht gefunden, erste € Erwähnung (nur als Fallback,
+        # trifft auf jeder Seite und würde sonst nach vorne wandern)
+        chain = selector_chain(
+            self,
+            "price",
+            [
+                '//span[contains(@class, "price--content")]//text() | '
+                '//div[contains(@class, "product--price")]//text() | '
+                '//span[@itemprop="price"]//text()',
+            ],
+            fallbacks=['normalize-space((//text()[contains(., "€")])[1])'],
+        )
+        price = chain.select(sel, self._first_price)
 
         # Methode 3: meta tag als Fallback
         if not price:
@@ -319,7 +315,16 @@ class DareShopProductsSpider(Spider):
             if meta_price:
                 price = meta_price.strip()
 
-        return price
+        return price or ""
+
+    @staticmethod
+    def _first_price(candidates):
+        for candidate in candidates:
+            # Muster für 726,00 oder 1.910,50 etc.
+            m = re.search(r'(\d{1,3}(?:\.\d{3})*,\d{2})', candidate.strip())
+            if m:
+                return m.group(1)
+        return None
 
     # ---------------------------------------------------------
     # Hilfsfunktion: Item bauen
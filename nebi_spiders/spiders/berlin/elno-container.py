@@ -5,10 +5,7 @@ from time import sleep
 from scrapy import Spider
 from scrapy.selector import Selector
 
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+from nebi_spiders.browser import BROWSER_SPIDER_SETTINGS, By, EC, WebDriverWait, create_driver
 
 
 class ElnoContainerProductsSpider(Spider):
@@ -48,17 +45,13 @@ class ElnoContainerProductsSpider(Spider):
 
     start_urls = ["https://heyflow.id/elno-container"]
 
+    custom_settings = BROWSER_SPIDER_SETTINGS
+
     def __init__(self):
         logging.getLogger("selenium").setLevel(logging.WARNING)
         logging.getLogger("urllib3").setLevel(logging.WARNING)
 
-        options = webdriver.ChromeOptions()
-        options.add_argument('--headless')
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument('--disable-gpu')
-        options.add_argument('--window-size=1920,1080')
-        self.driver = webdriver.Chrome(options=options)
+        self.driver = create_driver()
 
         # Werte werden beim ersten Aufruf extrahiert
         self.rental_info = None
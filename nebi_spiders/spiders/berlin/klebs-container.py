@@ -5,8 +5,7 @@ from time import sleep
 from scrapy import Spider
 from scrapy.selector import Selector
 
-from selenium import webdriver
-from selenium.webdriver.common.by import By
+from nebi_spiders.browser import BROWSER_SPIDER_SETTINGS, By, create_driver
 
 
 class KlebsContainerProductsSpider(Spider):
@@ -30,17 +29,13 @@ class KlebsContainerProductsSpider(Spider):
 
     start_urls = ["https://www.klebs.info/abfaelle/"]
 
+    custom_settings = BROWSER_SPIDER_SETTINGS
+
     def __init__(self):
         logging.getLogger("selenium").setLevel(logging.WARNING)
         logging.getLogger("urllib3").setLevel(logging.WARNING)
 
-        options = webdriver.ChromeOptions()
-        options.add_argument('--headless')
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument('--disable-gpu')
-        options.add_argument('--window-size=1920,1080')
-        self.driver = webdriver.Chrome(options=options)
+        self.driver = create_driver()
 
     def closed(self, reason):
         try:
@@ -65,7 +60,8 @@ class KlebsContainerProductsSpider(Spider):
                 sleep(3)
 
                 # Cookie-Banner wegklicken (nur beim ersten Aufruf)
-                self._dismiss_cookie_banner()
+                if self.driver.needs_consent() and self._dismiss_cookie_banner():
+                    self.driver.consent_given()
 
                 # Finde alle Container-Links
                 container_links = self._find_container_links()
@@ -121,11 +117,12 @@ class KlebsContainerProductsSpider(Spider):
                             btn.click()
                             self.log("✓ Cookie-Banner geschlossen")
                             sleep(1)
-                            return
+                            return True
                     except:
                         pass
         except:
             pass
+        return False
 
     def _find_container_links(self):
         """
@@ -5,8 +5,8 @@ from time import sleep
 from scrapy import Spider
 from scrapy.selector import Selector
 
-from selenium import webdriver
-from selenium.webdriver.common.by import By
+from nebi_spiders.browser import BROWSER_SPIDER_SETTINGS, By, create_driver
+from nebi_spiders.checkpoint import Checkpoint
 
 
 class OresContainerProductsSpider(Spider):
@@ -29,17 +29,13 @@ class OresContainerProductsSpider(Spider):
 
     start_urls = ["https://containerentsorgung-berlin.de/"]
 
+    custom_settings = BROWSER_SPIDER_SETTINGS
+
     def __init__(self):
         logging.getLogger("selenium").setLevel(logging.WARNING)
         logging.getLogger("urllib3").setLevel(logging.WARNING)
 
-        options = webdriver.ChromeOptions()
-        options.add_argument('--headless')
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument('--disable-gpu')
-        options.add_argument('--window-size=1920,1080')
-        self.driver = webdriver.Chrome(options=options)
+        self.driver = create_driver()
 
         # Rental period will be extracted from AGB
         self.max_rental_period = None
@@ -60,29 +56,51 @@ class OresContainerProductsSpider(Spider):
 
         total_products = 0
 
+        # Fertige Zellen (Abfallart × Produkt) aus einem abgebrochenen Lauf überspringen
+        checkpoint = Checkpoint.from_spider(self)
+
         # For each waste type
         for url, display_name in self.waste_type_urls:
             self.log(f"\n--- Verarbeite: {display_name} ---")
 
+            if checkpoint.done((display_name,)):
+                for product in checkpoint.items((display_name,)):
+                    total_products += 1
+                    yield product
+                self.log(f"  ♻️ Aus Checkpoint übernommen")
+                continue
+
             try:
                 # Navigate to waste type page
                 self.driver.get(url)
                 sleep(3)
 
                 # Dismiss cookie banner (only on first call)
-                self._dismiss_cookie_banner()
+                if self.driver.needs_consent() and self._dismiss_cookie_banner():
+                    self.driver.consent_given()
 
                 # Find all product links on the page
                 product_links = self._find_product_links()
 
                 if not product_links:
                     self.log(f"  ⚠️ Keine Produkt-Links gefunden")
+                    checkpoint.mark_failed((display_name,))
                     continue
 
                 self.log(f"  Gefunden: {len(product_links)} Produkte")
 
                 # For each product link, visit detail page and extract data
+                type_products = []
+                type_complete = True
                 for product_url in product_links:
+                    cell = (display_name, product_url)
+                    if checkpoint.done(cell):
+                        for product in checkpoint.items(cell):
+                            total_products += 1
+                            type_products.append(product)
+                            yield product
+                        continue
+
                     try:
                         # Navigate to product detail page
                         self.driver.get(product_url)
@@ -91,17 +109,31 @@ class OresContainerProductsSpider(Spider):
                         # Extract product details
                         product = self._extract_product(product_url, display_name)
 
-                        if product:
-                            total_products += 1
-                            self.log(f"  ✓ {product['size']}m³: {product['price']}€ (Deckel: {product['lid_price']}€)")
-                            yield product
+                        if not product:
+                            # Größe/Preis nicht geladen: Zelle beim Neustart erneut versuchen
+                            checkpoint.mark_failed(cell)
+                            type_complete = False
+                            continue
+
+                        checkpoint.mark_done(cell, [product])
+                        type_products.append(product)
+                        total_products += 1
+                        self.log(f"  ✓ {product['size']}m³: {product['price']}€ (Deckel: {product['lid_price']}€)")
+                        yield product
 
                     except Exception as e:
                         self.log(f"  ❌ Fehler bei {product_url}: {e}")
+                        checkpoint.mark_failed(cell)
+                        type_complete = False
                         continue
 
+                # Ganze Abfallart fertig: beim Neustart auch die Übersichtsseite überspringen
+                if type_complete:
+                    checkpoint.mark_done((display_name,), type_products)
+
             except Exception as e:
                 self.log(f"  ❌ Fehler: {e}")
+                checkpoint.mark_failed((display_name,))
                 continue
 
         self.log(f"\n{'='*80}")
@@ -154,11 +186,12 @@ class OresContainerProductsSpider(Spider):
                             btn.click()
                             self.log("✓ Cookie-Banner geschlossen")
                             sleep(1)
-                            return
+                            return True
                     except:
                         pass
         except:
             pass
+        return False
 
     def _find_product_links(self):
         """
@@ -3,10 +3,8 @@ import re
 from time import sleep
 
 from scrapy import Spider
-from scrapy.selector import Selector
 
-from selenium import webdriver
-from selenium.webdriver.common.by import By
+from nebi_spiders.browser import BROWSER_SPIDER_SETTINGS, By, create_driver
 
 
 class SchuttgeierProductsSpider(Spider):
@@ -24,17 +22,13 @@ class SchuttgeierProductsSpider(Spider):
         ("Sperrmüll", "Sperrmüll"),
     ]
 
+    custom_settings = BROWSER_SPIDER_SETTINGS
+
     def __init__(self):
         logging.getLogger("selenium").setLevel(logging.WARNING)
         logging.getLogger("urllib3").setLevel(logging.WARNING)
 
-        options = webdriver.ChromeOptions()
-        options.add_argument('--headless')
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument('--disable-gpu')
-        options.add_argument('--window-size=1920,1080')
-        self.driver = webdriver.Chrome(options=options)
+        self.driver = create_driver()
 
     def closed(self, reason):
         try:
@@ -55,13 +49,11 @@ class SchuttgeierProductsSpider(Spider):
             sleep(3)
 
             # Try to dismiss cookie banner
-            self._dismiss_cookie_banner()
-
-            # Get the page source
-            page_source = self.driver.page_source
+            if self.driver.needs_consent() and self._dismiss_cookie_banner():
+                self.driver.consent_given()
 
-            # Parse with Scrapy Selector
-            selector = Selector(text=page_source)
+            # Geparster page_source (aus dem DOM-Snapshot-Cache des Drivers)
+            selector = self.driver.selector()
 
             # Extract products for each waste type
             for class_name, display_name in self.waste_types:
@@ -160,8 +152,9 @@ class SchuttgeierProductsSpider(Spider):
                             btn.click()
                             self.log("✓ Cookie-Banner geschlossen")
                             sleep(1)
-                            return
+                            return True
                     except:
                         pass
         except:
             pass
+        return False
@@ -3,12 +3,8 @@ import re
 from time import sleep
 
 from scrapy import Spider
-from scrapy.selector import Selector
 
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+from nebi_spiders.browser import BROWSER_SPIDER_SETTINGS, By, EC, WebDriverWait, create_driver
 from selenium.common.exceptions import TimeoutException
 
 
@@ -25,17 +21,13 @@ class TSContainerProductsSpider(Spider):
         "https://ts-container.de/gartenabfaelle/",
     ]
 
+    custom_settings = BROWSER_SPIDER_SETTINGS
+
     def __init__(self):
         logging.getLogger("selenium").setLevel(logging.WARNING)
         logging.getLogger("urllib3").setLevel(logging.WARNING)
 
-        options = webdriver.ChromeOptions()
-        options.add_argument('--headless')
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument('--disable-gpu')
-        options.add_argument('--window-size=1920,1080')
-        self.driver = webdriver.Chrome(options=options)
+        self.driver = create_driver()
 
         # Dynamische Werte aus AGB holen (falls vorhanden)
         self.agb_values = self._fetch_agb_values()
@@ -60,7 +52,7 @@ class TSContainerProductsSpider(Spider):
             self.driver.get("https://ts-container.de/agb/")
             sleep(2)
 
-            sel = Selector(text=self.driver.page_source)
+            sel = self.driver.selector()
             agb_text = " ".join(sel.xpath('//text()').getall())
 
             # Extrahiere Mietzeit (falls vorhanden)
@@ -110,7 +102,7 @@ class TSContainerProductsSpider(Spider):
             self.log("Cookie-Banner nicht gefunden oder bereits akzeptiert.")
 
         # HTML holen
-        sel = Selector(text=self.driver.page_source)
+        sel = self.driver.selector()
 
         # Abfallart aus URL ableiten
         waste_type = self._extract_waste_type_from_url(url)
@@ -122,7 +114,7 @@ class TSContainerProductsSpider(Spider):
         # Für jedes Produkt
         for idx in range(len(products)):
             # HTML neu holen für jedes Produkt
-            sel = Selector(text=self.driver.page_source)
+            sel = self.driver.selector()
 
             # Titel
             titles = sel.css('.woocommerce-loop-product__title::text').getall()
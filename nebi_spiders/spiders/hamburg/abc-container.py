@@ -5,12 +5,11 @@ PDF-Preisliste wird dynamisch gelesen und geparst.
 Quelle: https://abccontainer.de/wp-content/uploads/2025-04-Preisliste-Container1.pdf
 """
 
-import io
 import re
-import requests
-import pdfplumber
 
-from scrapy import Spider
+from scrapy import Spider, Request
+
+from nebi_spiders.pdf import extract_pages
 
 
 class ABCContainerHamburgSpider(Spider):
@@ -19,6 +18,8 @@ class ABCContainerHamburgSpider(Spider):
     start_urls = ["https://abccontainer.de/"]
 
     pdf_url = "https://abccontainer.de/wp-content/uploads/2025-04-Preisliste-Container1.pdf"
+    # Alle Preise stehen im PDF: Vorab-Probe per HEAD (nebi_spiders.preprobe)
+    change_probe = [pdf_url]
 
     # Container-Größen (Spalten-Index in PDF-Tabelle)
     # Index 0=Abfallart, 1=BigBag, 2=1m³, 3=6m³, 4=10m³, 5=14m³, 6=25m³, 7=30m³, 8=LKW
@@ -69,94 +70,94 @@ class ABCContainerHamburgSpider(Spider):
         self.log(f"Starte ABC Container Scraping (PDF wird dynamisch gelesen)")
         self.log(f"{'='*80}\n")
 
+        # PDF über die Scrapy-Engine laden (Retries, Stats, kein Blockieren)
+        self.log(f"📥 Lade PDF: {self.pdf_url}")
+        yield Request(self.pdf_url, callback=self.parse_pdf, errback=self.pdf_failed)
+
+    def pdf_failed(self, failure):
+        self.log(f"❌ Fehler beim PDF-Download: {failure.value}")
+
+    async def parse_pdf(self, response):
         total_products = 0
         cancellation_fee = "101,15"  # Default: 85€ netto = 101,15€ brutto
 
         try:
-            # PDF herunterladen
-            self.log(f"📥 Lade PDF: {self.pdf_url}")
-            pdf_response = requests.get(self.pdf_url, timeout=30)
-            pdf_response.raise_for_status()
-
-            # PDF parsen
-            with pdfplumber.open(io.BytesIO(pdf_response.content)) as pdf:
-                page = pdf.pages[0]
-                tables = page.extract_tables()
-
-                if not tables:
-                    self.log("❌ Keine Tabellen in PDF gefunden")
-                    return
-
-                table = tables[0]
-                self.log(f"✅ Tabelle mit {len(table)} Zeilen gefunden")
-
-                # Fehlfahrt-Preis aus PDF extrahieren
-                text = page.extract_text()
-                if text:
-                    fehlfahrt_match = re.search(r'Fehlfahrten.*?(\d+)[,.\-]\s*€', text)
-                    if fehlfahrt_match:
-                        netto = float(fehlfahrt_match.group(1))
-                        brutto = netto * 1.19
-                        cancellation_fee = f"{brutto:.2f}".replace('.', ',')
-                        self.log(f"📋 Fehlfahrt: {netto}€ netto = {cancellation_fee}€ brutto")
-
-                # Tabelle verarbeiten (Zeilen paarweise: Netto + Brutto)
-                current_waste_type = None
-                i = 0
-
-                while i < len(table):
-                    row = table[i]
-
-                    # Zeile mit Abfallart-Name (erste Spalte nicht None/leer)
-                    if row[0] and str(row[0]).strip():
-                        waste_name_raw = str(row[0]).strip()
-                        # Newlines entfernen, nur erste Zeile nehmen
-                        waste_name_raw = waste_name_raw.split('\n')[0].strip()
-                        current_waste_type = self._standardize_waste_type(waste_name_raw)
-
-                        # Überspringen wenn BigBag-only oder nicht gemappt
-                        if not current_waste_type or self._should_skip(waste_name_raw):
-                            i += 2  # Netto + Brutto überspringen
-                            continue
-
-                        # Nächste Zeile sollte Brutto-Preise haben
-                        if i + 1 < len(table):
-                            brutto_row = table[i + 1]
-
-                            # Brutto-Zeile hat None in erster Spalte
-                            if brutto_row[0] is None or not str(brutto_row[0]).strip():
-                                self.log(f"\n--- {current_waste_type} ---")
-
-                                for col_idx, size in self.size_columns.items():
-                                    if col_idx < len(brutto_row):
-                                        price = self._parse_price(brutto_row[col_idx])
-                                        if price:
-                                            total_products += 1
-                                            self.log(f"  ✓ {size}m³: {price}€")
-
-                                            yield {
-                                                "source": "ABC Container",
-                                                "title": f"{current_waste_type} {size} m³",
-                                                "type": current_waste_type,
-                                                "city": "Hamburg",
-                                                "size": size,
-                                                "price": price,
-                                                "lid_price": None,
-                                                "arrival_price": "inklusive",
-                                                "departure_price": "inklusive",
-                                                "max_rental_period": None,
-                                                "fee_after_max": None,
-                                                "cancellation_fee": cancellation_fee,
-                                                "URL": self.pdf_url
-                                            }
-
-                            i += 2  # Netto + Brutto verarbeitet
-                            continue
-
-                    i += 1
-
-        except requests.RequestException as e:
-            self.log(f"❌ Fehler beim PDF-Download: {e}")
+            # Layout-Analyse im Worker-Prozess (Preistabelle nur auf Seite 1)
+            pages = await extract_pages(response, pages=[1], text=True)
+            tables = pages[0]["tables"]
+
+            if not tables:
+                self.log("❌ Keine Tabellen in PDF gefunden")
+                return
+
+            table = tables[0]
+            self.log(f"✅ Tabelle mit {len(table)} Zeilen gefunden")
+
+            # Fehlfahrt-Preis aus PDF extrahieren
+            text = pages[0]["text"]
+            if text:
+                fehlfahrt_match = re.search(r'Fehlfahrten.*?(\d+)[,.\-]\s*€', text)
+                if fehlfahrt_match:
+                    netto = float(fehlfahrt_match.group(1))
+                    brutto = netto * 1.19
+                    cancellation_fee = f"{brutto:.2f}".replace('.', ',')
+                    self.log(f"📋 Fehlfahrt: {netto}€ netto = {cancellation_fee}€ brutto")
+
+            # Tabelle verarbeiten (Zeilen paarweise: Netto + Brutto)
+            current_waste_type = None
+            i = 0
+
+            while i < len(table):
+                row = table[i]
+
+                # Zeile mit Abfallart-Name (erste Spalte nicht None/leer)
+                if row[0] and str(row[0]).strip():
+                    waste_name_raw = str(row[0]).strip()
+                    # Newlines entfernen, nur erste Zeile nehmen
+                    waste_name_raw = waste_name_raw.split('\n')[0].strip()
+                    current_waste_type = self._standardize_waste_type(waste_name_raw)
+
+                    # Überspringen wenn BigBag-only oder nicht gemappt
+                    if not current_waste_type or self._should_skip(waste_name_raw):
+                        i += 2  # Netto + Brutto überspringen
+                        continue
+
+                    # Nächste Zeile sollte Brutto-Preise haben
+                    if i + 1 < len(table):
+                        brutto_row = table[i + 1]
+
+                        # Brutto-Zeile hat None in erster Spalte
+                        if brutto_row[0] is None or not str(brutto_row[0]).strip():
+                            self.log(f"\n--- {current_waste_type} ---")
+
+                            for col_idx, size in self.size_columns.items():
+                                if col_idx < len(brutto_row):
+                                    price = self._parse_price(brutto_row[col_idx])
+                                    if price:
+                                        total_products += 1
+                                        self.log(f"  ✓ {size}m³: {price}€")
+
+                                        yield {
+                                            "source": "ABC Container",
+                                            "title": f"{current_waste_type} {size} m³",
+                                            "type": current_waste_type,
+                                            "city": "Hamburg",
+                                            "size": size,
+                                            "price": price,
+                                            "lid_price": None,
+                                            "arrival_price": "inklusive",
+                                            "departure_price": "inklusive",
+                                            "max_rental_period": None,
+                                            "fee_after_max": None,
+                                            "cancellation_fee": cancellation_fee,
+                                            "URL": self.pdf_url
+                                        }
+
+                        i += 2  # Netto + Brutto verarbeitet
+                        continue
+
+                i += 1
+
         except Exception as e:
             self.log(f"❌ Fehler beim PDF-Parsing: {e}")
 
@@ -10,8 +10,9 @@ from time import sleep
 
 from scrapy import Spider
 
-from selenium import webdriver
-from selenium.webdriver.common.by import By
+from nebi_spiders.browser import BROWSER_SPIDER_SETTINGS, By, create_driver
+from nebi_spiders.plzgrid import PlzGrid
+from nebi_spiders.structured import candidates_by_size
 from selenium.common.exceptions import StaleElementReferenceException, NoSuchElementException
 
 
@@ -30,17 +31,17 @@ class BuhckUmweltservicesSpider(Spider):
         ("erdaushub-sw10046", "Boden"),
     ]
 
+    # Weitere PLZ (Altstadt, Harburg, Rahlstedt, Blankenese) - nur abweichende Preise werden ausgegeben;
+    # nur Stadtgebiet, die Items laufen unter city "Hamburg"
+    plz_grid = ["20095", "21073", "22143", "22587"]
+
+    custom_settings = BROWSER_SPIDER_SETTINGS
+
     def __init__(self):
         logging.getLogger("selenium").setLevel(logging.WARNING)
         logging.getLogger("urllib3").setLevel(logging.WARNING)
 
-        options = webdriver.ChromeOptions()
-        options.add_argument('--headless')
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument('--disable-gpu')
-        options.add_argument('--window-size=1920,1080')
-        self.driver = webdriver.Chrome(options=options)
+        self.driver = create_driver()
 
         self.seen_products = set()
         self.plz = "22549"  # Zentrale Hamburg PLZ
@@ -58,28 +59,32 @@ class BuhckUmweltservicesSpider(Spider):
 
         total_products = 0
 
-        for product_slug, waste_type in self.waste_categories:
-            self.log(f"\n--- Verarbeite: {waste_type} ---")
-
-            try:
-                products = self._scrape_product_page(product_slug, waste_type)
-
-                for product in products:
-                    product_key = f"{product['type']}|{product['size']}"
-                    if product_key not in self.seen_products:
-                        self.seen_products.add(product_key)
-                        total_products += 1
-                        self.log(f"  ✓ {product['size']}m³: {product['price']}€")
-                        yield product
-
-            except Exception as e:
-                self.log(f"  ❌ Fehler bei {waste_type}: {e}")
-                continue
+        # Haupt-PLZ, danach weitere PLZ des Rasters (nebi_spiders.plzgrid)
+        for product in PlzGrid.from_spider(self).run():
+            product_key = f"{product.get('plz', self.plz)}|{product['type']}|{product['size']}"
+            if product_key not in self.seen_products:
+                self.seen_products.add(product_key)
+                total_products += 1
+                self.log(f"  ✓ {product['size']}m³: {product['price']}€")
+                yield product
 
         self.log(f"\n{'='*80}")
         self.log(f"✓ Gesamt gescrapt: {total_products} Produkte")
         self.log(f"{'='*80}\n")
 
+    def plz_cells(self):
+        return self.waste_categories
+
+    def scrape_cell(self, cell):
+        """Produkte einer Abfallart; die PLZ wird auf jeder Produktseite eingegeben."""
+        product_slug, waste_type = cell
+        self.log(f"\n--- Verarbeite: {waste_type} (PLZ {self.plz}) ---")
+        try:
+            return self._scrape_product_page(product_slug, waste_type)
+        except Exception as e:
+            self.log(f"  ❌ Fehler bei {waste_type}: {e}")
+            return []
+
     def _scrape_product_page(self, product_slug, waste_type):
         """Scrapt alle Container-Größen für eine Abfallart."""
         products = []
@@ -88,12 +93,17 @@ class BuhckUmweltservicesSpider(Spider):
         self.driver.get(url)
         sleep(3)
 
-        # Cookie-Banner entfernen
+        # Cookie-Banner entfernen - nur aus dem DOM, keine Zustimmung und damit
+        # kein Consent-Profil: der Banner erscheint auf jeder Seite neu
         self._dismiss_cookie_banner()
 
         # PLZ eingeben
         self._enter_plz()
 
+        # Strukturierte Daten der Seite: Größen, die dort schon mit Preis
+        # stehen, müssen nicht angeklickt werden
+        structured_sizes = candidates_by_size(self.driver.page_source)
+
         # Dropdown öffnen und Optionen sammeln
         size_options = self._get_size_options()
 
@@ -103,6 +113,10 @@ class BuhckUmweltservicesSpider(Spider):
 
         # Für jede Größe den Preis extrahieren
         for size, data_value in size_options:
+            if size in structured_sizes:
+                products.append(self._product(waste_type, size, structured_sizes[size]["price"], url))
+                continue
+
             try:
                 # Option auswählen
                 self.driver.execute_script(f'''
@@ -111,26 +125,11 @@ class BuhckUmweltservicesSpider(Spider):
                 ''')
                 sleep(1)
 
-                # Preis aus JSON-LD extrahieren
-                price = self._extract_price_from_jsonld()
+                # Preis aus JSON-LD extrahieren, sonst aus der Anzeige
+                price = self._extract_price_from_jsonld(size) or self._extract_price_from_dom()
 
                 if price:
-                    product = {
-                        "source": "Buhck Umweltservices",
-                        "title": f"{waste_type} {size} m³",
-                        "type": waste_type,
-                        "city": "Hamburg",
-                        "size": size,
-                        "price": price,
-                        "lid_price": None,
-                        "arrival_price": "inklusive",
-                        "departure_price": "inklusive",
-                        "max_rental_period": "5",
-                        "fee_after_max": "3,57",
-                        "cancellation_fee": None,
-                        "URL": url
-                    }
-                    products.append(product)
+                    products.append(self._product(waste_type, size, price, url))
 
                 # Dropdown wieder öffnen
                 self._open_dropdown()
@@ -143,6 +142,23 @@ class BuhckUmweltservicesSpider(Spider):
 
         return products
 
+    def _product(self, waste_type, size, price, url):
+        return {
+            "source": "Buhck Umweltservices",
+            "title": f"{waste_type} {size} m³",
+            "type": waste_type,
+            "city": "Hamburg",
+            "size": size,
+            "price": price,
+            "lid_price": None,
+            "arrival_price": "inklusive",
+            "departure_price": "inklusive",
+            "max_rental_period": "5",
+            "fee_after_max": "3,57",
+            "cancellation_fee": None,
+            "URL": url
+        }
+
     def _dismiss_cookie_banner(self):
         """Entfernt Cookie-Banner."""
         try:
@@ -211,23 +227,19 @@ class BuhckUmweltservicesSpider(Spider):
 
         return options
 
-    def _extract_price_from_jsonld(self):
-        """Extrahiert Preis aus JSON-LD Daten."""
+    def _extract_price_from_jsonld(self, size):
+        """Preis dieser Größe aus JSON-LD/Microdata (None, wenn keine Variante passt)."""
         try:
-            scripts = self.driver.find_elements(By.CSS_SELECTOR, "script[type='application/ld+json']")
-
-            for script in scripts:
-                content = script.get_attribute('innerHTML')
-                if 'price' in content.lower():
-                    # Preis finden (z.B. "price": 373.07 oder "price": "373.07")
-                    price_match = re.search(r'"price"[:\s]+"?([\d.]+)"?', content)
-                    if price_match:
-                        price = price_match.group(1)
-                        # In deutsches Format konvertieren (373.07 -> 373,07)
-                        price_de = price.replace('.', ',')
-                        return price_de
-
+            candidate = candidates_by_size(self.driver.page_source).get(size)
+        except Exception:
             return None
+        return candidate["price"] if candidate else None
 
-        except Exception as e:
+    def _extract_price_from_dom(self):
+        """Angezeigter Preis der gewählten Variante (z.B. "1.209,50 €*" → "1209,50")."""
+        try:
+            text = self.driver.find_element(By.CSS_SELECTOR, ".product-detail-price").text
+        except NoSuchElementException:
             return None
+        match = re.search(r"\d{1,3}(?:\.\d{3})*,\d{2}", text)
+        return match.group(0).replace(".", "") if match else None
@@ -11,10 +11,7 @@ from time import sleep
 from scrapy import Spider
 from scrapy.selector import Selector
 
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+from nebi_spiders.browser import BROWSER_SPIDER_SETTINGS, By, EC, WebDriverWait, create_driver, render
 
 
 class EggersContainerSpider(Spider):
@@ -44,17 +41,13 @@ class EggersContainerSpider(Spider):
         ("styropor-daemmung-eps", "Styropor"),
     ]
 
+    custom_settings = BROWSER_SPIDER_SETTINGS
+
     def __init__(self):
         logging.getLogger("selenium").setLevel(logging.WARNING)
         logging.getLogger("urllib3").setLevel(logging.WARNING)
 
-        options = webdriver.ChromeOptions()
-        options.add_argument('--headless')
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument('--disable-gpu')
-        options.add_argument('--window-size=1920,1080')
-        self.driver = webdriver.Chrome(options=options)
+        self.driver = create_driver()
 
         # Set zur Vermeidung von Duplikaten
         self.seen_products = set()
@@ -77,14 +70,11 @@ class EggersContainerSpider(Spider):
             self.log(f"\n--- Verarbeite: {waste_type} ---")
 
             try:
-                self.driver.get(category_url)
-                sleep(3)
-
-                # Cookie-Banner schließen
-                self._dismiss_cookie_banner()
+                # Seite laden und Cookie-Banner schließen (Snapshot ggf. aus dem Cache)
+                page_source = render(self, category_url, wait=3, prepare=self._dismiss_cookie_banner)
 
                 # Produkte auf der Kategorieseite finden
-                products = self._extract_products_from_category(waste_type, category_url)
+                products = self._extract_products_from_category(waste_type, category_url, page_source)
 
                 for product in products:
                     # Duplikat-Check
@@ -124,14 +114,11 @@ class EggersContainerSpider(Spider):
         except:
             pass
 
-    def _extract_products_from_category(self, waste_type, category_url):
+    def _extract_products_from_category(self, waste_type, category_url, page_source):
         """Extrahiert alle Produkte von einer Kategorieseite via Google Analytics JSON."""
         products = []
         import json
 
-        # HTML Quellcode holen
-        page_source = self.driver.page_source
-
         # Suche nach Google Analytics view_item_list Event mit Produktdaten
         # Format: gtag('event', 'view_item_list', {"currency": 'EUR',"items": [...]})
         ga_pattern = re.search(
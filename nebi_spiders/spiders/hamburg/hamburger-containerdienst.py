@@ -10,8 +10,7 @@ from time import sleep
 
 from scrapy import Spider
 
-from selenium import webdriver
-from selenium.webdriver.common.by import By
+from nebi_spiders.browser import BROWSER_SPIDER_SETTINGS, By, create_driver
 from selenium.common.exceptions import StaleElementReferenceException
 
 
@@ -42,17 +41,13 @@ class HamburgerContainerdienstSpider(Spider):
     # Container-Größen zum Testen
     container_sizes = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 12, 15, 18, 20]
 
+    custom_settings = BROWSER_SPIDER_SETTINGS
+
     def __init__(self):
         logging.getLogger("selenium").setLevel(logging.WARNING)
         logging.getLogger("urllib3").setLevel(logging.WARNING)
 
-        options = webdriver.ChromeOptions()
-        options.add_argument('--headless')
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument('--disable-gpu')
-        options.add_argument('--window-size=1920,1080')
-        self.driver = webdriver.Chrome(options=options)
+        self.driver = create_driver()
 
         self.seen_products = set()
         self.transport_price = "172,55"
@@ -77,7 +72,8 @@ class HamburgerContainerdienstSpider(Spider):
             sleep(3)
 
             # Cookie-Banner schließen
-            self._dismiss_cookie_banner()
+            if self.driver.needs_consent() and self._dismiss_cookie_banner():
+                self.driver.consent_given()
 
             # Extrahiere Transport-Kosten und Stellzeit
             self._extract_fixed_info()
@@ -172,11 +168,12 @@ class HamburgerContainerdienstSpider(Spider):
                 try:
                     self.driver.execute_script("arguments[0].click();", btn)
                     sleep(1)
-                    return
+                    return True
                 except:
                     pass
         except:
             pass
+        return False
 
     def _extract_fixed_info(self):
         """Extrahiert Transport-Kosten und Stellzeit von der Seite."""
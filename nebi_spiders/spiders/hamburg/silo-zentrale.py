@@ -5,12 +5,11 @@ PDF-Preisliste wird dynamisch gelesen und geparst.
 Quelle: https://www.silozentrale.de/_files/ugd/f9c410_463ed3eac61e484fb93a5c889f54e077.pdf
 """
 
-import io
 import re
-import requests
-import pdfplumber
 
-from scrapy import Spider
+from scrapy import Spider, Request
+
+from nebi_spiders.pdf import extract_pages
 
 
 class SiloZentraleSpider(Spider):
@@ -19,6 +18,8 @@ class SiloZentraleSpider(Spider):
     start_urls = ["https://www.silozentrale.de/"]
 
     pdf_url = "https://www.silozentrale.de/_files/ugd/f9c410_463ed3eac61e484fb93a5c889f54e077.pdf"
+    # Alle Preise stehen im PDF: Vorab-Probe per HEAD (nebi_spiders.preprobe)
+    change_probe = [pdf_url]
 
     # Container-Größen (Spalten-Index in PDF-Tabelle)
     # Index: 2=3m³, 3=5m³, 4=7m³, 5=8m³, 6=10m³, 7=21m³, 8=25m³, 9=30m³
@@ -47,103 +48,103 @@ class SiloZentraleSpider(Spider):
         self.log(f"Starte Silo-Zentrale Scraping (PDF wird dynamisch gelesen)")
         self.log(f"{'='*80}\n")
 
+        # PDF über die Scrapy-Engine laden (Retries, Stats, kein Blockieren)
+        self.log(f"📥 Lade PDF: {self.pdf_url}")
+        yield Request(self.pdf_url, callback=self.parse_pdf, errback=self.pdf_failed)
+
+    def pdf_failed(self, failure):
+        self.log(f"❌ Fehler beim PDF-Download: {failure.value}")
+
+    async def parse_pdf(self, response):
         total_products = 0
         seen_products = set()  # Duplikat-Prüfung
 
         try:
-            # PDF herunterladen
-            self.log(f"📥 Lade PDF: {self.pdf_url}")
-            pdf_response = requests.get(self.pdf_url, timeout=30)
-            pdf_response.raise_for_status()
+            # Layout-Analyse im Worker-Prozess (Preistabelle nur auf Seite 1)
+            pages = await extract_pages(response, pages=[1])
+            tables = pages[0]["tables"]
 
-            # PDF parsen
-            with pdfplumber.open(io.BytesIO(pdf_response.content)) as pdf:
-                page = pdf.pages[0]
-                tables = page.extract_tables()
+            if not tables:
+                self.log("❌ Keine Tabellen in PDF gefunden")
+                return
 
-                if not tables:
-                    self.log("❌ Keine Tabellen in PDF gefunden")
-                    return
+            table = tables[0]
+            self.log(f"✅ Tabelle mit {len(table)} Zeilen gefunden")
 
-                table = tables[0]
-                self.log(f"✅ Tabelle mit {len(table)} Zeilen gefunden")
+            # Tabelle verarbeiten (ab Zeile 1, Zeile 0 ist Header)
+            current_category = None
 
-                # Tabelle verarbeiten (ab Zeile 1, Zeile 0 ist Header)
-                current_category = None
+            for row_idx, row in enumerate(table[1:], start=1):
+                if not row or len(row) < 10:
+                    continue
 
-                for row_idx, row in enumerate(table[1:], start=1):
-                    if not row or len(row) < 10:
-                        continue
+                category = row[0] if row[0] else current_category
+                subcategory = row[1] if row[1] else ""
 
-                    category = row[0] if row[0] else current_category
-                    subcategory = row[1] if row[1] else ""
+                # Kategorie merken für leere Zeilen
+                if row[0]:
+                    current_category = row[0]
 
-                    # Kategorie merken für leere Zeilen
-                    if row[0]:
-                        current_category = row[0]
+                # Überspringen wenn Boden/Tonnage-basiert
+                if self._should_skip(category, subcategory):
+                    continue
 
-                    # Überspringen wenn Boden/Tonnage-basiert
-                    if self._should_skip(category, subcategory):
-                        continue
+                # Multi-line Zellen verarbeiten
+                subcategories = subcategory.split('\n') if subcategory else [""]
 
-                    # Multi-line Zellen verarbeiten
-                    subcategories = subcategory.split('\n') if subcategory else [""]
+                # Preise pro Spalte extrahieren (können auch multi-line sein)
+                prices_per_column = {}
+                for col_idx, size in self.size_columns.items():
+                    if col_idx < len(row) and row[col_idx]:
+                        cell_prices = str(row[col_idx]).split('\n')
+                        prices_per_column[col_idx] = cell_prices
 
-                    # Preise pro Spalte extrahieren (können auch multi-line sein)
-                    prices_per_column = {}
-                    for col_idx, size in self.size_columns.items():
-                        if col_idx < len(row) and row[col_idx]:
-                            cell_prices = str(row[col_idx]).split('\n')
-                            prices_per_column[col_idx] = cell_prices
+                # Für jede Subcategory die Preise zuordnen
+                for sub_idx, subcat in enumerate(subcategories):
+                    if not subcat.strip():
+                        continue
 
-                    # Für jede Subcategory die Preise zuordnen
-                    for sub_idx, subcat in enumerate(subcategories):
-                        if not subcat.strip():
-                            continue
+                    waste_type = self._build_waste_type(category, subcat)
+                    if not waste_type:
+                        continue
 
-                        waste_type = self._build_waste_type(category, subcat)
-                        if not waste_type:
+                    self.log(f"\n--- {waste_type} ---")
+
+                    for col_idx, size in self.size_columns.items():
+                        if col_idx not in prices_per_column:
                             continue
 
-                        self.log(f"\n--- {waste_type} ---")
+                        cell_prices = prices_per_column[col_idx]
+                        # Wähle den richtigen Preis für diese Subcategory
+                        price_idx = min(sub_idx, len(cell_prices) - 1)
+                        price = self._parse_price(cell_prices[price_idx])
 
-                        for col_idx, size in self.size_columns.items():
-                            if col_idx not in prices_per_column:
+                        if price:
+                            # Duplikat-Prüfung
+                            product_key = f"{waste_type}|{size}"
+                            if product_key in seen_products:
                                 continue
+                            seen_products.add(product_key)
+
+                            total_products += 1
+                            self.log(f"  ✓ {size}m³: {price}€")
+
+                            yield {
+                                "source": "Silo-Zentrale",
+                                "title": f"{waste_type} {size} m³",
+                                "type": waste_type,
+                                "city": "Hamburg",
+                                "size": size,
+                                "price": price,
+                                "lid_price": None,
+                                "arrival_price": "inklusive",
+                                "departure_price": "inklusive",
+                                "max_rental_period": "28",
+                                "fee_after_max": "3,57",
+                                "cancellation_fee": "119,00",
+                                "URL": self.pdf_url
+                            }
 
-                            cell_prices = prices_per_column[col_idx]
-                            # Wähle den richtigen Preis für diese Subcategory
-                            price_idx = min(sub_idx, len(cell_prices) - 1)
-                            price = self._parse_price(cell_prices[price_idx])
-
-                            if price:
-                                # Duplikat-Prüfung
-                                product_key = f"{waste_type}|{size}"
-                                if product_key in seen_products:
-                                    continue
-                                seen_products.add(product_key)
-
-                                total_products += 1
-                                self.log(f"  ✓ {size}m³: {price}€")
-
-                                yield {
-                                    "source": "Silo-Zentrale",
-                                    "title": f"{waste_type} {size} m³",
-                                    "type": waste_type,
-                                    "city": "Hamburg",
-                                    "size": size,
-                                    "price": price,
-                                    "lid_price": None,
-                                    "arrival_price": "inklusive",
-                                    "departure_price": "inklusive",
-                                    "max_rental_period": "28",
-                                    "fee_after_max": "3,57",
-                                    "cancellation_fee": "119,00",
-                                    "URL": self.pdf_url
-                                }
-
-        except requests.RequestException as e:
-            self.log(f"❌ Fehler beim PDF-Download: {e}")
         except Exception as e:
             self.log(f"❌ Fehler beim PDF-Parsing: {e}")
             import traceback
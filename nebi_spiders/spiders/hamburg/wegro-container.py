@@ -11,10 +11,7 @@ from time import sleep
 from scrapy import Spider
 from scrapy.selector import Selector
 
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+from nebi_spiders.browser import BROWSER_SPIDER_SETTINGS, By, EC, WebDriverWait, create_driver
 
 
 class WegroContainerSpider(Spider):
@@ -40,17 +37,13 @@ class WegroContainerSpider(Spider):
         # ("eisenschrott-metalle", "Schrott"),  # Entfernt - meist kostenlos/Ankauf
     ]
 
+    custom_settings = BROWSER_SPIDER_SETTINGS
+
     def __init__(self):
         logging.getLogger("selenium").setLevel(logging.WARNING)
         logging.getLogger("urllib3").setLevel(logging.WARNING)
 
-        options = webdriver.ChromeOptions()
-        options.add_argument('--headless')
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument('--disable-gpu')
-        options.add_argument('--window-size=1920,1080')
-        self.driver = webdriver.Chrome(options=options)
+        self.driver = create_driver()
 
         self.seen_products = set()
 
@@ -76,7 +69,8 @@ class WegroContainerSpider(Spider):
                 sleep(3)
 
                 # Cookie-Banner schließen
-                self._dismiss_cookie_banner()
+                if self.driver.needs_consent() and self._dismiss_cookie_banner():
+                    self.driver.consent_given()
 
                 # Produkte extrahieren
                 products = self._extract_products(waste_type, category_url)
@@ -109,11 +103,12 @@ class WegroContainerSpider(Spider):
                     if btn.is_displayed():
                         btn.click()
                         sleep(1)
-                        return
+                        return True
                 except:
                     pass
         except:
             pass
+        return False
 
     def _extract_products(self, waste_type, category_url):
         """Extrahiert alle Produkte von einer Kategorieseite via PHP-Debug-Dumps."""
@@ -10,8 +10,7 @@ from time import sleep
 
 from scrapy import Spider
 
-from selenium import webdriver
-from selenium.webdriver.common.by import By
+from nebi_spiders.browser import BROWSER_SPIDER_SETTINGS, By, create_driver
 
 
 class DibaEntsorgungSpider(Spider):
@@ -33,20 +32,15 @@ class DibaEntsorgungSpider(Spider):
     # Container-Größen (ohne BigBag/Mülltasche)
     container_sizes = ["1 cbm", "5 cbm", "7 cbm", "10 cbm", "19 cbm", "36 cbm"]
 
+    custom_settings = BROWSER_SPIDER_SETTINGS
+
     def __init__(self):
         logging.getLogger("selenium").setLevel(logging.WARNING)
         logging.getLogger("urllib3").setLevel(logging.WARNING)
 
-        options = webdriver.ChromeOptions()
-        options.add_argument('--headless')
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument('--disable-gpu')
-        options.add_argument('--window-size=1920,1080')
-        self.driver = webdriver.Chrome(options=options)
+        self.driver = create_driver()
 
         self.seen_products = set()
-        self.cookies_accepted = False
 
     def closed(self, reason):
         try:
@@ -75,9 +69,8 @@ class DibaEntsorgungSpider(Spider):
                         sleep(3)
 
                         # Cookie-Banner akzeptieren (nur einmal)
-                        if not self.cookies_accepted:
-                            self._accept_cookies()
-                            self.cookies_accepted = True
+                        if self.driver.needs_consent() and self._accept_cookies():
+                            self.driver.consent_given()
 
                         # Dropdown öffnen
                         if not self._open_dropdown():
@@ -7,12 +7,24 @@ Shop: https://www.noris24.de/containeruebersicht/
 import re
 from scrapy import Spider, Request
 
+from nebi_spiders import woocommerce as wc
+from nebi_spiders.offers import format_price
+
 
 class Noris24Spider(Spider):
     name = "noris24"
     allowed_domains = ["noris24.de"]
     start_urls = ["https://www.noris24.de/containeruebersicht/"]
 
+    # Kategorie → Produkt-Fan-out (~100 Seiten): mehr parallele Requests
+    # auf den Shop-Host, AutoThrottle bremst bei steigender Latenz
+    custom_settings = {
+        'DOWNLOAD_SLOTS': {
+            'www.noris24.de': {'concurrency': 6, 'delay': 0.25},
+        },
+        'AUTOTHROTTLE_TARGET_CONCURRENCY': 4.0,
+    }
+
     # 11 Abfallarten (URL-Slug -> Standardisierter Name)
     # Ignoriere: BigBags, Säcke
     waste_categories = [
@@ -113,14 +125,21 @@ class Noris24Spider(Spider):
             if price_meta:
                 # Preis als Zahl, in deutsches Format konvertieren
                 try:
-                    price_val = float(price_meta)
-                    if price_val == int(price_val):
-                        price = f"{int(price_val)},00"
-                    else:
-                        price = f"{price_val:.2f}".replace('.', ',')
+                    price = format_price(price_meta)
                 except ValueError:
                     pass
 
+            if not price:
+                # Fallback: Varianten-JSON (variables Produkt) - nur wenn genau
+                # eine kaufbare Variante diese Größe hat, sonst wäre der Preis
+                # womöglich der einer anderen Größe/Ausführung
+                prices = [
+                    variation["display_price"] for variation in wc.variations(response) or ()
+                    if wc.variation_price(variation) and self._variation_has_size(variation, size)
+                ]
+                if len(prices) == 1:
+                    price = format_price(prices[0])
+
             if not price:
                 # Fallback: Aus Twitter-Meta extrahieren
                 twitter_price = response.css("meta[name='twitter:data1']::attr(content)").get()
@@ -169,3 +188,12 @@ class Noris24Spider(Spider):
 
         except Exception as e:
             self.log(f"  ⚠️ Fehler bei Produkt: {e}")
+
+    @staticmethod
+    def _variation_has_size(variation, size):
+        """Größe in einem Varianten-Attribut, z.B. "10 m³", "10-m3", "1-5-m3" (= 1,5 m³)."""
+        for value in variation.get("attributes", {}).values():
+            match = re.search(r'(\d+(?:[,.-]\d+)?)\s*-?\s*(?:m³|m3|cbm)', str(value), re.I)
+            if match and match.group(1).replace(',', '.').replace('-', '.') == size:
+                return True
+        return False
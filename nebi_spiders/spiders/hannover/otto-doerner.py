@@ -10,8 +10,8 @@ from time import sleep
 
 from scrapy import Spider
 
-from selenium import webdriver
-from selenium.webdriver.common.by import By
+from nebi_spiders.browser import BROWSER_SPIDER_SETTINGS, By, create_driver
+from nebi_spiders.selectorchain import selector_chain
 
 
 class OttoDoernerSpider(Spider):
@@ -42,20 +42,15 @@ class OttoDoernerSpider(Spider):
         ("abrollcontainer", "abrollcontainer-fuer", "c", ["10", "20", "25", "35"]),  # 10, 20, 25, 35 m³
     ]
 
+    custom_settings = BROWSER_SPIDER_SETTINGS
+
     def __init__(self):
         logging.getLogger("selenium").setLevel(logging.WARNING)
         logging.getLogger("urllib3").setLevel(logging.WARNING)
 
-        options = webdriver.ChromeOptions()
-        options.add_argument('--headless')
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument('--disable-gpu')
-        options.add_argument('--window-size=1920,1080')
-        self.driver = webdriver.Chrome(options=options)
+        self.driver = create_driver()
 
         self.seen_products = set()
-        self.cookies_accepted = False
 
     def closed(self, reason):
         try:
@@ -81,9 +76,8 @@ class OttoDoernerSpider(Spider):
                 sleep(2)
 
                 # Cookie-Banner akzeptieren (nur einmal)
-                if not self.cookies_accepted:
-                    self._accept_cookies()
-                    self.cookies_accepted = True
+                if self.driver.needs_consent() and self._accept_cookies():
+                    self.driver.consent_given()
 
                 # Finde Produkt-ID aus beliebigem Container-Link
                 product_id = self._find_product_id(url_slug)
@@ -195,36 +189,18 @@ class OttoDoernerSpider(Spider):
     def _get_current_price(self):
         """Extrahiert den aktuell angezeigten Preis."""
         try:
-            price_selectors = [
-                ".product-price",
-                ".price",
-                ".woocommerce-Price-amount",
-                "[class*='price']",
-                "span.amount",
-            ]
-
-            for selector in price_selectors:
-                try:
-                    price_elems = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                    for price_elem in price_elems:
-                        if price_elem.is_displayed():
-                            price_text = price_elem.text.strip()
-                            # Preis extrahieren (auch große Preise wie 1.234,56)
-                            price_match = re.search(r'([\d.]+,\d{2})\s*€?', price_text)
-                            if price_match:
-                                price = price_match.group(1)
-                                # Tausendertrennzeichen entfernen
-                                if '.' in price and ',' in price:
-                                    price = price.replace('.', '')
-                                # Prüfe ob plausibel (> 50€)
-                                try:
-                                    price_val = float(price.replace(',', '.'))
-                                    if price_val > 50:
-                                        return price
-                                except ValueError:
-                                    pass
-                except Exception:
-                    continue
+            # Spezifische Selektoren zuerst (Gewinner wandert nach vorne),
+            # allgemeine nur als Fallback in fester Reihenfolge
+            chain = selector_chain(
+                self,
+                "price",
+                [".product-price", ".woocommerce-Price-amount"],
+                # .price ist so allgemein wie [class*='price'] → nur als Fallback
+                fallbacks=[".price", "[class*='price']", "span.amount"],
+            )
+            price = chain.first(self._displayed_price)
+            if price:
+                return price
 
             # Fallback: Suche im gesamten Text
             body = self.driver.find_element(By.TAG_NAME, "body")
@@ -240,3 +216,23 @@ class OttoDoernerSpider(Spider):
         except Exception:
             pass
         return None
+
+    def _displayed_price(self, selector):
+        """Erster plausibler Preis (> 50€) in einem sichtbaren Element zu selector."""
+        for price_elem in self.driver.find_elements(By.CSS_SELECTOR, selector):
+            if price_elem.is_displayed():
+                price_text = price_elem.text.strip()
+                # Preis extrahieren (auch große Preise wie 1.234,56)
+                price_match = re.search(r'([\d.]+,\d{2})\s*€?', price_text)
+                if price_match:
+                    price = price_match.group(1)
+                    # Tausendertrennzeichen entfernen
+                    if '.' in price and ',' in price:
+                        price = price.replace('.', '')
+                    # Prüfe ob plausibel (> 50€)
+                    try:
+                        if float(price.replace(',', '.')) > 50:
+                            return price
+                    except ValueError:
+                        pass
+        return None
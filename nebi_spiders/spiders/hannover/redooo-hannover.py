@@ -10,8 +10,8 @@ from time import sleep
 
 from scrapy import Spider
 
-from selenium import webdriver
-from selenium.webdriver.common.by import By
+from nebi_spiders.browser import BROWSER_SPIDER_SETTINGS, By, create_driver
+from nebi_spiders.plzgrid import PlzGrid
 
 
 class RedoooHannoverSpider(Spider):
@@ -21,6 +21,9 @@ class RedoooHannoverSpider(Spider):
 
     # PLZ für Hannover (Stadtzentrum)
     plz = "30159"
+    # Weitere PLZ (Stöcken, Döhren, Misburg, Wettbergen) - nur abweichende Preise werden ausgegeben;
+    # nur Stadtgebiet, die Items laufen unter city "Hannover"
+    plz_grid = ["30419", "30519", "30627", "30457"]
 
     # 9 Müllarten (Website-Name -> Standardisierter Name)
     waste_categories = [
@@ -35,17 +38,14 @@ class RedoooHannoverSpider(Spider):
         ("Sperrmüll", "Sperrmüll"),
     ]
 
+    custom_settings = BROWSER_SPIDER_SETTINGS
+
     def __init__(self):
         logging.getLogger("selenium").setLevel(logging.WARNING)
         logging.getLogger("urllib3").setLevel(logging.WARNING)
 
-        options = webdriver.ChromeOptions()
-        options.add_argument('--headless')
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument('--disable-gpu')
-        options.add_argument('--window-size=1920,1080')
-        self.driver = webdriver.Chrome(options=options)
+        # Nach einem Browser-Neustart (Watchdog) Cookies + PLZ neu einrichten
+        self.driver = create_driver(setup=self._setup_session)
 
         self.seen_products = set()
 
@@ -62,64 +62,70 @@ class RedoooHannoverSpider(Spider):
 
         total_products = 0
 
-        # Setup: Go to start page, accept cookies, enter PLZ
-        if not self._setup_session():
-            self.log("❌ Session setup fehlgeschlagen")
-            return
-
-        # Für jede Abfallart
-        for website_name, waste_type in self.waste_categories:
-            self.log(f"\n--- Verarbeite: {waste_type} ---")
-
-            try:
-                # Use back navigation if we're on containerart
-                if '/containerart' in self.driver.current_url:
-                    self.driver.back()
-                    sleep(3)
-
-                # If not on abfallart, restart session
-                if '/abfallart' not in self.driver.current_url:
-                    self.log(f"  ⚠️ Nicht auf Abfallart-Seite, neu einrichten...")
-                    self._setup_session()
-
-                # Select waste type
-                if not self._select_waste_type(website_name):
-                    self.log(f"  ⚠️ Konnte {website_name} nicht auswählen")
-                    continue
-
-                sleep(1)
-
-                # Click weiter to go to containerart
-                if not self._click_weiter():
-                    self.log(f"  ⚠️ Konnte nicht zu Container-Seite navigieren")
-                    continue
-
-                sleep(4)
-
-                # Check if we're on containerart page
-                if '/containerart' not in self.driver.current_url:
-                    self.log(f"  ⚠️ Nicht auf Container-Seite")
-                    continue
-
-                # Extract container prices
-                products = self._extract_containers(waste_type)
-
-                for product in products:
-                    product_key = f"{product['type']}|{product['size']}"
-                    if product_key not in self.seen_products:
-                        self.seen_products.add(product_key)
-                        total_products += 1
-                        self.log(f"  ✓ {product['size']}m³: {product['price']}€")
-                        yield product
-
-            except Exception as e:
-                self.log(f"  ❌ Fehler bei {waste_type}: {e}")
-                continue
+        # Haupt-PLZ, danach weitere PLZ des Rasters (nebi_spiders.plzgrid)
+        for product in PlzGrid.from_spider(self).run():
+            product_key = f"{product.get('plz', self.plz)}|{product['type']}|{product['size']}"
+            if product_key not in self.seen_products:
+                self.seen_products.add(product_key)
+                total_products += 1
+                self.log(f"  ✓ {product['size']}m³: {product['price']}€")
+                yield product
 
         self.log(f"\n{'='*80}")
         self.log(f"✓ Gesamt gescrapt: {total_products} Produkte")
         self.log(f"{'='*80}\n")
 
+    def enter_plz(self):
+        return self._setup_session()
+
+    def plz_cells(self):
+        return self.waste_categories
+
+    def scrape_cell(self, cell):
+        """Produkte einer Abfallart (für die PLZ der aktuellen Session)."""
+        website_name, waste_type = cell
+        self.log(f"\n--- Verarbeite: {waste_type} (PLZ {self.plz}) ---")
+
+        try:
+            # Abgestürzten/zu großen Browser zwischen zwei Abfallarten ersetzen
+            self.driver.maybe_recycle(check=True)
+
+            # Use back navigation if we're on containerart
+            if '/containerart' in self.driver.current_url:
+                self.driver.back()
+                sleep(3)
+
+            # If not on abfallart, restart session
+            if '/abfallart' not in self.driver.current_url:
+                self.log(f"  ⚠️ Nicht auf Abfallart-Seite, neu einrichten...")
+                self._setup_session()
+
+            # Select waste type
+            if not self._select_waste_type(website_name):
+                self.log(f"  ⚠️ Konnte {website_name} nicht auswählen")
+                return []
+
+            sleep(1)
+
+            # Click weiter to go to containerart
+            if not self._click_weiter():
+                self.log(f"  ⚠️ Konnte nicht zu Container-Seite navigieren")
+                return []
+
+            sleep(4)
+
+            # Check if we're on containerart page
+            if '/containerart' not in self.driver.current_url:
+                self.log(f"  ⚠️ Nicht auf Container-Seite")
+                return []
+
+            # Extract container prices
+            return self._extract_containers(waste_type)
+
+        except Exception as e:
+            self.log(f"  ❌ Fehler bei {waste_type}: {e}")
+            return []
+
     def _setup_session(self):
         """Initialisiert Session mit Cookies und PLZ."""
         try:
@@ -127,7 +133,8 @@ class RedoooHannoverSpider(Spider):
             sleep(5)
 
             # Accept cookies
-            self._accept_cookies()
+            if self.driver.needs_consent() and self._accept_cookies():
+                self.driver.consent_given()
 
             # Enter PLZ
             try:
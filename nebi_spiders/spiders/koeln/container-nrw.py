@@ -4,9 +4,10 @@ Extrahiert Preise für Container-Entsorgung in Köln
 Shop: http://www.containernrw.de/container_koeln_rechts.html
 """
 
-import re
 from scrapy import Spider
 
+from nebi_spiders.textscan import TextScanner, paragraph_texts
+
 
 class ContainerNrwSpider(Spider):
     name = "container-nrw"
@@ -29,6 +30,14 @@ class ContainerNrwSpider(Spider):
         (r'Erde\s*\+\s*Steine', "Erde + Steine"),
     ]
 
+    # Alle Muster in einem regulären Ausdruck; Überschriften enthalten nie Größe/Preis
+    scanner = TextScanner(
+        waste_types_ordered,
+        size=r'(\d+)\s*cbm\*?',
+        price=r'([\d.]+,00)\s*€?',
+        header_excludes=r'cbm|€',
+    )
+
     def parse(self, response):
         self.log(f"\n{'='*80}")
         self.log(f"Starte Container NRW Scraping (Köln)")
@@ -40,83 +49,38 @@ class ContainerNrwSpider(Spider):
         products = []
         seen_products = set()
 
-        # Alle Paragraphen extrahieren (behält Reihenfolge)
-        all_paragraphs = response.css("p")
-
-        # Text aus allen Paragraphen sammeln
-        texts = []
-        for p in all_paragraphs:
-            text = ' '.join(p.css("*::text").getall()).strip()
-            text = re.sub(r'\s+', ' ', text)
-            if text:
-                texts.append(text)
-
-        # Finde Abfallarten und ihre Positionen
-        waste_positions = []
-        for i, text in enumerate(texts):
-            for pattern, waste_type in self.waste_types_ordered:
-                if re.search(pattern, text, re.I):
-                    # Prüfe ob es nicht Teil einer Preis/Größen-Zeile ist
-                    if 'cbm' not in text.lower() and '€' not in text:
-                        waste_positions.append((i, waste_type))
-                        break
-
-        # Für jede gefundene Abfallart, extrahiere Preise bis zur nächsten Abfallart
-        for idx, (pos, waste_type) in enumerate(waste_positions):
-            self.log(f"\n--- Verarbeite: {waste_type} ---")
-
-            # Ende-Position bestimmen (nächste Abfallart oder Ende)
-            end_pos = waste_positions[idx + 1][0] if idx + 1 < len(waste_positions) else len(texts)
-
-            # Extrahiere Größen und Preise zwischen pos und end_pos
-            pending_size = None
-
-            for text in texts[pos:end_pos]:
-                # Größe finden (ignoriere 4 cbm)
-                size_match = re.match(r'^(\d+)\s*cbm\*?$', text.strip(), re.I)
-                if size_match:
-                    size = size_match.group(1)
-                    if size != "4":  # 4 cbm nur für Langenfeld etc.
-                        pending_size = size
-                    continue
-
-                # Preis finden (Brutto = endet auf ,00)
-                price_match = re.match(r'^([\d.]+,00)\s*€?$', text.strip())
-                if price_match and pending_size:
-                    price = price_match.group(1)
-
-                    # Tausender-Trennzeichen entfernen
-                    if '.' in price and ',' in price:
-                        price = price.replace('.', '')
-
-                    price_val = float(price.replace(',', '.'))
-
-                    # Plausibilitätscheck (> 200€)
-                    if price_val >= 200:
-                        product_key = f"{waste_type}|{pending_size}"
-
-                        if product_key not in seen_products:
-                            seen_products.add(product_key)
-
-                            product = {
-                                "source": "Container NRW",
-                                "title": f"{waste_type} {pending_size} m³",
-                                "type": waste_type,
-                                "city": "Köln",
-                                "size": pending_size,
-                                "price": price,
-                                "lid_price": "nur wenn vorrätig",
-                                "arrival_price": "inklusive",
-                                "departure_price": "inklusive",
-                                "max_rental_period": standzeit,
-                                "fee_after_max": fee_after_max,
-                                "cancellation_fee": None,
-                                "URL": response.url
-                            }
-                            products.append(product)
-                            self.log(f"  ✓ {pending_size}m³: {price}€")
-
-                    pending_size = None
+        # Ein Durchlauf über alle Absätze: Überschrift → Größe → Preis
+        # (4 cbm nur für Langenfeld etc.)
+        for waste_type, size, price in self.scanner.scan(paragraph_texts(response), ignore_sizes=("4",)):
+            # Tausender-Trennzeichen entfernen
+            if '.' in price and ',' in price:
+                price = price.replace('.', '')
+
+            # Plausibilitätscheck (> 200€)
+            if float(price.replace(',', '.')) < 200:
+                continue
+
+            product_key = f"{waste_type}|{size}"
+            if product_key in seen_products:
+                continue
+            seen_products.add(product_key)
+
+            products.append({
+                "source": "Container NRW",
+                "title": f"{waste_type} {size} m³",
+                "type": waste_type,
+                "city": "Köln",
+                "size": size,
+                "price": price,
+                "lid_price": "nur wenn vorrätig",
+                "arrival_price": "inklusive",
+                "departure_price": "inklusive",
+                "max_rental_period": standzeit,
+                "fee_after_max": fee_after_max,
+                "cancellation_fee": None,
+                "URL": response.url
+            })
+            self.log(f"  ✓ {waste_type} {size}m³: {price}€")
 
         # Produkte ausgeben
         for product in products:
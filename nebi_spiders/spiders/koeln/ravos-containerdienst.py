@@ -10,10 +10,8 @@ from time import sleep
 
 from scrapy import Spider
 
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+from nebi_spiders.browser import BROWSER_SPIDER_SETTINGS, By, EC, WebDriverWait, create_driver
+from nebi_spiders.selectorchain import selector_chain
 from selenium.common.exceptions import NoSuchElementException, TimeoutException
 
 
@@ -33,17 +31,13 @@ class RavosContainerdienstSpider(Spider):
 
     faq_url = "https://ravos.de/faq/"
 
+    custom_settings = BROWSER_SPIDER_SETTINGS
+
     def __init__(self):
         logging.getLogger("selenium").setLevel(logging.WARNING)
         logging.getLogger("urllib3").setLevel(logging.WARNING)
 
-        options = webdriver.ChromeOptions()
-        options.add_argument('--headless')
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument('--disable-gpu')
-        options.add_argument('--window-size=1920,1080')
-        self.driver = webdriver.Chrome(options=options)
+        self.driver = create_driver()
 
         self.seen_products = set()
         # Default-Werte (werden dynamisch überschrieben)
@@ -129,7 +123,8 @@ class RavosContainerdienstSpider(Spider):
         sleep(2)
 
         # Cookie-Banner entfernen falls vorhanden
-        self._dismiss_cookie_banner()
+        if self.driver.needs_consent() and self._dismiss_cookie_banner():
+            self.driver.consent_given()
 
         # Dropdown für Container-Größen finden
         try:
@@ -270,61 +265,68 @@ class RavosContainerdienstSpider(Spider):
                     btn = self.driver.find_element(By.CSS_SELECTOR, selector)
                     btn.click()
                     sleep(0.5)
-                    return
+                    return True
                 except NoSuchElementException:
                     continue
 
         except Exception:
             pass
+        return False
 
     def _extract_price(self):
         """Extrahiert den aktuellen Preis aus der Seite."""
         try:
-            # WooCommerce Preis-Elemente
-            price_selectors = [
-                ".woocommerce-variation-price .amount",
-                ".price .amount",
-                ".woocommerce-Price-amount",
-                "span.price",
-                ".summary .price .amount",
-            ]
-
-            for selector in price_selectors:
-                try:
-                    price_elem = self.driver.find_element(By.CSS_SELECTOR, selector)
-                    price_text = price_elem.text.strip()
-
-                    if price_text:
-                        # Bereinige Preis
-                        price_clean = re.sub(r'[^\d,\.]', '', price_text)
-
-                        if not price_clean:
-                            continue
-
-                        # Konvertiere zu deutschem Format
-                        if ',' in price_clean and '.' in price_clean:
-                            # Gemischt: bestimme Dezimaltrenner
-                            if price_clean.rfind(',') > price_clean.rfind('.'):
-                                # Deutsch: 1.234,56
-                                price_clean = price_clean.replace('.', '')
-                            else:
-                                # Englisch: 1,234.56
-                                price_clean = price_clean.replace(',', '').replace('.', ',')
-                        elif '.' in price_clean:
-                            # Nur Punkt - zu Komma konvertieren
-                            parts = price_clean.split('.')
-                            if len(parts) == 2 and len(parts[1]) == 2:
-                                price_clean = price_clean.replace('.', ',')
-                            else:
-                                price_clean = price_clean.replace('.', '')
-
-                        if price_clean and price_clean != "0":
-                            return price_clean
+            # WooCommerce Preis-Elemente: der Variationspreis ist der gesuchte,
+            # die übrigen treffen auch Preisspannen und bleiben Fallback
+            chain = selector_chain(
+                self,
+                "price",
+                [".woocommerce-variation-price .amount"],
+                fallbacks=[
+                    ".price .amount",
+                    ".woocommerce-Price-amount",
+                    "span.price",
+                    ".summary .price .amount",
+                ],
+            )
+            return chain.first(self._price_from_element)
 
-                except NoSuchElementException:
-                    continue
+        except Exception as e:
+            return None
 
+    def _price_from_element(self, selector):
+        """Preis im deutschen Format aus dem ersten Element zu selector."""
+        try:
+            price_elem = self.driver.find_element(By.CSS_SELECTOR, selector)
+        except NoSuchElementException:
+            return None
+        price_text = price_elem.text.strip()
+        if not price_text:
             return None
 
-        except Exception as e:
+        # Bereinige Preis
+        price_clean = re.sub(r'[^\d,\.]', '', price_text)
+
+        if not price_clean:
             return None
+
+        # Konvertiere zu deutschem Format
+        if ',' in price_clean and '.' in price_clean:
+            # Gemischt: bestimme Dezimaltrenner
+            if price_clean.rfind(',') > price_clean.rfind('.'):
+                # Deutsch: 1.234,56
+                price_clean = price_clean.replace('.', '')
+            else:
+                # Englisch: 1,234.56
+                price_clean = price_clean.replace(',', '').replace('.', ',')
+        elif '.' in price_clean:
+            # Nur Punkt - zu Komma konvertieren
+            parts = price_clean.split('.')
+            if len(parts) == 2 and len(parts[1]) == 2:
+                price_clean = price_clean.replace('.', ',')
+            else:
+                price_clean = price_clean.replace('.', '')
+
+        if price_clean and price_clean != "0":
+            return price_clean
+        return None
@@ -0,0 +1,193 @@
+"""
+Strukturierte Daten (schema.org JSON-LD und Microdata) als Angebots-Kandidaten.
+
+Viele Shops liefern Product/Offer/AggregateOffer-Daten für Suchmaschinen
+mit - oft mit allen Varianten (hasVariant, AggregateOffer.offers).
+offer_candidates() liest alle Blöcke einer Seite einmal und gibt pro
+Angebot ein Dict zurück; Spider fragen zuerst hier nach und fallen nur
+für fehlende Größen auf DOM-Scraping bzw. Browser-Klicks zurück.
+
+    from nebi_spiders.structured import offer_candidates
+
+    candidates = offer_candidates(response)            # Scrapy-Response
+    candidates = offer_candidates(driver.page_source)  # oder HTML-Text
+
+Kandidat:
+    {"name": "Container 7 cbm", "size": "7", "price": "373,07",
+     "currency": "EUR", "sku": "SW10044.3", "url": "...", "available": True}
+
+size wird aus Name/SKU/Beschreibung gelesen ("7 m³", "7 cbm"), price
+ist im Shop-Format wie in den Items.
+"""
+
+import json
+import re
+import weakref
+
+from scrapy.http import Response
+from scrapy.selector import Selector
+
+from nebi_spiders.offers import format_price, parse_price
+
+_SIZE_RE = re.compile(r"(\d+(?:[.,]\d+)?)\s*(?:m³|m3|cbm|kubik)", re.IGNORECASE)
+_decoder = json.JSONDecoder()
+
+# Pro Response nur einmal parsen, auch wenn mehrere Stellen fragen
+_cache = weakref.WeakKeyDictionary()
+
+
+def _json_documents(text):
+    """Alle JSON-Dokumente eines Script-Blocks (manche Shops hängen mehrere an)."""
+    position, length = 0, len(text)
+    while position < length:
+        while position < length and text[position] in " \t\r\n;,":
+            position += 1
+        if position >= length:
+            return
+        try:
+            document, position = _decoder.raw_decode(text, position)
+        except ValueError:
+            return
+        yield document
+
+
+def _nodes(document):
+    """Flacht @graph und Listen zu einzelnen Knoten ab."""
+    if isinstance(document, list):
+        for entry in document:
+            yield from _nodes(entry)
+    elif isinstance(document, dict):
+        if "@graph" in document:
+            yield from _nodes(document["@graph"])
+        else:
+            yield document
+
+
+def _types(node):
+    value = node.get("@type", ())
+    types = [value] if isinstance(value, str) else value
+    return {str(t).rsplit("/", 1)[-1] for t in types}
+
+
+def _as_list(value):
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+def _size(*texts):
+    for text in texts:
+        match = _SIZE_RE.search(str(text or ""))
+        if match:
+            return match.group(1).replace(",", ".")
+    return None
+
+
+def _price(value):
+    """373.07, "373.07", "1.209,00 €" (Microdata-Text) → Shop-Format."""
+    cents = parse_price(value)
+    return None if cents is None else format_price(cents / 100)
+
+
+def _offer_candidates(product, offer, inherited_name=None):
+    """Offer bzw. AggregateOffer eines Produkts → Kandidaten."""
+    types = _types(offer)
+    name = product.get("name") or inherited_name
+    sku = offer.get("sku") or product.get("sku")
+
+    if "AggregateOffer" in types and offer.get("offers"):
+        for sub_offer in _as_list(offer["offers"]):
+            if isinstance(sub_offer, dict):
+                yield from _offer_candidates(product, sub_offer, name)
+        return
+
+    price = _price(offer.get("price"))
+    if price is None:
+        # AggregateOffer ohne Einzelangebote: günstigster Preis
+        price = _price(offer.get("lowPrice"))
+    if price is None:
+        spec = offer.get("priceSpecification")
+        spec = spec[0] if isinstance(spec, list) and spec else spec
+        if isinstance(spec, dict):
+            price = _price(spec.get("price"))
+    if price is None:
+        return
+
+    offer_name = offer.get("name")
+    yield {
+        "name": offer_name or name,
+        "size": _size(offer_name, name, sku, product.get("description")),
+        "price": price,
+        "currency": offer.get("priceCurrency"),
+        "sku": sku,
+        "url": offer.get("url") or product.get("url"),
+        "available": "OutOfStock" not in str(offer.get("availability", "")),
+    }
+
+
+def _product_candidates(node):
+    types = _types(node)
+    if "ProductGroup" in types or "hasVariant" in node:
+        for variant in _as_list(node.get("hasVariant")):
+            if isinstance(variant, dict):
+                yield from _product_candidates(variant)
+    if "Product" in types or "ProductGroup" in types:
+        for offer in _as_list(node.get("offers")):
+            if isinstance(offer, dict):
+                yield from _offer_candidates(node, offer)
+
+
+def _microdata_candidates(selector):
+    for product in selector.xpath('//*[@itemscope][contains(@itemtype, "schema.org/Product")]'):
+        name = product.xpath('normalize-space(.//*[@itemprop="name"][1]/@content | .//*[@itemprop="name"][1])').get()
+        for offer in product.xpath('.//*[@itemscope][contains(@itemtype, "schema.org/Offer")]'):
+            price = _price(
+                offer.xpath('(.//*[@itemprop="price"]/@content)[1]').get()
+                or offer.xpath('normalize-space((.//*[@itemprop="price"])[1])').get()
+            )
+            if price is None:
+                continue
+            offer_name = offer.xpath('normalize-space(.//*[@itemprop="name"][1]/@content | .//*[@itemprop="name"][1])').get()
+            sku = offer.xpath('(.//*[@itemprop="sku"]/@content)[1]').get()
+            yield {
+                "name": offer_name or name,
+                "size": _size(offer_name, name, sku),
+                "price": price,
+                "currency": offer.xpath('(.//*[@itemprop="priceCurrency"]/@content)[1]').get(),
+                "sku": sku,
+                "url": offer.xpath('(.//*[@itemprop="url"]/@href | .//*[@itemprop="url"]/@content)[1]').get(),
+                "available": "OutOfStock" not in (offer.xpath('(.//*[@itemprop="availability"]/@href | .//*[@itemprop="availability"]/@content)[1]').get() or ""),
+            }
+
+
+def offer_candidates(source):
+    """Alle Angebote aus JSON-LD und Microdata einer Seite (Response oder HTML)."""
+    if isinstance(source, Response):
+        if source in _cache:
+            return _cache[source]
+        selector = source.selector
+    else:
+        selector = Selector(text=source)
+
+    candidates = []
+    for block in selector.xpath('//script[@type="application/ld+json"]/text()').getall():
+        for document in _json_documents(block):
+            for node in _nodes(document):
+                candidates.extend(_product_candidates(node))
+    candidates.extend(_microdata_candidates(selector))
+
+    if isinstance(source, Response):
+        _cache[source] = candidates
+    return candidates
+
+
+def candidates_by_size(source):
+    """{Größe: Kandidat} - pro Größe der günstigste verfügbare Kandidat."""
+    by_size = {}
+    for candidate in offer_candidates(source):
+        if candidate["size"] is None or not candidate["available"]:
+            continue
+        best = by_size.get(candidate["size"])
+        if best is None or float(candidate["price"].replace(",", ".")) < float(best["price"].replace(",", ".")):
+            by_size[candidate["size"]] = candidate
+    return by_size
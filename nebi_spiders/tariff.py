@@ -0,0 +1,157 @@
+"""
+Tarif-Quellen: Anbieter mit fester Preisliste (aser-container, kroll-container).
+
+Statt die Preise im Spider-Code zu pflegen und eine Startseite nur zum
+Auslösen von parse() zu laden, liegt die Preisliste als YAML-Datei in
+nebi_spiders/tariffs/. TariffSpider erzeugt daraus die Angebote ohne
+Netzwerk-Request.
+
+Ein einzelner Probe-Request auf die Preisseite des Shops prüft, ob sich
+die Preise dort geändert haben: Fingerprint der preisrelevanten Texte
+(bzw. des PDFs) gegen den hinterlegten Wert. Weicht er ab, meldet der
+Spider "Tarif vermutlich veraltet" (Stat tariff/stale), die Angebote
+werden trotzdem ausgegeben.
+
+Aufbau einer Tarif-Datei:
+
+    source: Kroll Entsorgung
+    city: Berlin
+    url: https://...            # URL-Feld der Items
+    vat: 0.19                   # Preise netto → brutto
+    title: "{size} m³ {type}"
+    probe:
+      url: https://...          # Preisseite
+      fingerprint: null         # null: erster beobachteter Wert gilt
+    fields: {...}               # übrige Item-Felder
+    size_fields: {3: {...}}     # Abweichungen pro Größe
+    rows:
+      - {type: Bauschutt, flat: {3: 206.00, 5.5: 375.00}}    # Pauschale
+      - {type: Dämmstoffe, per_m3: {3: 125.00, 7: 125.00}}   # Preis pro m³
+    rows_csv: kroll.csv         # optional, Spalten: type,size,flat,per_m3
+
+Ist kein Fingerprint hinterlegt, wird der erste beobachtete Wert unter
+.scrapy/tariffs/<spider>.probe gespeichert und künftig verglichen.
+"""
+
+import csv
+import hashlib
+import logging
+import pathlib
+import re
+
+import yaml
+from scrapy import Request, Spider
+from scrapy.utils.project import data_path
+
+TARIFF_DIR = pathlib.Path(__file__).resolve().parent / "tariffs"
+
+# Preisrelevante Texte: alles mit Ziffern (Preise, Größen, Datumsangaben)
+_PRICE_TEXT_RE = re.compile(r"\d")
+_SPACE_RE = re.compile(r"\s+")
+
+logger = logging.getLogger(__name__)
+
+
+def load_tariff(name):
+    path = TARIFF_DIR / name
+    tariff = yaml.safe_load(path.read_text(encoding="utf-8"))
+    rows = list(tariff.get("rows") or [])
+    if tariff.get("rows_csv"):
+        with (TARIFF_DIR / tariff["rows_csv"]).open(encoding="utf-8", newline="") as f:
+            for line in csv.DictReader(f):
+                kind = "flat" if line.get("flat") else "per_m3"
+                rows.append({"type": line["type"], kind: {float(line["size"]): float(line[kind])}})
+    tariff["rows"] = rows
+    return tariff
+
+
+def expand_tariff(tariff):
+    """Alle Angebote (Item-Dicts) einer Preisliste."""
+    factor = 1 + tariff.get("vat", 0)
+    size_fields = tariff.get("size_fields") or {}
+    for row in tariff["rows"]:
+        prices = {}
+        for size, price in (row.get("flat") or {}).items():
+            prices[size] = price
+        for size, price_per_m3 in (row.get("per_m3") or {}).items():
+            prices[size] = price_per_m3 * size
+
+        for size, price_net in prices.items():
+            size_text = f"{size:g}"
+            price = round(price_net * factor, 2)
+            yield {
+                "source": tariff["source"],
+                "title": tariff["title"].format(size=size_text, type=row["type"]),
+                "type": row["type"],
+                "city": tariff["city"],
+                "size": size_text,
+                "price": f"{price:.2f}".replace(".", ","),
+                **(tariff.get("fields") or {}),
+                **(size_fields.get(size) or {}),
+                "URL": tariff["url"],
+            }
+
+
+def page_fingerprint(response):
+    """Fingerprint der Preisseite: Texte mit Ziffern (HTML) bzw. die Datei selbst (PDF)."""
+    if b"html" in response.headers.get("Content-Type", b"").lower():
+        texts = (
+            _SPACE_RE.sub(" ", text).strip()
+            for text in response.xpath("//body//text()[not(ancestor::script) and not(ancestor::style)]").getall()
+        )
+        data = "\n".join(text for text in texts if _PRICE_TEXT_RE.search(text)).encode("utf-8")
+    else:
+        data = response.body
+    return hashlib.blake2b(data, digest_size=8).hexdigest()
+
+
+class TariffSpider(Spider):
+    """Basis für Anbieter mit fester Preisliste: tariff = Dateiname in nebi_spiders/tariffs/."""
+
+    tariff = None
+    # Preise ändern sich nur mit der Tarif-Datei: im Laufplan (nebi_spiders.schedule) selten
+    schedule_prior = 0.02
+
+    async def start(self):
+        tariff = load_tariff(self.tariff)
+        total_products = 0
+        for product in expand_tariff(tariff):
+            total_products += 1
+            yield product
+        self.logger.info(f"✓ {total_products} Angebote aus Tarif {self.tariff}")
+
+        probe = tariff.get("probe") or {}
+        if probe.get("url") and self.settings.getbool("TARIFF_PROBE_ENABLED", True):
+            yield Request(
+                probe["url"],
+                callback=self.parse_probe,
+                errback=self.probe_failed,
+                cb_kwargs={"expected": probe.get("fingerprint")},
+                dont_filter=True,
+            )
+
+    def parse_probe(self, response, expected):
+        stats = self.crawler.stats
+        observed = page_fingerprint(response)
+        stats.set_value("tariff/fingerprint", observed)
+
+        baseline_path = pathlib.Path(data_path("tariffs", createdir=True)) / f"{self.name}.probe"
+        if expected is None:
+            try:
+                expected = baseline_path.read_text(encoding="utf-8").strip()
+            except FileNotFoundError:
+                # Erster Lauf ohne hinterlegten Fingerprint: aktuellen Stand merken
+                baseline_path.write_text(observed, encoding="utf-8")
+                self.logger.info(f"🧾 Tarif-Fingerprint gespeichert: {observed}")
+                return
+
+        if observed != expected:
+            stats.set_value("tariff/stale", 1)
+            self.logger.warning(
+                f"⚠️ Tarif {self.tariff} vermutlich veraltet: Preisseite {response.url} "
+                f"hat sich geändert (Fingerprint {observed}, erwartet {expected})"
+            )
+
+    def probe_failed(self, failure):
+        self.crawler.stats.inc_value("tariff/probe_failed")
+        self.logger.warning(f"⚠️ Tarif-Probe fehlgeschlagen: {failure.value}")
@@ -0,0 +1,94 @@
+"""
+Text-Scanner für Preisseiten, die Abfallart, Größe und Preis als Folge
+einzelner Absätze auflisten (container-nrw):
+
+    <p>Bauschutt sauber</p> <p>7 cbm</p> <p>290,00 €</p> <p>10 cbm</p> ...
+
+Alle Abfallart-Muster, das Größen- und das Preis-Muster werden zu EINEM
+regulären Ausdruck kompiliert. Jeder Absatz wird mit einem einzigen
+match()-Aufruf klassifiziert (statt je Absatz alle Muster nacheinander),
+scan() liefert in einem Durchlauf (Abfallart, Größe, Preis)-Tupel.
+
+    scanner = TextScanner(
+        types=[(r"Bauschutt\\s*sauber", "Bauschutt sauber"), ...],
+        size=r"(\\d+)\\s*cbm\\*?",
+        price=r"([\\d.]+,00)\\s*€?",
+        header_excludes=r"cbm|€",
+    )
+    for waste_type, size, price in scanner.scan(paragraph_texts(response)):
+        ...
+
+Bei Absätzen, auf die mehrere Abfallart-Muster passen, gewinnt wie
+bisher das erste Muster der Liste.
+"""
+
+import re
+
+_SPACE_RE = re.compile(r"\s+")
+
+
+def paragraph_texts(response, tag="p"):
+    """Text jedes <p> (Leerraum zusammengefasst), leere Absätze entfallen."""
+    texts = []
+    for element in response.selector.root.iter(tag):
+        text = _SPACE_RE.sub(" ", " ".join(element.itertext())).strip()
+        if text:
+            texts.append(text)
+    return texts
+
+
+class TextScanner:
+    """
+    types:            [(Muster, Abfallart), ...] - re.search-Semantik, ^ = Absatzanfang
+    size, price:      Muster für einen ganzen Absatz, Gruppe 1 = Wert
+    header_excludes:  Absätze mit diesem Muster sind nie Abfallart-Überschriften
+    """
+
+    def __init__(self, types, size, price, header_excludes=None, flags=re.IGNORECASE):
+        self.type_names = [name for _, name in types]
+        # Überschrift: jedes Muster als Lookahead ab Absatzanfang, damit bei
+        # mehreren Treffern das erste Muster der Liste gewinnt (nicht der früheste Treffer)
+        exclude = f"(?!.*?(?:{header_excludes}))" if header_excludes else ""
+        headers = "|".join(f"(?=.*?(?:{pattern}))(?P<t{i}>)" for i, (pattern, _) in enumerate(types))
+        self.pattern = re.compile(
+            rf"(?:(?P<size_block>{size})$)"
+            rf"|(?:(?P<price_block>{price})$)"
+            rf"|{exclude}(?:{headers})",
+            flags,
+        )
+        self._size_group = self.pattern.groupindex["size_block"] + 1
+        self._price_group = self.pattern.groupindex["price_block"] + 1
+
+    def classify(self, text):
+        """("type", Abfallart) | ("size", Wert) | ("price", Wert) | None"""
+        match = self.pattern.match(text)
+        if match is None:
+            return None
+        kind = match.lastgroup
+        if kind == "size_block":
+            return "size", match.group(self._size_group)
+        if kind == "price_block":
+            return "price", match.group(self._price_group)
+        return "type", self.type_names[int(kind[1:])]
+
+    def scan(self, texts, ignore_sizes=()):
+        """
+        (Abfallart, Größe, Preis) in einem Durchlauf: ein Preis gehört zur
+        zuletzt gesehenen Größe unter der letzten Überschrift.
+        """
+        waste_type = pending_size = None
+        for text in texts:
+            token = self.classify(text)
+            if token is None:
+                continue
+            kind, value = token
+            if kind == "type":
+                waste_type, pending_size = value, None
+            elif kind == "size":
+                if value not in ignore_sizes:
+                    pending_size = value
+            elif waste_type is not None and pending_size is not None:
+                yield waste_type, pending_size, value
+                pending_size = None
+            else:
+                pending_size = None
@@ -0,0 +1,109 @@
+"""
+WooCommerce-Hilfsfunktionen für Shops mit variablen Produkten
+(kreuz-containerdienst, noris24).
+
+Variable Produkte (z.B. ein Produkt pro Abfallart, Größe als Auswahl)
+bringen alle Varianten samt Preis im Attribut data-product_variations von
+form.variations_form mit. Ein normaler HTTP-Request liefert damit alle
+Größen auf einmal - kein Browser, kein Durchklicken der Auswahlfelder.
+
+Ab 30 Varianten lässt WooCommerce das Attribut leer ("false") und lädt
+jede Variante per wc-ajax=get_variation nach; dafür gibt es
+variation_request().
+
+Verwendung im Spider:
+
+    from nebi_spiders import woocommerce as wc
+
+    variations = wc.variations(response)
+    for value, label in wc.attribute_options(response, "pa_containergroesse"):
+        variation = wc.find_variation(variations, pa_containergroesse=value)
+        price = wc.variation_price(variation)
+"""
+
+import json
+from urllib.parse import urlsplit
+
+from scrapy import FormRequest
+
+from nebi_spiders.offers import format_price
+
+
+def variations(response):
+    """
+    Alle Varianten aus data-product_variations (Liste von Dicts).
+
+    None, wenn die Seite kein variables Produkt ist oder WooCommerce die
+    Varianten nur per AJAX ausliefert.
+    """
+    data = response.css("form.variations_form::attr(data-product_variations)").get()
+    if not data:
+        return None
+    try:
+        result = json.loads(data)
+    except ValueError:
+        return None
+    return result if isinstance(result, list) else None
+
+
+def product_id(response):
+    return (
+        response.css("form.variations_form::attr(data-product_id)").get()
+        or response.css("input[name='product_id']::attr(value)").get()
+        or response.css("button[name='add-to-cart']::attr(value)").get()
+    )
+
+
+def attribute_options(response, attribute):
+    """(Wert, Beschriftung) aller Optionen eines Auswahlfelds, ohne Platzhalter."""
+    options = []
+    for option in response.css(f"select#{attribute} option, select[name='attribute_{attribute}'] option"):
+        value = option.attrib.get("value", "").strip()
+        if value and value not in (v for v, _ in options):
+            # Beschriftung mit verschachtelten Tags: "10 <span>m³</span>" → "10 m³"
+            options.append((value, " ".join("".join(option.css("::text").getall()).split())))
+    return options
+
+
+def find_variation(variations, **attributes):
+    """
+    Variante mit den gewünschten Attributen (ohne Präfix "attribute_").
+
+    Ein leerer Wert in der Variante bedeutet "beliebig". Attribute, die
+    das Produkt nicht hat, werden ignoriert (z.B. Deckel-Auswahl).
+    """
+    for variation in variations or ():
+        variation_attributes = variation.get("attributes", {})
+        if all(
+            variation_attributes.get(f"attribute_{name}", "") in ("", value)
+            for name, value in attributes.items()
+            if f"attribute_{name}" in variation_attributes
+        ):
+            return variation
+    return None
+
+
+def variation_price(variation):
+    """Preis einer Variante im Shop-Format ("449,00"), None wenn nicht kaufbar."""
+    if not variation or not variation.get("is_purchasable", True) or variation.get("display_price") in (None, ""):
+        return None
+    return format_price(variation["display_price"])
+
+
+def variation_request(response, attributes, callback, **kwargs):
+    """
+    POST auf ?wc-ajax=get_variation für eine Attribut-Kombination.
+
+    Die Antwort ist die Variante als JSON (oder false); im Callback mit
+    json.loads(response.text) lesen.
+    """
+    parts = urlsplit(response.url)
+    formdata = {f"attribute_{name}": value for name, value in attributes.items()}
+    formdata["product_id"] = product_id(response) or ""
+    return FormRequest(
+        f"{parts.scheme}://{parts.netloc}/?wc-ajax=get_variation",
+        formdata=formdata,
+        callback=callback,
+        dont_filter=True,
+        **kwargs,
+    )
@@ -0,0 +1,78 @@
+import importlib
+
+import pytest
+from scrapy.utils.test import get_crawler
+
+from nebi_spiders.checkpoint import Checkpoint
+
+ores = importlib.import_module("nebi_spiders.spiders.berlin.ores-container")
+
+WASTE_URL, WASTE_TYPE = ores.OresContainerProductsSpider.waste_type_urls[0]
+PRODUCTS = ["https://containerentsorgung-berlin.de/p/3", "https://containerentsorgung-berlin.de/p/7"]
+
+
+class Driver:
+    def get(self, url):
+        pass
+
+    def needs_consent(self):
+        return False
+
+
+def ores_spider(tmp_path, prices):
+    crawler = get_crawler(ores.OresContainerProductsSpider, {"JOBDIR": str(tmp_path)})
+    spider = ores.OresContainerProductsSpider.__new__(ores.OresContainerProductsSpider)
+    spider._set_crawler(crawler)
+    spider.driver = Driver()
+    spider.max_rental_period = "6"
+    spider.waste_type_urls = [(WASTE_URL, WASTE_TYPE)]
+    spider._extract_rental_period_from_agb = lambda: None
+    spider._find_product_links = lambda: list(PRODUCTS)
+
+    def extract(product_url, waste_type):
+        price = prices.get(product_url)
+        # Wie _extract_product: None, wenn Größe oder Preis fehlt
+        return {"type": waste_type, "size": product_url[-1], "price": price, "lid_price": ""} if price else None
+
+    spider._extract_product = extract
+    return spider
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    monkeypatch.setattr(ores, "sleep", lambda seconds: None)
+
+
+def test_ores_product_without_price_is_retried(tmp_path):
+    spider = ores_spider(tmp_path, {PRODUCTS[0]: "342,99"})
+    assert [item["size"] for item in spider.parse(None)] == ["3"]
+
+    checkpoint = spider.checkpoint
+    assert checkpoint.failed == 1
+    assert checkpoint.done((WASTE_TYPE, PRODUCTS[0]))
+    assert not checkpoint.done((WASTE_TYPE, PRODUCTS[1]))
+    assert not checkpoint.done((WASTE_TYPE,))
+
+    checkpoint.spider_closed(spider, "finished")
+    assert checkpoint.path.exists()
+
+    # Neustart: fertiges Produkt aus dem Checkpoint, fehlendes neu laden
+    resumed = ores_spider(tmp_path, {PRODUCTS[0]: "0,00", PRODUCTS[1]: "489,99"})
+    assert [(item["size"], item["price"]) for item in resumed.parse(None)] == [("3", "342,99"), ("7", "489,99")]
+    assert resumed.checkpoint.failed == 0
+    assert resumed.checkpoint.done((WASTE_TYPE,))
+
+
+def test_finished_run_removes_checkpoint(tmp_path):
+    checkpoint = Checkpoint(tmp_path / "shop.cells.jsonl")
+    checkpoint.mark_done(("Bauschutt", "7"), [{"price": "290,00"}])
+    checkpoint.mark_done(("Bauschutt", "10"), [])
+
+    reloaded = Checkpoint(checkpoint.path)
+    assert reloaded.items(("Bauschutt", "7")) == [{"price": "290,00"}]
+    assert reloaded.done(("Bauschutt", "10"))
+    assert reloaded.items(("Bauschutt", "10")) == []
+
+    spider = ores_spider(tmp_path, {})
+    checkpoint.spider_closed(spider, "finished")
+    assert not checkpoint.path.exists()
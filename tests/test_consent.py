@@ -0,0 +1,32 @@
+from nebi_spiders.consent import ConsentSession, ConsentStore
+
+
+class Driver:
+    def __init__(self, url):
+        self.current_url = url
+        self.commands = []
+
+    def execute_cdp_cmd(self, command, params):
+        self.commands.append(command)
+
+
+def test_banner_is_retried_until_consent_given(tmp_path):
+    session = ConsentSession(ConsentStore(tmp_path / "profiles.json"))
+    # Fehlgeschlagener Klick: nächste Seite desselben Hosts versucht es erneut
+    assert session.needs_consent("https://www.shop.example/a")
+    assert session.needs_consent("https://shop.example/b")
+
+    session.consent_given("https://shop.example/b")
+    assert not session.needs_consent("https://www.shop.example/c")
+    assert session.needs_consent("https://other.example/")
+
+
+def test_injected_profile_skips_banner(tmp_path):
+    store = ConsentStore(tmp_path / "profiles.json")
+    store.save("shop.example", [{"name": "borlabs-cookie", "value": "1", "domain": ".shop.example"}], {})
+    session = ConsentSession(store)
+    driver = Driver("about:blank")
+
+    session.before_navigation(driver, "https://www.shop.example/")
+    assert driver.commands == ["Network.setCookies"]
+    assert not session.needs_consent("https://www.shop.example/")
@@ -0,0 +1,136 @@
+from types import SimpleNamespace
+
+import pytest
+from scrapy import Request
+from scrapy.http import HtmlResponse, XmlResponse
+from twisted.python.failure import Failure
+
+from nebi_spiders.discovery import Discovery, UrlIndex
+
+SHOP = "https://shop.example"
+
+
+class Stats:
+    def __init__(self):
+        self.values = {}
+
+    def inc_value(self, key, count=1):
+        self.values[key] = self.values.get(key, 0) + count
+
+    def set_value(self, key, value):
+        self.values[key] = value
+
+
+class Spider:
+    name = "shop"
+
+    def __init__(self):
+        self.crawler = SimpleNamespace(stats=Stats())
+
+    def parse(self, response):
+        pass
+
+
+def sitemap(*locs, index=False):
+    tag, entry = ("sitemapindex", "sitemap") if index else ("urlset", "url")
+    entries = "".join(f"<{entry}><loc>{loc}</loc></{entry}>" for loc in locs)
+    return f'<?xml version="1.0" encoding="UTF-8"?><{tag} xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{entries}</{tag}>'
+
+
+def respond(request, body):
+    response = XmlResponse(request.url, body=body.encode("utf-8"), request=request)
+    return request.callback(response, **request.cb_kwargs)
+
+
+def fail(request):
+    failure = Failure(ConnectionError("refused"))
+    failure.request = request
+    return request.errback(failure)
+
+
+def urls(results):
+    return [result.url for result in results if isinstance(result, Request)]
+
+
+@pytest.fixture
+def make_discovery(tmp_path):
+    def make(**options):
+        spider = Spider()
+        index = UrlIndex(tmp_path / "shop.json")
+        options.setdefault("follow", r"/produkt/")
+        return Discovery(spider, index, **options)
+    return make
+
+
+def test_partial_sitemap_index_uses_found_urls_without_fallback(make_discovery):
+    discovery = make_discovery(sitemaps=[f"{SHOP}/sitemap.xml"], fallback=[f"{SHOP}/produkt/alt"])
+    [root] = discovery.start_requests()
+
+    children = list(respond(root, sitemap(f"{SHOP}/sitemap-1.xml", f"{SHOP}/sitemap-2.xml", index=True)))
+    assert urls(children) == [f"{SHOP}/sitemap-1.xml", f"{SHOP}/sitemap-2.xml"]
+
+    # Zweite Teil-Sitemap nicht erreichbar: gefundene URLs reichen, kein Fallback
+    found = list(respond(children[0], sitemap(f"{SHOP}/produkt/a", f"{SHOP}/kontakt", f"{SHOP}/produkt/b#top")))
+    assert urls(found) == [f"{SHOP}/produkt/a", f"{SHOP}/produkt/b"]
+    assert list(fail(children[1])) == []
+
+    assert discovery.failed == 1
+    assert "discovery/fallback" not in discovery.spider.crawler.stats.values
+
+
+def test_partial_sitemap_does_not_prune_index(make_discovery, tmp_path):
+    index = UrlIndex(tmp_path / "shop.json")
+    index.touch(f"{SHOP}/produkt/alt")
+    index.save()
+
+    discovery = make_discovery(sitemaps=[f"{SHOP}/sitemap-1.xml", f"{SHOP}/sitemap-2.xml"])
+    first, second = discovery.start_requests()
+    list(respond(first, sitemap(f"{SHOP}/produkt/a")))
+    list(fail(second))
+    discovery.spider_closed(discovery.spider, "finished")
+
+    assert set(UrlIndex(tmp_path / "shop.json").urls) == {f"{SHOP}/produkt/alt", f"{SHOP}/produkt/a"}
+
+
+def test_complete_sitemap_prunes_index(make_discovery, tmp_path):
+    index = UrlIndex(tmp_path / "shop.json")
+    index.touch(f"{SHOP}/produkt/alt")
+    index.save()
+
+    discovery = make_discovery(sitemaps=[f"{SHOP}/sitemap.xml"])
+    [request] = discovery.start_requests()
+    list(respond(request, sitemap(f"{SHOP}/produkt/a")))
+    discovery.spider_closed(discovery.spider, "finished")
+
+    assert set(UrlIndex(tmp_path / "shop.json").urls) == {f"{SHOP}/produkt/a"}
+
+
+def test_fallback_only_after_last_source(make_discovery):
+    discovery = make_discovery(sitemaps=[f"{SHOP}/a.xml", f"{SHOP}/b.xml"], fallback=[f"{SHOP}/produkt/alt"])
+    first, second = discovery.start_requests()
+
+    assert urls(respond(first, sitemap(f"{SHOP}/kontakt"))) == []
+    assert urls(fail(second)) == [f"{SHOP}/produkt/alt"]
+    assert discovery.spider.crawler.stats.values["discovery/fallback"] == 1
+
+
+def test_found_deduplicates(make_discovery):
+    discovery = make_discovery()
+    assert urls(discovery._found(f"{SHOP}/produkt/a")) == [f"{SHOP}/produkt/a"]
+    assert urls(discovery._found(f"{SHOP}/produkt/a#details")) == []
+    assert urls(discovery._found(f"{SHOP}/impressum")) == []
+    assert discovery.seen == {f"{SHOP}/produkt/a"}
+
+
+def test_merge_fallback_adds_missing_urls(make_discovery):
+    discovery = make_discovery(
+        categories=[f"{SHOP}/kategorie"],
+        fallback=[f"{SHOP}/produkt/a", f"{SHOP}/produkt/b", f"{SHOP}/produkt/b"],
+        merge_fallback=True,
+    )
+    [request] = discovery.start_requests()
+    body = '<html><body><a href="/produkt/a">A</a><a href="/produkt/c">C</a></body></html>'
+    response = HtmlResponse(request.url, body=body.encode("utf-8"), request=request)
+
+    assert urls(request.callback(response)) == [f"{SHOP}/produkt/a", f"{SHOP}/produkt/c", f"{SHOP}/produkt/b"]
+    assert discovery.seen == {f"{SHOP}/produkt/a", f"{SHOP}/produkt/c"}
@@ -0,0 +1,7 @@
+from nebi_spiders.importbench import HEAVY_MODULES, HTTP_SPIDERS, probe
+
+
+def test_http_spiders_load_without_heavy_modules():
+    # Zeitbudgets prüft der Workflow-Schritt; hier nur die Lazy-Imports
+    modules = set(probe(HTTP_SPIDERS)["modules"])
+    assert [heavy for heavy in HEAVY_MODULES if heavy in modules] == []
@@ -0,0 +1,121 @@
+import json
+from datetime import date
+
+import pytest
+
+from nebi_spiders.schedule import (
+    DEFAULT_PRIOR,
+    assign_intervals,
+    change_rate,
+    due_spiders,
+    observations,
+)
+
+INTERVALS = [1, 2, 3, 7, 14, 28]
+
+
+def weekly_cost(sources, intervals):
+    return sum(source["cost"] * 7 / intervals[name] for name, source in sources.items())
+
+
+def test_minimal_budget_keeps_longest_interval():
+    sources = {"a": {"rate": 1.0, "cost": 100}, "b": {"rate": 0.01, "cost": 100}}
+    floor = sum(source["cost"] * 7 / 28 for source in sources.values())
+    assigned, used = assign_intervals(sources, floor, INTERVALS)
+    assert assigned == {"a": 28, "b": 28}
+    assert used == pytest.approx(floor)
+
+
+def test_unlimited_budget_runs_everything_daily():
+    sources = {"a": {"rate": 1.0, "cost": 100}, "b": {"rate": 0.01, "cost": 30}}
+    assigned, _ = assign_intervals(sources, float("inf"), INTERVALS)
+    assert assigned == {"a": 1, "b": 1}
+
+
+def test_volatile_source_gets_shorter_interval():
+    sources = {
+        "volatile": {"rate": 0.5, "cost": 100},
+        "static": {"rate": 0.01, "cost": 100},
+    }
+    # Weniger als ein Wochenlauf beider Quellen
+    assigned, used = assign_intervals(sources, 150, INTERVALS)
+    assert assigned["volatile"] < assigned["static"]
+    assert used <= 150
+    assert weekly_cost(sources, assigned) == pytest.approx(used)
+
+
+def test_cheap_source_preferred_at_equal_rate():
+    sources = {
+        "http": {"rate": 0.2, "cost": 10},
+        "browser": {"rate": 0.2, "cost": 300},
+    }
+    assigned, used = assign_intervals(sources, 120, INTERVALS)
+    assert assigned["http"] < assigned["browser"]
+    assert used <= 120
+
+
+def test_intervals_order_does_not_matter():
+    sources = {"a": {"rate": 0.3, "cost": 50}, "b": {"rate": 0.05, "cost": 50}}
+    assert assign_intervals(sources, 100, INTERVALS) == assign_intervals(sources, 100, list(reversed(INTERVALS)))
+
+
+def test_change_rate_smoothing():
+    assert change_rate([]) == pytest.approx(DEFAULT_PRIOR / 7)
+    # 4 Änderungen in 28 Tagen → nahe 1/7 pro Tag
+    observed = [(7, True), (7, False), (7, True), (7, True), (0, True)]
+    assert change_rate(observed, prior=0) == pytest.approx(4 / 35)
+
+
+def record(day, reason="finished", items=10, changed=None):
+    return {"spider": "s", "date": f"2026-03-{day:02d}T06:00:00+00:00", "reason": reason,
+            "items": items, "changed": changed}
+
+
+def test_observations_from_history():
+    records = [
+        record(1, changed=0.0),
+        record(8, changed=0.2),
+        record(15, changed=0.0),
+    ]
+    assert observations([], records) == [(7, True), (7, False)]
+
+
+def test_probe_skip_is_not_an_observation():
+    records = [
+        record(1, changed=0.0),
+        record(8, reason="unverändert", changed=None),
+        record(15, changed=0.1),
+    ]
+    # Der Feed-Vergleich am 15. bezieht sich auf den Lauf vom 1.
+    assert observations([], records) == [(14, True)]
+
+    # Einträge älterer Läufe mit changed 0 für die Probe: Tage nicht doppelt zählen
+    records[1]["changed"] = 0.0
+    assert observations([], records) == [(14, True)]
+
+
+def test_failed_run_does_not_move_comparison_base():
+    records = [
+        record(1, changed=0.0),
+        record(8, reason="shutdown", items=3, changed=None),
+        record(15, changed=0.0),
+    ]
+    assert observations([], records) == [(14, False)]
+
+
+def test_archive_snapshots_before_history():
+    snapshots = [
+        (date(2026, 1, 1), {1, 2}),
+        (date(2026, 2, 1), {1, 2}),
+        (date(2026, 3, 1), {1, 3}),
+        (date(2026, 4, 1), {1, 4}),
+    ]
+    records = [record(1, changed=0.0)]
+    # Nur Archiv-Stände bis zum ersten Eintrag der Lauf-Historie (1. März)
+    assert observations(snapshots, records) == [(31, False), (28, True)]
+
+
+def test_due_spiders(tmp_path):
+    plan = tmp_path / "plan.json"
+    plan.write_text(json.dumps({"spiders": {"a": {"due": True}, "b": {"due": False}}}), encoding="utf-8")
+    assert due_spiders(plan, ["a", "b", "neu"]) == ["a", "neu"]
@@ -0,0 +1,141 @@
+import json
+
+from scrapy.http import HtmlResponse
+
+from nebi_spiders.structured import candidates_by_size, offer_candidates
+
+
+def ld_json(*documents, separator=""):
+    blocks = separator.join(json.dumps(document) for document in documents)
+    return f'<script type="application/ld+json">{blocks}</script>'
+
+
+def page(*parts):
+    return f"<html><head>{''.join(parts)}</head><body></body></html>"
+
+
+def response(html):
+    return HtmlResponse("https://shop.example/produkt", body=html.encode("utf-8"), encoding="utf-8")
+
+
+PRODUCT = {
+    "@context": "https://schema.org",
+    "@type": "Product",
+    "name": "Bauschutt Container 7 cbm",
+    "sku": "SW10044.3",
+    "offers": {
+        "@type": "Offer",
+        "price": "373.07",
+        "priceCurrency": "EUR",
+        "availability": "https://schema.org/InStock",
+    },
+}
+
+
+def test_single_product_offer():
+    [candidate] = offer_candidates(page(ld_json(PRODUCT)))
+    assert candidate == {
+        "name": "Bauschutt Container 7 cbm",
+        "size": "7",
+        "price": "373,07",
+        "currency": "EUR",
+        "sku": "SW10044.3",
+        "url": None,
+        "available": True,
+    }
+
+
+def test_product_group_variants_and_graph():
+    group = {
+        "@context": "https://schema.org",
+        "@graph": [
+            {"@type": "Organization", "name": "Shop"},
+            {
+                "@type": "ProductGroup",
+                "name": "Baumischabfall",
+                "hasVariant": [
+                    {"@type": "Product", "name": "Baumischabfall 5,5 m³",
+                     "offers": {"@type": "Offer", "price": 449}},
+                    {"@type": "Product", "name": "Baumischabfall 10 m³",
+                     "offers": {"@type": "Offer", "price": 1209.5}},
+                ],
+            },
+        ],
+    }
+    candidates = offer_candidates(page(ld_json(group)))
+    assert [(c["size"], c["price"]) for c in candidates] == [("5.5", "449,00"), ("10", "1209,50")]
+
+
+def test_aggregate_offer_with_and_without_offers():
+    with_offers = {
+        "@type": "Product",
+        "name": "Holz A1-A3",
+        "offers": {
+            "@type": "AggregateOffer",
+            "lowPrice": "199",
+            "offers": [
+                {"@type": "Offer", "name": "Holz 3 m³", "price": "199"},
+                {"@type": "Offer", "name": "Holz 7 m³", "price": "349",
+                 "availability": "https://schema.org/OutOfStock"},
+            ],
+        },
+    }
+    candidates = offer_candidates(page(ld_json(with_offers)))
+    assert [(c["size"], c["price"], c["available"]) for c in candidates] == [
+        ("3", "199,00", True),
+        ("7", "349,00", False),
+    ]
+
+    low_price_only = {"@type": "Product", "name": "Sperrmüll 5 m³",
+                      "offers": {"@type": "AggregateOffer", "lowPrice": "279.9"}}
+    [candidate] = offer_candidates(page(ld_json(low_price_only)))
+    assert candidate["price"] == "279,90"
+
+
+def test_price_specification():
+    product = {"@type": "Product", "name": "Boden 3 m³",
+               "offers": {"@type": "Offer", "priceSpecification": [{"price": "1,209.00"}]}}
+    [candidate] = offer_candidates(page(ld_json(product)))
+    assert candidate["price"] == "1209,00"
+
+
+def test_concatenated_documents_and_broken_block():
+    html = page(
+        ld_json(PRODUCT, {**PRODUCT, "name": "Bauschutt Container 10 cbm"}, separator=";\n"),
+        '<script type="application/ld+json">{"@type": "Product", </script>',
+    )
+    assert [c["size"] for c in offer_candidates(html)] == ["7", "10"]
+
+
+def test_microdata_with_displayed_price():
+    html = page(
+        '<div itemscope itemtype="https://schema.org/Product">'
+        '<h1 itemprop="name">Gartenabfälle 7 m³</h1>'
+        '<div itemprop="offers" itemscope itemtype="https://schema.org/Offer">'
+        '<span itemprop="price">1.209,00 €</span>'
+        '<meta itemprop="priceCurrency" content="EUR">'
+        '</div></div>'
+    )
+    [candidate] = offer_candidates(html)
+    assert (candidate["size"], candidate["price"], candidate["currency"]) == ("7", "1209,00", "EUR")
+
+
+def test_response_is_parsed_once():
+    first = response(page(ld_json(PRODUCT)))
+    assert offer_candidates(first) is offer_candidates(first)
+
+
+def test_candidates_by_size_picks_cheapest_available():
+    product = {
+        "@type": "Product",
+        "name": "Bauschutt",
+        "offers": [
+            {"@type": "Offer", "name": "Absetzcontainer 7 m³", "price": "420"},
+            {"@type": "Offer", "name": "Abrollcontainer 7 m³", "price": "399"},
+            {"@type": "Offer", "name": "Container 10 m³", "price": "299",
+             "availability": "https://schema.org/OutOfStock"},
+            {"@type": "Offer", "name": "Big Bag", "price": "99"},
+        ],
+    }
+    by_size = candidates_by_size(page(ld_json(product)))
+    assert {size: candidate["price"] for size, candidate in by_size.items()} == {"7": "399,00"}
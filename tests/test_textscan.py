@@ -0,0 +1,144 @@
+import importlib
+import random
+import re
+
+import pytest
+from scrapy.http import HtmlResponse
+
+from nebi_spiders.textscan import TextScanner, paragraph_texts
+
+container_nrw = importlib.import_module("nebi_spiders.spiders.koeln.container-nrw").ContainerNrwSpider
+
+
+def reference_scan(response, waste_types):
+    """Die Schleife aus container-nrw vor TextScanner (ohne Preisfilter/Duplikate)."""
+    texts = []
+    for p in response.css("p"):
+        text = ' '.join(p.css("*::text").getall()).strip()
+        text = re.sub(r'\s+', ' ', text)
+        if text:
+            texts.append(text)
+
+    waste_positions = []
+    for i, text in enumerate(texts):
+        for pattern, waste_type in waste_types:
+            if re.search(pattern, text, re.I):
+                if 'cbm' not in text.lower() and '€' not in text:
+                    waste_positions.append((i, waste_type))
+                    break
+
+    found = []
+    for idx, (pos, waste_type) in enumerate(waste_positions):
+        end_pos = waste_positions[idx + 1][0] if idx + 1 < len(waste_positions) else len(texts)
+        pending_size = None
+        for text in texts[pos:end_pos]:
+            size_match = re.match(r'^(\d+)\s*cbm\*?$', text.strip(), re.I)
+            if size_match:
+                size = size_match.group(1)
+                if size != "4":
+                    pending_size = size
+                continue
+            price_match = re.match(r'^([\d.]+,00)\s*€?$', text.strip())
+            if price_match and pending_size:
+                found.append((waste_type, pending_size, price_match.group(1)))
+                pending_size = None
+    return found
+
+
+HEADERS = [
+    "Baumischabfall mit max. 10% Mineralik",
+    "keine Mineralik ausser Rigips",
+    "Bauschutt sauber",
+    "Rigips ohne Tapeten und Fliesen",
+    "Holz Bau- und Abbruchholz",
+    "Holz Bau und Abbruchholz A1-A3",
+    "Porenbeton",
+    "Bauschutt verunreinigt",
+    "Sperrmüll oder Entrümpelung",
+    "Gartenabfall",
+    "Erdaushub",
+    "Erdaushub ",
+    "Erde + Steine",
+    # mehrere Muster: das erste der Liste gewinnt
+    "Bauschutt sauber / Porenbeton",
+    "Sperrmüll oder Gartenabfall",
+]
+SIZES = ["4 cbm", "5 cbm", "7 cbm", "10 cbm*", "10cbm", "15 CBM", "7 cbm Absetzer"]
+PRICES = ["290,00 €", "1.190,00 €", "350,00", "199,00 €", "450,50 €", "ab 390,00 €"]
+NOISE = [
+    "Preise inkl. MwSt.",
+    "Bauschutt sauber 7 cbm",
+    "Gartenabfall ab 290,00 €",
+    "Rigips ohne Tapeten",
+    "Anfahrt Langenfeld",
+    "",
+    "Erdaushub mit Steinen",
+]
+
+
+def paragraph(text, rng):
+    if text and rng.random() < 0.2:
+        # Verschachtelte Tags und Zeilenumbrüche wie auf der Seite
+        head, _, tail = text.partition(" ")
+        return f"<p><strong>{head}</strong>\n {tail}</p>"
+    return f"<p>{text}</p>"
+
+
+def page(texts, rng):
+    body = "".join(paragraph(text, rng) for text in texts)
+    return HtmlResponse("http://www.containernrw.de/", body=f"<html><body>{body}</body></html>".encode("utf-8"),
+                        encoding="utf-8")
+
+
+def random_texts(rng):
+    texts = []
+    for _ in range(rng.randint(0, 40)):
+        pool = rng.choices([HEADERS, SIZES, PRICES, NOISE], weights=[2, 4, 4, 1])[0]
+        texts.append(rng.choice(pool))
+    return texts
+
+
+def test_fixture_page():
+    texts = [
+        "Containerdienst Köln",
+        "Bauschutt sauber",
+        "4 cbm", "190,00 €",
+        "7 cbm", "290,00 €",
+        "10 cbm*", "1.190,00 €",
+        "Gartenabfall",
+        "5 cbm", "Preis auf Anfrage", "350,00 €",
+        "Erdaushub",
+        "7 cbm", "7 cbm", "450,00 €",
+    ]
+    response = page(texts, random.Random(0))
+    scanned = list(container_nrw.scanner.scan(paragraph_texts(response), ignore_sizes=("4",)))
+    assert scanned == [
+        ("Bauschutt sauber", "7", "290,00"),
+        ("Bauschutt sauber", "10", "1.190,00"),
+        ("Gartenabfälle", "5", "350,00"),
+        ("Erdaushub sauber", "7", "450,00"),
+    ]
+    assert scanned == reference_scan(response, container_nrw.waste_types_ordered)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_equivalent_to_reference_loop(seed):
+    rng = random.Random(seed)
+    for _ in range(1000):
+        response = page(random_texts(rng), rng)
+        scanned = list(container_nrw.scanner.scan(paragraph_texts(response), ignore_sizes=("4",)))
+        assert scanned == reference_scan(response, container_nrw.waste_types_ordered)
+
+
+def test_classify_first_pattern_wins():
+    scanner = TextScanner(
+        [(r"Bauschutt", "Bauschutt"), (r"sauber", "sauber")],
+        size=r"(\d+)\s*cbm",
+        price=r"([\d.]+,00)\s*€?",
+        header_excludes=r"cbm|€",
+    )
+    assert scanner.classify("sauberer Bauschutt") == ("type", "Bauschutt")
+    assert scanner.classify("7 cbm") == ("size", "7")
+    assert scanner.classify("290,00 €") == ("price", "290,00")
+    assert scanner.classify("Bauschutt 7 cbm") is None
+    assert scanner.classify("Impressum") is None
@@ -0,0 +1,90 @@
+import html
+import json
+from urllib.parse import parse_qs
+
+from scrapy.http import HtmlResponse
+
+from nebi_spiders import woocommerce as wc
+
+VARIATIONS = [
+    {
+        "attributes": {"attribute_pa_containergroesse": "5-5-m3", "attribute_pa_deckel": ""},
+        "display_price": 449,
+        "is_purchasable": True,
+    },
+    {
+        "attributes": {"attribute_pa_containergroesse": "10-m3", "attribute_pa_deckel": "ohne"},
+        "display_price": 1209.5,
+        "is_purchasable": True,
+    },
+    {
+        "attributes": {"attribute_pa_containergroesse": "10-m3", "attribute_pa_deckel": "mit"},
+        "display_price": 1259.5,
+        "is_purchasable": False,
+    },
+]
+
+SELECT = (
+    '<select id="pa_containergroesse" name="attribute_pa_containergroesse">'
+    '<option value="">Wählen Sie eine Option</option>'
+    '<option value="5-5-m3">5,5 m³</option>'
+    '<option value="10-m3">10 <span>m³</span></option>'
+    '<option value="10-m3">10 m³</option>'
+    '</select>'
+)
+
+
+def product_page(variations=VARIATIONS, extra=""):
+    data = html.escape(variations if isinstance(variations, str) else json.dumps(variations), quote=True)
+    body = (
+        f'<form class="variations_form cart" data-product_id="4711" data-product_variations="{data}">'
+        f"{SELECT}</form>{extra}"
+    )
+    return HtmlResponse("https://shop.example/produkt/bauschutt/", body=body.encode("utf-8"), encoding="utf-8")
+
+
+def test_variations_from_form_attribute():
+    assert wc.variations(product_page()) == VARIATIONS
+
+
+def test_variations_loaded_via_ajax_or_missing():
+    # Ab 30 Varianten: data-product_variations="false"
+    assert wc.variations(product_page("false")) is None
+    assert wc.variations(product_page("{broken")) is None
+    empty = HtmlResponse("https://shop.example/", body=b"<html></html>", encoding="utf-8")
+    assert wc.variations(empty) is None
+
+
+def test_attribute_options_skip_placeholder_and_duplicates():
+    assert wc.attribute_options(product_page(), "pa_containergroesse") == [
+        ("5-5-m3", "5,5 m³"),
+        ("10-m3", "10 m³"),
+    ]
+
+
+def test_find_variation():
+    variations = wc.variations(product_page())
+    # Leerer Wert in der Variante = beliebig
+    assert wc.find_variation(variations, pa_containergroesse="5-5-m3", pa_deckel="mit") == VARIATIONS[0]
+    assert wc.find_variation(variations, pa_containergroesse="10-m3", pa_deckel="mit") == VARIATIONS[2]
+    # Attribut, das das Produkt nicht hat, wird ignoriert
+    assert wc.find_variation(variations, pa_containergroesse="10-m3", pa_farbe="rot") == VARIATIONS[1]
+    assert wc.find_variation(variations, pa_containergroesse="20-m3") is None
+
+
+def test_variation_price():
+    assert wc.variation_price(VARIATIONS[0]) == "449,00"
+    assert wc.variation_price(VARIATIONS[1]) == "1209,50"
+    assert wc.variation_price(VARIATIONS[2]) is None
+    assert wc.variation_price({"display_price": ""}) is None
+    assert wc.variation_price(None) is None
+
+
+def test_variation_request():
+    request = wc.variation_request(product_page(), {"pa_containergroesse": "10-m3"}, callback=print)
+    assert request.url == "https://shop.example/?wc-ajax=get_variation"
+    assert request.method == "POST"
+    assert parse_qs(request.body.decode()) == {
+        "attribute_pa_containergroesse": ["10-m3"],
+        "product_id": ["4711"],
+    }